@@ -1,27 +1,22 @@
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
 
 from cement import Controller, ex
 from cement.utils.version import get_version_banner
 
-from jtrader.core.backtester import Backtester
-from jtrader.core.ml import ALGORITHMS
-from jtrader.core.ml import ML
-from jtrader.core.news import News
-from jtrader.core.provider import IEX
-from jtrader.core.provider import KuCoin as KuCoinProvider
-from jtrader.core.provider import LoopRing as LoopRingProvider
-from jtrader.core.scanner.hqm import HighQualityMomentum
-from jtrader.core.scanner.lqm import LowQualityMomentum
-from jtrader.core.scanner.momentum import Momentum
-from jtrader.core.scanner.premarketmomentum import PreMarketMomentum
-from jtrader.core.scanner.scanner import Scanner
-from jtrader.core.scanner.value import Value
-from jtrader.core.trader import KuCoin
-from jtrader.core.trader import LoopRing
-from jtrader.core.trader import Pairs
-from jtrader.core.worker import Worker
+from jtrader.core.algorithms import ALGORITHMS
 from ..core.version import get_version
 
+# the subsystems behind each command (ML, SageMaker, exchanges, talib...) are imported by the command that runs them,
+# so the CLI starts without paying for the ones it does not use
+if TYPE_CHECKING:
+    from jtrader.core.provider import IEX
+    from jtrader.core.provider import KuCoin as KuCoinProvider
+    from jtrader.core.provider import LoopRing as LoopRingProvider
+    from jtrader.core.scanner.universe import UniverseSnapshot
+
 VERSION_BANNER = """
 Trade them thangs %s
 %s
@@ -61,16 +56,38 @@ class Base(Controller):
             ),
         ]
 
+    def get_orchestrator_config(self) -> dict:
+        return {
+            'concurrency': self.app.config.get('jtrader', 'concurrency'),
+            'rate_limit': self.app.config.get('jtrader', 'rate_limit'),
+            'process_workers': self.app.config.get('jtrader', 'process_workers'),
+        }
+
+    def get_universe(self, provider: IEX) -> UniverseSnapshot:
+        from jtrader.core.scanner.universe import UniverseSnapshot
+
+        return UniverseSnapshot(
+            provider,
+            ttl=self.app.config.get('jtrader', 'universe_ttl'),
+            concurrency=self.app.config.get('jtrader', 'concurrency')
+        )
+
     @staticmethod
     def get_iex_provider(is_sandbox: bool, version: str = 'stable') -> IEX:
+        from jtrader.core.provider import IEX
+
         return IEX(is_sandbox, version)
 
     @staticmethod
     def get_kucoin_provider(is_sandbox: bool) -> KuCoinProvider:
+        from jtrader.core.provider import KuCoin as KuCoinProvider
+
         return KuCoinProvider(is_sandbox)
 
     @staticmethod
     def get_loopring_provider(is_sandbox: bool) -> LoopRingProvider:
+        from jtrader.core.provider import LoopRing as LoopRingProvider
+
         return LoopRingProvider(is_sandbox)
 
     def _default(self):
@@ -84,7 +101,16 @@ class Base(Controller):
     )
     def start_worker(self):
         """Start Worker Command"""
-        results = Worker(self.get_iex_provider(False), self.app.log).run()
+        from jtrader.core.worker import Worker
+
+        orchestrator_config = self.get_orchestrator_config()
+
+        results = Worker(
+            self.get_iex_provider(False),
+            self.app.log,
+            concurrency=orchestrator_config['concurrency'],
+            rate_limit=orchestrator_config['rate_limit']
+        ).run()
 
         self.app.render({'results': results}, 'start_worker.jinja2')
 
@@ -103,6 +129,8 @@ class Base(Controller):
     )
     def start_news_stream(self):
         """News Stream Command"""
+        from jtrader.core.news import News
+
         is_sandbox = self.app.pargs.is_sandbox
 
         if is_sandbox:
@@ -127,12 +155,15 @@ class Base(Controller):
     )
     def get_lqm_stats(self):
         """LQM Stats Command"""
+        from jtrader.core.scanner.lqm import LowQualityMomentum
+
         is_sandbox = self.app.pargs.is_sandbox
 
         if is_sandbox:
             self.app.log.info('Starting in sandbox mode...')
 
-        results = LowQualityMomentum(is_sandbox).run()
+        scanner = LowQualityMomentum(is_sandbox)
+        results = scanner.run(self.get_universe(scanner))
 
         self.app.render({'results': results}, 'get_lqm_stats.jinja2')
 
@@ -151,12 +182,15 @@ class Base(Controller):
     )
     def get_hqm_stats(self):
         """HQM Stats Command"""
+        from jtrader.core.scanner.hqm import HighQualityMomentum
+
         is_sandbox = self.app.pargs.is_sandbox
 
         if is_sandbox:
             self.app.log.info('Starting in sandbox mode...')
 
-        results = HighQualityMomentum(is_sandbox).run()
+        scanner = HighQualityMomentum(is_sandbox)
+        results = scanner.run(self.get_universe(scanner))
 
         self.app.render({'results': results}, 'get_hqm_stats.jinja2')
 
@@ -175,12 +209,15 @@ class Base(Controller):
     )
     def get_value_stats(self):
         """Deep Value Stats Command"""
+        from jtrader.core.scanner.value import Value
+
         is_sandbox = self.app.pargs.is_sandbox
 
         if is_sandbox:
             self.app.log.info('Starting in sandbox mode...')
 
-        results = Value(is_sandbox).run()
+        scanner = Value(is_sandbox)
+        results = scanner.run(self.get_universe(scanner))
 
         self.app.render({'results': results}, 'get_value_stats.jinja2')
 
@@ -199,12 +236,15 @@ class Base(Controller):
     )
     def get_pmm_stats(self):
         """Start Pre Market Momentum Scanner Command"""
+        from jtrader.core.scanner.premarketmomentum import PreMarketMomentum
+
         is_sandbox = self.app.pargs.is_sandbox
 
         if is_sandbox:
             self.app.log.info('Starting in sandbox mode...')
 
-        results = PreMarketMomentum(is_sandbox).run()
+        scanner = PreMarketMomentum(is_sandbox)
+        results = scanner.run(self.get_universe(scanner))
 
         self.app.render({'results': results}, 'start_pmm_scanner.jinja2')
 
@@ -223,12 +263,15 @@ class Base(Controller):
     )
     def get_mm_stats(self):
         """Start Market Momentum Scanner Command"""
+        from jtrader.core.scanner.momentum import Momentum
+
         is_sandbox = self.app.pargs.is_sandbox
 
         if is_sandbox:
             self.app.log.info('Starting in sandbox mode...')
 
-        results = Momentum(is_sandbox).run()
+        scanner = Momentum(is_sandbox)
+        results = scanner.run(self.get_universe(scanner))
 
         self.app.render({"results": results}, 'start_mm_scanner.jinja2')
 
@@ -274,6 +317,8 @@ class Base(Controller):
     )
     def start_intraday_scanner(self):
         """Start Scanner Command"""
+        from jtrader.core.scanner.scanner import Scanner
+
         is_sandbox = self.app.pargs.is_sandbox
 
         if is_sandbox:
@@ -283,7 +328,9 @@ class Base(Controller):
             is_sandbox,
             self.app.pargs.indicators,
             self.app.pargs.stock_list,
-            no_notifications=self.app.pargs.no_notifications
+            no_notifications=self.app.pargs.no_notifications,
+            feature_cache_folder=self.app.config.get('jtrader', 'feature_cache_folder'),
+            **self.get_orchestrator_config()
         ).run()
 
     @ex(
@@ -319,6 +366,8 @@ class Base(Controller):
     )
     def start_scanner(self):
         """Start Scanner Command"""
+        from jtrader.core.scanner.scanner import Scanner
+
         is_sandbox = self.app.pargs.is_sandbox
 
         if is_sandbox:
@@ -328,7 +377,9 @@ class Base(Controller):
             is_sandbox,
             self.app.pargs.indicators,
             as_intraday=False,
-            no_notifications=self.app.pargs.no_notifications
+            no_notifications=self.app.pargs.no_notifications,
+            feature_cache_folder=self.app.config.get('jtrader', 'feature_cache_folder'),
+            **self.get_orchestrator_config()
         ).run()
 
     @ex(
@@ -339,8 +390,23 @@ class Base(Controller):
                     {
                         'help': 'Ticker to process',
                         'action': 'store',
-                        'dest': 'ticker',
-                        'required': True
+                        'dest': 'ticker'
+                    }
+            ),
+            (
+                    ['--tickers'],
+                    {
+                        'help': 'Tickers to train in one batch',
+                        'nargs': '+',
+                        'dest': 'tickers'
+                    }
+            ),
+            (
+                    ['--universe'],
+                    {
+                        'help': 'train every enabled ticker in one batch',
+                        'action': 'store_true',
+                        'dest': 'universe'
                     }
             ),
             (
@@ -381,11 +447,35 @@ class Base(Controller):
     )
     def start_ml_trainer(self):
         """Start ML Trainer Command"""
-        ML(self.get_iex_provider(False)).run_trainer(
-            self.app.pargs.ticker,
+        if sum([self.app.pargs.ticker is not None, self.app.pargs.tickers is not None, self.app.pargs.universe]) != 1:
+            self.app.args.error('one of --ticker, --tickers or --universe is required')
+
+        if self.app.pargs.with_numerai and self.app.pargs.ticker is None:
+            self.app.args.error('--with-numerai only supports --ticker')
+
+        from jtrader.core.ml import ML
+
+        provider = self.get_iex_provider(False)
+
+        if self.app.pargs.ticker is not None:
+            ML(provider).run_trainer(
+                self.app.pargs.ticker,
+                self.app.pargs.algorithm,
+                self.app.pargs.with_aws,
+                self.app.pargs.with_numerai,
+                self.app.pargs.dask_cluster_address,
+            )
+
+            return
+
+        tickers = self.app.pargs.tickers
+        if self.app.pargs.universe:
+            tickers = provider.enabled_symbols().tolist()
+
+        ML(provider).run_batch_trainer(
+            tickers,
             self.app.pargs.algorithm,
             self.app.pargs.with_aws,
-            self.app.pargs.with_numerai,
             self.app.pargs.dask_cluster_address,
         )
 
@@ -418,6 +508,7 @@ class Base(Controller):
     )
     def start_ml_predictor(self):
         """Start ML Predictor Command"""
+        from jtrader.core.ml import ML
 
         ML(self.get_iex_provider(False)).run_predictor(self.app.pargs.model[0], self.app.pargs.predictions)
 
@@ -464,6 +555,8 @@ class Base(Controller):
     )
     def start_dask_worker(self):
         """Start Dask Worker Command"""
+        from jtrader.core.ml import ML
+
         ML(self.get_iex_provider(False)).start_dask_worker(
             self.app.pargs.address,
             self.app.pargs.listen_address,
@@ -477,6 +570,8 @@ class Base(Controller):
     )
     def start_dask_scheduler(self):
         """Start Dask Worker Command"""
+        from jtrader.core.ml import ML
+
         ML(self.get_iex_provider(False)).start_dask_scheduler()
 
     @ex(
@@ -485,8 +580,8 @@ class Base(Controller):
             (
                     ['-t', '--ticker'],
                     {
-                        'help': 'Ticker to process',
-                        'action': 'store',
+                        'help': 'Ticker to process, repeat to sweep several tickers',
+                        'action': 'append',
                         'dest': 'ticker',
                         'required': True
                     }
@@ -529,13 +624,70 @@ class Base(Controller):
                         'dest': 'end_date'
                     }
             ),
+            (
+                    ['--sweep'],
+                    {
+                        'help': 'grid search indicator combinations and window sizes across all tickers',
+                        'action': 'store_true',
+                        'dest': 'sweep'
+                    }
+            ),
+            (
+                    ['--leaderboard'],
+                    {
+                        'help': 'CSV file the sweep results are streamed to',
+                        'action': 'store',
+                        'dest': 'leaderboard',
+                        'default': 'backtest_leaderboard.csv'
+                    }
+            ),
+            (
+                    ['--workers'],
+                    {
+                        'help': 'number of sweep worker processes',
+                        'action': 'store',
+                        'dest': 'workers',
+                        'type': int
+                    }
+            ),
+            (
+                    ['--dask-scheduler-address'],
+                    {
+                        'help': 'Dask scheduler address to run the sweep on instead of local processes',
+                        'action': 'store',
+                        'dest': 'dask_scheduler_address'
+                    }
+            ),
         ],
     )
     def start_backtest(self):
         """Start Backtest Command"""
+        if len(self.app.pargs.ticker) > 1 and not self.app.pargs.sweep:
+            self.app.args.error('several --ticker values need --sweep')
+
+        from jtrader.core.backtester import Backtester
+        from jtrader.core.sweep import BacktestSweep
+
+        if self.app.pargs.sweep:
+            results = BacktestSweep(
+                self.app.log,
+                self.app.pargs.ticker,
+                self.app.pargs.start_date,
+                self.app.pargs.end_date,
+                self.app.pargs.buy_indicators,
+                self.app.pargs.sell_indicators,
+                leaderboard_path=self.app.pargs.leaderboard,
+                max_workers=self.app.pargs.workers,
+                dask_scheduler_address=self.app.pargs.dask_scheduler_address,
+            ).run()
+
+            self.app.render({'results': results}, 'start_backtester.jinja2')
+
+            return
+
         backtester = Backtester(
             self.app.log,
-            self.app.pargs.ticker,
+            self.app.pargs.ticker[0],
             self.app.pargs.start_date,
             self.app.pargs.end_date,
             self.app.pargs.buy_indicators,
@@ -546,6 +698,82 @@ class Base(Controller):
 
         self.app.render({'results': results}, 'start_backtester.jinja2')
 
+    @ex(
+        help='Build the index of cointegrated pairs the pairs trader looks candidates up in',
+        arguments=[
+            (
+                    ['--window'],
+                    {
+                        'help': 'trading days the pairs are tested over',
+                        'action': 'store',
+                        'dest': 'window',
+                        'type': int,
+                        'default': 252
+                    }
+            ),
+            (
+                    ['--min-correlation'],
+                    {
+                        'help': 'correlation of log prices a pair needs to be tested for cointegration',
+                        'action': 'store',
+                        'dest': 'min_correlation',
+                        'type': float,
+                        'default': .9
+                    }
+            ),
+            (
+                    ['--top'],
+                    {
+                        'help': 'pairs kept per ticker',
+                        'action': 'store',
+                        'dest': 'top',
+                        'type': int,
+                        'default': 10
+                    }
+            ),
+            (
+                    ['--by-sector'],
+                    {
+                        'help': 'only pair tickers of the same sector',
+                        'action': 'store_true',
+                        'dest': 'by_sector'
+                    }
+            ),
+            (
+                    ['--sandbox'],
+                    {
+                        'help': 'start in sandbox mode',
+                        'action': 'store_true',
+                        'dest': 'is_sandbox'
+                    }
+            ),
+        ],
+    )
+    def build_pairs_index(self):
+        """Build Pairs Index Command"""
+        from datetime import datetime
+
+        from dateutil.relativedelta import relativedelta
+
+        from jtrader.core.pairs import PairsIndex
+
+        provider = self.get_iex_provider(self.app.pargs.is_sandbox)
+        tickers = provider.enabled_symbols().tolist()
+
+        sectors = None
+        if self.app.pargs.by_sector:
+            sectors = provider.sectors(tickers)
+
+        # calendar days enough to cover the window's trading days
+        start = datetime.today() + relativedelta(days=-2 * self.app.pargs.window)
+
+        PairsIndex(
+            window=self.app.pargs.window,
+            min_correlation=self.app.pargs.min_correlation,
+            top=self.app.pargs.top,
+            max_workers=self.app.config.get('jtrader', 'process_workers'),
+        ).build(tickers, start, sectors)
+
     @ex(
         help='Run the trader',
         arguments=[
@@ -588,10 +816,16 @@ class Base(Controller):
 
         trader = None
         if exchange == 'kucoin':
+            from jtrader.core.trader.kucoin import KuCoin
+
             trader = KuCoin(self.get_kucoin_provider(self.app.pargs.is_sandbox), self.app.pargs.ticker)
         elif exchange == 'loopring':
+            from jtrader.core.trader.loopring import LoopRing
+
             trader = LoopRing(self.get_loopring_provider(self.app.pargs.is_sandbox), self.app.pargs.ticker)
         elif exchange == 'pairs':
+            from jtrader.core.trader.pairs import Pairs
+
             trader = Pairs(self.get_iex_provider(self.app.pargs.is_sandbox), self.app.pargs.ticker)
 
         if trader is None:
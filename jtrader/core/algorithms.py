@@ -0,0 +1,3 @@
+ALGORITHMS = [
+    'linear-learner'
+]
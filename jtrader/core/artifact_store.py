@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+
+FORMAT_ARROW = 'arrow'
+FORMAT_PROPHET = 'prophet'
+FORMAT_PICKLE = 'pickle'
+
+EXTENSIONS = {
+    FORMAT_ARROW: 'arrow',
+    FORMAT_PROPHET: 'json',
+    FORMAT_PICKLE: 'pkl',
+}
+
+
+def read_frame(path: Union[str, Path], memory_map: bool = True) -> pd.DataFrame:
+    """
+    Reads a frame saved as Arrow IPC / Feather, Parquet or pickle, picked by the file extension. Arrow files are memory
+    mapped, so only the pages the frame touches are read from disk.
+    """
+    path = Path(path)
+
+    if path.suffix in ('.arrow', '.feather'):
+        source = pa.memory_map(str(path)) if memory_map else pa.OSFile(str(path))
+
+        with source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path, memory_map=memory_map)
+
+    return pd.read_pickle(path)
+
+
+class ArtifactStore:
+    """
+    Versioned store of the frames and models the ML trainer produces.
+
+    Frames are written as Arrow IPC files that are memory mapped on read, Prophet models as Prophet's JSON and anything
+    else as a pickle. Every save is a new version (`{folder}/{name}.{version}.{ext}`) recorded in a SQLite manifest
+    with its format, content hash and creation time, the last `KEEP_VERSIONS` versions of an artifact are kept.
+    Artifacts written before the store existed (`{folder}/{name}.pkl`) are still read.
+    """
+
+    KEEP_VERSIONS = 3
+    MANIFEST_FILE = 'manifest.sqlite'
+
+    def __init__(self, folder: str):
+        self.folder = Path(folder)
+        self.lock = threading.Lock()
+        self.connection_prop = None
+        self.connection_pid = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # a connection inherited by a forked trainer process can not be shared with its parent
+        if self.connection_prop is None or self.connection_pid != os.getpid():
+            self.connection_pid = os.getpid()
+            self.folder.mkdir(exist_ok=True, parents=True)
+
+            # trainer processes save into the same store, wait for each other's writes
+            self.connection_prop = sqlite3.connect(
+                self.folder / self.MANIFEST_FILE,
+                timeout=30,
+                check_same_thread=False
+            )
+            self.connection_prop.execute(
+                'CREATE TABLE IF NOT EXISTS artifacts ('
+                'name TEXT NOT NULL, '
+                'version INTEGER NOT NULL, '
+                'file TEXT NOT NULL, '
+                'format TEXT NOT NULL, '
+                'sha256 TEXT NOT NULL, '
+                'created TEXT NOT NULL, '
+                'PRIMARY KEY (name, version)'
+                ')'
+            )
+            self.connection_prop.commit()
+
+        return self.connection_prop
+
+    @staticmethod
+    def get_hash(path: Path) -> str:
+        digest = hashlib.sha256()
+
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def get_entry(self, name: str, version: Optional[int] = None) -> Optional[dict]:
+        query = 'SELECT name, version, file, format, sha256, created FROM artifacts WHERE name = ?'
+        params = [name]
+
+        if version is not None:
+            query += ' AND version = ?'
+            params.append(version)
+
+        with self.lock:
+            row = self.connection.execute(query + ' ORDER BY version DESC LIMIT 1', params).fetchone()
+
+        if row is None:
+            return None
+
+        return dict(zip(['name', 'version', 'file', 'format', 'sha256', 'created'], row))
+
+    def write(self, name: str, artifact_format: str, write: callable) -> int:
+        """
+        Writes a new version of `name` through `write(path)` and records it in the manifest.
+        """
+        with self.lock:
+            connection = self.connection
+            connection.execute('BEGIN IMMEDIATE')
+
+            try:
+                version = connection.execute(
+                    'SELECT COALESCE(MAX(version), 0) + 1 FROM artifacts WHERE name = ?',
+                    (name,)
+                ).fetchone()[0]
+
+                file = f"{name}.{version}.{EXTENSIONS[artifact_format]}"
+                path = self.folder / file
+
+                # write next to the artifact and swap it in, so readers never see a partial file
+                temp_path = self.folder / f"{file}.{os.getpid()}.tmp"
+                write(temp_path)
+                os.replace(temp_path, path)
+
+                connection.execute(
+                    'INSERT INTO artifacts (name, version, file, format, sha256, created) VALUES (?, ?, ?, ?, ?, ?)',
+                    (name, version, file, artifact_format, self.get_hash(path), datetime.now().isoformat())
+                )
+
+                expired = connection.execute(
+                    'SELECT version, file FROM artifacts WHERE name = ? AND version <= ?',
+                    (name, version - self.KEEP_VERSIONS)
+                ).fetchall()
+                connection.execute(
+                    'DELETE FROM artifacts WHERE name = ? AND version <= ?',
+                    (name, version - self.KEEP_VERSIONS)
+                )
+
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+
+        for _, expired_file in expired:
+            (self.folder / expired_file).unlink(missing_ok=True)
+
+        return version
+
+    def save_frame(self, name: str, frame: pd.DataFrame) -> int:
+        try:
+            table = pa.Table.from_pandas(frame)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # mixed object columns Arrow can not type
+            return self.save_object(name, frame)
+
+        def write(path: Path) -> None:
+            with pa.OSFile(str(path), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        return self.write(name, FORMAT_ARROW, write)
+
+    def save_model(self, name: str, model: Any) -> int:
+        from prophet import Prophet
+
+        if not isinstance(model, Prophet):
+            return self.save_object(name, model)
+
+        from prophet.serialize import model_to_json
+
+        def write(path: Path) -> None:
+            with open(path, 'w') as file:
+                file.write(model_to_json(model))
+
+        return self.write(name, FORMAT_PROPHET, write)
+
+    def save_object(self, name: str, value: Any) -> int:
+        def write(path: Path) -> None:
+            with open(path, 'wb') as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        return self.write(name, FORMAT_PICKLE, write)
+
+    def load(self, name: str, version: Optional[int] = None, memory_map: bool = True) -> Any:
+        """
+        Loads the latest (or the given) version of `name`, None when there is no such artifact.
+        """
+        entry = self.get_entry(name, version)
+
+        if entry is None:
+            legacy_path = self.folder / f"{name}.pkl"
+
+            return pd.read_pickle(legacy_path) if version is None and legacy_path.is_file() else None
+
+        path = self.folder / entry['file']
+
+        if entry['format'] == FORMAT_ARROW:
+            return read_frame(path, memory_map)
+
+        if entry['format'] == FORMAT_PROPHET:
+            from prophet.serialize import model_from_json
+
+            with open(path, 'r') as file:
+                return model_from_json(file.read())
+
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+
+    def verify(self, name: str, version: Optional[int] = None) -> bool:
+        entry = self.get_entry(name, version)
+
+        return entry is not None and self.get_hash(self.folder / entry['file']) == entry['sha256']
+
+    def close(self) -> None:
+        with self.lock:
+            if self.connection_prop is not None and self.connection_pid == os.getpid():
+                self.connection_prop.close()
+
+            self.connection_prop = None
@@ -1,8 +1,10 @@
+from datetime import datetime, timedelta
 from typing import Optional, List
 
 import numpy as np
 import pandas as pd
 
+from jtrader.core.bar_store import BarStore
 from jtrader.core.indicator import __INDICATOR_MAP__
 from jtrader.core.indicator.indicator import Indicator
 
@@ -13,16 +15,19 @@ class Backtester:
     DATA_FREQUENCY = 'daily'
     DATA_BUNDLE = 'iex'
 
+    FILL_COLUMNS = ['date', 'side', 'amount', 'price', 'cash']
+
     def __init__(
             self,
             logger,
             ticker: str,
-            start_date: str,
-            end_date: str,
+            start_date: Optional[str],
+            end_date: Optional[str],
             buy_indicators: List[str],
             sell_indicators: List[str],
             frequency: Optional[str] = '1d',
-            bar_count: Optional[int] = 45
+            bar_count: Optional[int] = 45,
+            indicator_params: Optional[dict] = None
     ):
         self.logger = logger
         self.ticker = ticker
@@ -32,49 +37,119 @@ class Backtester:
         self.bar_count = bar_count
         self.start_date = pd.to_datetime(start_date, utc=True)
         self.end_date = pd.to_datetime(end_date, utc=True)
+        self.indicator_params = indicator_params
 
         self.cached_buy_indicators = {}
         self.cached_sell_indicators = {}
 
     @staticmethod
-    def get_validator(validator_name: str, ticker: str):
+    def get_validator(validator_name: str, ticker: str, params: Optional[dict] = None):
         if validator_name in __INDICATOR_MAP__:
-            return __INDICATOR_MAP__[validator_name](ticker)
-
-        raise Exception
-
-    def run(self):
-        # @TODO implement a new backtester, zipline is too old :/
-        pass
+            validator = __INDICATOR_MAP__[validator_name](ticker)
 
-    def stock_qualifies_bullish(self, context, price, data_frame: pd.DataFrame):
-        cash_left = context.portfolio.cash
-        stock = context.asset
+            if params is not None:
+                for param, value in params.items():
+                    setattr(validator, param, value)
 
-        if price * self.ORDER_AMOUNT > cash_left:
-            return False
+            return validator
 
-        for validator in self.buy_indicators:
-            if validator in self.cached_buy_indicators:
-                validator_instance = self.cached_buy_indicators[validator]
-            else:
-                validator_instance = self.get_validator(validator, stock)
-                self.cached_buy_indicators[validator] = validator_instance
-
-            if validator_instance.is_valid(data_frame) == Indicator.BULLISH:
-                return True
-
-        return False
+        raise Exception
 
-    def stock_qualifies_bearish(self, stock: str, data_frame: pd.DataFrame):
-        for validator in self.sell_indicators:
-            if validator in self.cached_sell_indicators:
-                validator_instance = self.cached_sell_indicators[validator]
+    def run(self) -> Optional[dict]:
+        bars = self.load_bars()
+
+        if bars.empty:
+            self.logger.warning(f"Retrieved empty data set for stock {self.ticker}")
+
+            return None
+
+        return self.run_bars(bars)
+
+    def load_bars(self) -> pd.DataFrame:
+        start = self.start_date
+        if start is None:
+            start = pd.Timestamp(datetime.now() - timedelta(days=365), tz='UTC')
+
+        return BarStore().read(self.ticker, start, self.end_date)
+
+    def run_bars(self, bars: pd.DataFrame) -> dict:
+        """
+        Replays the bars (oldest first) once. Every indicator is evaluated a single time over the whole series, the
+        per-bar loop only walks the resulting signal arrays to book fills.
+        """
+        buy_signals = self.get_signals(
+            bars,
+            self.buy_indicators,
+            self.cached_buy_indicators,
+            Indicator.SIGNAL_BULLISH
+        )
+        sell_signals = self.get_signals(
+            bars,
+            self.sell_indicators,
+            self.cached_sell_indicators,
+            Indicator.SIGNAL_BEARISH
+        )
+
+        dates = bars['date'].to_numpy()
+        closes = bars['close'].to_numpy(dtype=float)
+        bar_total = len(closes)
+
+        cash = np.empty(bar_total, dtype=float)
+        positions = np.empty(bar_total, dtype=np.int64)
+        fills = []
+
+        cash_left = float(self.CAPITAL_BASE)
+        position = 0
+        for i in range(bar_total):
+            price = closes[i]
+
+            if sell_signals[i] and position > 0:
+                cash_left += position * price
+                fills.append((dates[i], 'sell', position, price, cash_left))
+                position = 0
+            elif buy_signals[i] and price * self.ORDER_AMOUNT <= cash_left:
+                cash_left -= price * self.ORDER_AMOUNT
+                position += self.ORDER_AMOUNT
+                fills.append((dates[i], 'buy', self.ORDER_AMOUNT, price, cash_left))
+
+            cash[i] = cash_left
+            positions[i] = position
+
+        equity = cash + positions * closes
+
+        equity_curve = pd.DataFrame(
+            {
+                'date': dates,
+                'close': closes,
+                'cash': cash,
+                'position': positions,
+                'equity': equity
+            }
+        )
+
+        running_max = np.maximum.accumulate(equity)
+
+        return {
+            'ticker': self.ticker,
+            'start': dates[0],
+            'end': dates[-1],
+            'fills': pd.DataFrame(fills, columns=self.FILL_COLUMNS),
+            'equity_curve': equity_curve,
+            'final_equity': equity[-1],
+            'total_return': equity[-1] / self.CAPITAL_BASE - 1,
+            'max_drawdown': float(np.max(1 - equity / running_max)),
+        }
+
+    def get_signals(self, bars: pd.DataFrame, validators, cache: dict, signal: int) -> np.ndarray:
+        qualifies = np.zeros(len(bars), dtype=bool)
+
+        for validator in validators:
+            if validator in cache:
+                validator_instance = cache[validator]
             else:
-                validator_instance = self.get_validator(validator, stock)
-                self.cached_sell_indicators[validator] = validator_instance
+                validator_instance = self.get_validator(validator, self.ticker, self.indicator_params)
+                cache[validator] = validator_instance
 
-            if validator_instance.is_valid(data_frame) == Indicator.BEARISH:
-                return True
+            qualifies |= validator_instance.get_signals(bars, self.bar_count) == signal
 
-        return False
+        return qualifies
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from jtrader.core.odm import ODM
+
+BAR_STORE_FOLDER = 'data/bars'
+
+
+class BarStore:
+    """
+    Local columnar copy of the daily bars held in the `stocks` table.
+
+    Bars are kept as Parquet files partitioned by ticker and year (`{folder}/{ticker}/{year}.parquet`), so a reader only
+    touches the years it asks for. Tickers that have never been stored locally are read through from DynamoDB once and
+    persisted, after that the `Worker` keeps them in sync as it ingests new bars.
+    """
+
+    BAR_COLUMNS = ODM.BAR_ATTRIBUTES
+    BACKFILL_START = date(1970, 1, 1)
+    # tickers whose full history is held in memory at once while backfilling
+    BACKFILL_CHUNK_SIZE = 50
+
+    def __init__(self, folder: str = BAR_STORE_FOLDER, odm: Optional[ODM] = None, max_workers: int = 16):
+        self.folder = Path(folder)
+        self.odm_prop = odm
+        self.max_workers = max_workers
+
+    @property
+    def odm(self) -> ODM:
+        if self.odm_prop is None:
+            self.odm_prop = ODM()
+
+        return self.odm_prop
+
+    @classmethod
+    def normalize(cls, bars: Union[pd.DataFrame, List[dict]]) -> pd.DataFrame:
+        """
+        Normalizes raw bars (`stocks` items with Decimal values or provider chart entries) into a float OHLCV frame
+        sorted oldest first.
+        """
+        bars = pd.DataFrame(bars)
+
+        if bars.empty:
+            return pd.DataFrame(columns=cls.BAR_COLUMNS)
+
+        bars = bars[cls.BAR_COLUMNS].copy()
+        bars['date'] = pd.to_datetime(bars['date'], utc=True)
+
+        for column in cls.BAR_COLUMNS[1:]:
+            bars[column] = pd.to_numeric(bars[column], errors='coerce').astype(float)
+
+        bars = bars.dropna(subset=['close'])
+
+        return bars.sort_values(by='date').drop_duplicates(subset='date', keep='last').reset_index(drop=True)
+
+    @staticmethod
+    def to_timestamp(value: Union[date, datetime]) -> pd.Timestamp:
+        value = pd.Timestamp(value)
+
+        return value.tz_localize('UTC') if value.tzinfo is None else value.tz_convert('UTC')
+
+    def get_ticker_folder(self, ticker: str) -> Path:
+        return self.folder / ticker
+
+    def get_partition_path(self, ticker: str, year: int) -> Path:
+        return self.get_ticker_folder(ticker) / f"{year}.parquet"
+
+    def has_ticker(self, ticker: str) -> bool:
+        return self.get_ticker_folder(ticker).is_dir()
+
+    def write(self, ticker: str, bars: Union[pd.DataFrame, List[dict]]) -> None:
+        bars = self.normalize(bars)
+
+        if bars.empty:
+            return
+
+        self.get_ticker_folder(ticker).mkdir(exist_ok=True, parents=True)
+
+        for year, partition in bars.groupby(bars['date'].dt.year):
+            path = self.get_partition_path(ticker, year)
+
+            if path.is_file():
+                partition = self.normalize(pd.concat([pd.read_parquet(path), partition], ignore_index=True))
+
+            # write next to the partition and swap it in, so concurrent readers never see a partial file
+            temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            partition.to_parquet(temp_path, index=False)
+            os.replace(temp_path, path)
+
+    def backfill(self, ticker: str, start: Optional[date] = None) -> None:
+        items = self.odm.get_historical_stock_range(ticker, start or self.BACKFILL_START, ODM.BAR_ATTRIBUTES)
+
+        self.store_backfill(ticker, items)
+
+    def backfill_many(self, tickers: List[str], start: Optional[date] = None) -> None:
+        # each chunk is written before the next is fetched, so a first run over the universe stays bounded in memory
+        for offset in range(0, len(tickers), self.BACKFILL_CHUNK_SIZE):
+            chunk = tickers[offset:offset + self.BACKFILL_CHUNK_SIZE]
+            ranges = self.odm.get_historical_stock_ranges(chunk, start or self.BACKFILL_START, ODM.BAR_ATTRIBUTES)
+
+            for ticker, items in ranges.items():
+                self.store_backfill(ticker, items)
+
+    def ensure(self, tickers: List[str]) -> None:
+        """
+        Backfills, in bulk chunks, every ticker the store has not seen yet.
+        """
+        missing = [ticker for ticker in tickers if not self.has_ticker(ticker)]
+
+        if len(missing) > 0:
+            self.backfill_many(missing)
+
+    def store_backfill(self, ticker: str, items: List[dict]) -> None:
+        if len(items) == 0:
+            # remember the ticker has no history so it is not queried again on every read
+            self.get_ticker_folder(ticker).mkdir(exist_ok=True, parents=True)
+
+            return
+
+        self.write(ticker, items)
+
+    def read(
+            self,
+            ticker: str,
+            start: Union[date, datetime],
+            end: Optional[Union[date, datetime]] = None,
+            columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        if not self.has_ticker(ticker):
+            self.backfill(ticker)
+
+        start = self.to_timestamp(start)
+        end_year = datetime.now().year if end is None else end.year
+
+        paths = [
+            self.get_partition_path(ticker, year) for year in range(start.year, end_year + 1)
+            if self.get_partition_path(ticker, year).is_file()
+        ]
+
+        if len(paths) == 0:
+            return pd.DataFrame(columns=columns or self.BAR_COLUMNS)
+
+        bars = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+
+        mask = bars['date'] >= start
+        if end is not None:
+            end = self.to_timestamp(end)
+            mask &= bars['date'] <= end
+
+        bars = bars[mask].reset_index(drop=True)
+
+        if columns is not None:
+            bars = bars[columns]
+
+        return bars
+
+    def read_many(
+            self,
+            tickers: List[str],
+            start: Union[date, datetime],
+            end: Optional[Union[date, datetime]] = None,
+            columns: Optional[List[str]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        self.ensure(tickers)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            frames = executor.map(lambda ticker: self.read(ticker, start, end, columns), tickers)
+
+            return dict(zip(tickers, frames))
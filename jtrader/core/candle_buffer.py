@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class CandleBuffer:
+    """
+    Fixed capacity ring buffer of candles backed by one float64 array per column.
+
+    Every candle is written twice, at its slot and one capacity further, so the latest `n` candles always sit in one
+    contiguous slice and windows are returned as views without copying. Appending and updating the current candle are
+    constant time and memory stays bounded however long the trader runs.
+    """
+
+    def __init__(self, columns: List[str], capacity: int = 1440):
+        self.columns = list(columns)
+        self.column_indexes = {column: i for i, column in enumerate(self.columns)}
+        self.capacity = capacity
+        self.data = np.full((len(self.columns), capacity * 2), np.nan)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def to_row(self, candle: Union[dict, list, tuple]) -> np.ndarray:
+        if isinstance(candle, dict):
+            candle = [candle[column] for column in self.columns]
+
+        return np.asarray(candle, dtype=float)
+
+    def append(self, candle: Union[dict, list, tuple]) -> None:
+        slot = self.count % self.capacity
+        row = self.to_row(candle)
+
+        self.data[:, slot] = row
+        self.data[:, slot + self.capacity] = row
+        self.count += 1
+
+    def extend(self, candles: Union[pd.DataFrame, list]) -> None:
+        if isinstance(candles, pd.DataFrame):
+            candles = candles[self.columns].to_numpy(dtype=float)
+
+        for candle in candles[-self.capacity:]:
+            self.append(candle)
+
+    def update_last(self, candle: Union[dict, list, tuple]) -> None:
+        """
+        Overwrites the current (still open) candle in place.
+        """
+        if self.count == 0:
+            self.append(candle)
+
+            return
+
+        slot = (self.count - 1) % self.capacity
+        row = self.to_row(candle)
+
+        self.data[:, slot] = row
+        self.data[:, slot + self.capacity] = row
+
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Arguments:
+            n: Number of candles, all buffered candles by default
+
+        Returns:
+            A read-only (columns, n) view of the latest candles, oldest first
+        """
+        size = len(self) if n is None else min(n, len(self))
+        end = (self.count - 1) % self.capacity + 1 + (self.capacity if self.count >= self.capacity else 0)
+
+        view = self.data[:, end - size:end]
+        view.flags.writeable = False
+
+        return view
+
+    def column(self, column: str, n: Optional[int] = None) -> np.ndarray:
+        return self.window(n)[self.column_indexes[column]]
+
+    def last(self) -> Optional[dict]:
+        if self.count == 0:
+            return None
+
+        return dict(zip(self.columns, self.window(1)[:, 0]))
+
+    def to_frame(self, n: Optional[int] = None, newest_first: bool = False) -> pd.DataFrame:
+        """
+        Copies the latest candles into a frame, for consumers that still work on DataFrames.
+        """
+        window = self.window(n)
+
+        if newest_first:
+            window = window[:, ::-1]
+
+        return pd.DataFrame(window.T, columns=self.columns)
@@ -1,4 +1,4 @@
-import talib
+import pandas as pd
 
 from jtrader.core.indicator.indicator import Indicator
 
@@ -34,7 +34,7 @@ class ADX(Indicator):
         return 'ADX'
 
     def is_valid(self, data, comparison_data=None):
-        adx = talib.ADX(data['high'], data['low'], data['close'], timeperiod=self.time_period)
+        adx = self.compute(data, 'ADX', ['high', 'low', 'close'], timeperiod=self.time_period)
 
         self.clean_dataframe(adx)
 
@@ -56,3 +56,13 @@ class ADX(Indicator):
             self.result_info['adx'] = round(last_adx, 2)
 
             return self.BEARISH
+
+    def get_signals(self, data, window=45):
+        adx = self.compute(data, 'ADX', ['high', 'low', 'close'], as_series=False, timeperiod=self.time_period)
+
+        average_adx = pd.Series(adx).shift(1).rolling(5).mean().to_numpy()
+
+        return self.to_signals(
+            (adx >= 25) & (average_adx < 25),
+            (adx <= 20) & (average_adx > 20)
+        )
@@ -1,5 +1,3 @@
-import talib
-
 from jtrader.core.indicator.indicator import Indicator
 
 
@@ -35,7 +33,7 @@ class APO(Indicator):
 
             return
 
-        apo_chart = talib.APO(data['close'], fastperiod=self.fast_period, slowperiod=self.slow_period)
+        apo_chart = self.compute(data, 'APO', ['close'], fastperiod=self.fast_period, slowperiod=self.slow_period)
 
         if len(apo_chart <= 1):
             self.log_invalid_chart_length()
@@ -67,3 +65,22 @@ class APO(Indicator):
                 return True
 
         return False
+
+    def get_signals(self, data, window=45):
+        low = self.as_array(data, 'low')
+        high = self.as_array(data, 'high')
+        apo_chart = self.compute(
+            data,
+            'APO',
+            ['close'],
+            as_series=False,
+            fastperiod=self.fast_period,
+            slowperiod=self.slow_period
+        )
+
+        lookback = self.slow_period
+
+        return self.to_signals(
+            (low < self.previous_min(low, lookback)) & (apo_chart > self.previous_max(apo_chart, lookback)),
+            (high > self.previous_max(high, lookback)) & (apo_chart < self.previous_min(apo_chart, lookback))
+        )
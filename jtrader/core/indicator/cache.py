@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Hashable, List, Optional, Union
+
+import numpy as np
+from pandas import DataFrame
+
+
+class FeatureCache:
+    """
+    LRU cache of computed indicator series (talib outputs), shared by every indicator instance in a process.
+
+    Entries are keyed on the ticker, the bar range they were computed over and the function parameters, so chained
+    indicators and repeated intraday passes over the same window reuse the series instead of recomputing them. When a
+    spill folder is set, evicted entries are written to disk and read back on a miss, which also lets the scanner's
+    evaluation processes share work.
+    """
+
+    def __init__(self, max_entries: int = 1024, spill_folder: Optional[Union[str, Path]] = None):
+        self.max_entries = max_entries
+        self.spill_folder = Path(spill_folder) if spill_folder is not None else None
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_bar_range(data: DataFrame, columns: Optional[List[str]] = None) -> tuple:
+        """
+        Identifies the bars a frame covers: its length, first and last timestamps and a digest of the input columns
+        (every numeric column by default). Intraday providers keep updating the current bar, and intraday frames carry the same
+        day in every `date`, so the values themselves are part of the key.
+        """
+        if len(data) == 0:
+            return 0,
+
+        dates = data['date'].to_numpy() if 'date' in data else data.index.to_numpy()
+
+        digest = hashlib.blake2b(digest_size=16)
+        for column in columns if columns is not None else data.select_dtypes('number').columns:
+            digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=float)).tobytes())
+
+        return len(data), str(dates[0]), str(dates[-1]), digest.hexdigest()
+
+    @classmethod
+    def get_key(
+            cls,
+            ticker: str,
+            data: DataFrame,
+            name: str,
+            params: dict,
+            columns: Optional[List[str]] = None
+    ) -> tuple:
+        return ticker, cls.get_bar_range(data, columns), name, tuple(sorted(params.items()))
+
+    def get_spill_path(self, key: Hashable) -> Path:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+
+        return self.spill_folder / f"{digest}.pkl"
+
+    def get(self, key: Hashable):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+
+                return self.entries[key]
+
+        if self.spill_folder is not None:
+            path = self.get_spill_path(key)
+
+            if path.is_file():
+                with open(path, 'rb') as file:
+                    value = pickle.load(file)
+
+                with self.lock:
+                    self.hits += 1
+
+                self.put(key, value)
+
+                return value
+
+        with self.lock:
+            self.misses += 1
+
+        return None
+
+    def put(self, key: Hashable, value) -> None:
+        # cached arrays are shared between callers, so they must never be modified in place
+        for array in value if isinstance(value, tuple) else (value,):
+            array.flags.writeable = False
+
+        evicted = []
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                evicted.append(self.entries.popitem(last=False))
+
+        if self.spill_folder is not None:
+            for evicted_key, evicted_value in evicted:
+                self.spill(evicted_key, evicted_value)
+
+    def spill(self, key: Hashable, value) -> None:
+        path = self.get_spill_path(key)
+
+        if path.is_file():
+            return
+
+        self.spill_folder.mkdir(exist_ok=True, parents=True)
+
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def compute(self, key: Hashable, function: Callable):
+        value = self.get(key)
+
+        if value is None:
+            value = function()
+            self.put(key, value)
+
+        return value
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def as_numpy(value) -> Union[np.ndarray, tuple]:
+    if isinstance(value, tuple):
+        return tuple(np.asarray(output, dtype=float) for output in value)
+
+    return np.asarray(value, dtype=float)
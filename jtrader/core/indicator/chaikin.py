@@ -1,5 +1,4 @@
 import pandas as pd
-import talib
 from scipy.cluster.vq import kmeans
 
 from jtrader.core.indicator.indicator import Indicator
@@ -31,11 +30,10 @@ class Chaikin(Indicator):
             return
 
         try:
-            adosc = talib.ADOSC(
-                data['high'],
-                data['low'],
-                data['close'],
-                data['volume'],
+            adosc = self.compute(
+                data,
+                'ADOSC',
+                ['high', 'low', 'close', 'volume'],
                 fastperiod=self.fast_period,
                 slowperiod=self.slow_period
             )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+import talib
+
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# bars read before the training range so the indicators are warmed up on its first day
+WARMUP_DAYS = 100
+
+
+def compute_adosc(bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    adosc = talib.ADOSC(bars['high'], bars['low'], bars['close'], bars['volume'], fastperiod=3, slowperiod=10)
+
+    return {'adosc': adosc}
+
+
+def compute_cvi(bars: Dict[str, np.ndarray], period: int = 10) -> Dict[str, np.ndarray]:
+    # Chaikin's volatility, the rate of change of the smoothed high / low range (talib has no CVI)
+    smoothed = talib.EMA(bars['high'] - bars['low'], timeperiod=period)
+
+    return {'cvi': talib.ROC(smoothed, timeperiod=period)}
+
+
+def compute_macd(bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    macd, signal, histogram = talib.MACD(bars['close'], fastperiod=12, slowperiod=26, signalperiod=9)
+
+    return {'macd': macd, 'macd_signal': signal, 'macd_histogram': histogram}
+
+
+def compute_obv(bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return {'obv': talib.OBV(bars['close'], bars['volume'])}
+
+
+def compute_rsi(bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return {'rsi': talib.RSI(bars['close'], timeperiod=14)}
+
+
+def compute_vwma(bars: Dict[str, np.ndarray], period: int = 20) -> Dict[str, np.ndarray]:
+    price_volume = talib.SUM(bars['close'] * bars['volume'], timeperiod=period)
+    volume = talib.SUM(bars['volume'], timeperiod=period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {'vwma': np.where(volume > 0, price_volume / volume, np.nan)}
+
+
+TECHNICAL_FEATURES: Dict[str, Callable[[Dict[str, np.ndarray]], Dict[str, np.ndarray]]] = {
+    'adosc': compute_adosc,
+    'cvi': compute_cvi,
+    'macd': compute_macd,
+    'obv': compute_obv,
+    'rsi': compute_rsi,
+    'vwma': compute_vwma,
+}
+
+
+def compute_technical(bars: pd.DataFrame, indicator_name: str) -> pd.DataFrame:
+    """
+    Computes an IEX technical indicator locally from daily bars, in the layout of `IEX.technicals` frames: indexed by
+    `date`, the bar columns followed by the indicator outputs under their IEX names.
+
+    Arguments:
+        bars: Daily bars, oldest first, with a `date` column (as read from the `BarStore`)
+        indicator_name: One of `TECHNICAL_FEATURES`
+    """
+    dates = pd.to_datetime(bars['date'])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert(None)
+
+    frame = pd.DataFrame(
+        {column: bars[column].to_numpy(dtype=float) for column in BAR_COLUMNS},
+        index=pd.DatetimeIndex(dates.dt.normalize(), name='date')
+    )
+
+    outputs = TECHNICAL_FEATURES[indicator_name]({column: frame[column].to_numpy() for column in BAR_COLUMNS})
+
+    for column, values in outputs.items():
+        frame[column] = values
+
+    return frame
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
 from logging import getLogger, Logger
-from typing import Union, TypeVar
+from typing import List, Union, TypeVar
 
 import numpy as np
+import pandas as pd
+import talib
 from pandas import DataFrame
 
+from jtrader.core.indicator.cache import FeatureCache, as_numpy
+
 
 class Indicator(ABC):
     WINDOW_SIZE_TEN = 10
@@ -20,6 +24,12 @@ class Indicator(ABC):
     BULLISH = TypeVar('BULLISH')
     BEARISH = TypeVar('BEARISH')
 
+    SIGNAL_NONE = 0
+    SIGNAL_BULLISH = 1
+    SIGNAL_BEARISH = -1
+
+    feature_cache = FeatureCache()
+
     def __init__(self, ticker: str):
         self.logger_prop = getLogger()
         self.ticker = ticker
@@ -42,6 +52,89 @@ class Indicator(ABC):
     def result_info(self) -> dict:
         return self._result_info
 
+    def get_signals(self, data: DataFrame, window: int = 45) -> np.ndarray:
+        """
+        Evaluates the indicator against every bar of a chronological (oldest first) series at once.
+
+        Indicators without a vectorized implementation fall back to running `is_valid` against a trailing window of
+        bars ordered newest first, the same shape the scanners hand to `is_valid`.
+
+        Arguments:
+            data: OHLCV bars, oldest first
+            window: Number of trailing bars handed to `is_valid` by the fallback
+
+        Returns:
+            An int8 array aligned with `data` holding SIGNAL_BULLISH, SIGNAL_BEARISH or SIGNAL_NONE per bar
+        """
+        signals = np.full(len(data), self.SIGNAL_NONE, dtype=np.int8)
+
+        for end in range(window, len(data) + 1):
+            frame = data.iloc[end - window:end].iloc[::-1].reset_index(drop=True)
+
+            is_valid = self.is_valid(frame)
+
+            if is_valid == self.BULLISH:
+                signals[end - 1] = self.SIGNAL_BULLISH
+            elif is_valid == self.BEARISH:
+                signals[end - 1] = self.SIGNAL_BEARISH
+
+        return signals
+
+    @classmethod
+    def to_signals(cls, bullish: np.ndarray, bearish: np.ndarray) -> np.ndarray:
+        signals = np.full(len(bullish), cls.SIGNAL_NONE, dtype=np.int8)
+        signals[bullish] = cls.SIGNAL_BULLISH
+        signals[bearish & ~bullish] = cls.SIGNAL_BEARISH
+
+        return signals
+
+    @staticmethod
+    def previous_max(values, window: int) -> np.ndarray:
+        """
+        Highest value of the `window` bars preceding each bar (NaN until enough history exists)
+        """
+        return pd.Series(values, dtype=float).shift(1).rolling(window).max().to_numpy()
+
+    @staticmethod
+    def previous_min(values, window: int) -> np.ndarray:
+        """
+        Lowest value of the `window` bars preceding each bar (NaN until enough history exists)
+        """
+        return pd.Series(values, dtype=float).shift(1).rolling(window).min().to_numpy()
+
+    @staticmethod
+    def as_array(data: DataFrame, column: str) -> np.ndarray:
+        return data[column].to_numpy(dtype=float)
+
+    def compute(self, data: DataFrame, function_name: str, columns: List[str], as_series: bool = True, **params):
+        """
+        Runs a talib function over columns of the frame through the shared feature cache.
+
+        Arguments:
+            data: The bars the function is computed over
+            function_name: The talib function (ADX, MACD...)
+            columns: The frame columns handed to the function, in order
+            as_series: Whether to return Series aligned with the frame (copies, safe to clean in place) or the cached
+                read-only arrays
+
+        Returns:
+            The function output, a tuple when the function has several outputs
+        """
+        key = self.feature_cache.get_key(self.ticker, data, f"{function_name}({','.join(columns)})", params, columns)
+
+        values = self.feature_cache.compute(
+            key,
+            lambda: as_numpy(getattr(talib, function_name)(*[self.as_array(data, column) for column in columns], **params))
+        )
+
+        if not as_series:
+            return values
+
+        if isinstance(values, tuple):
+            return tuple(pd.Series(output, index=data.index, copy=True) for output in values)
+
+        return pd.Series(values, index=data.index, copy=True)
+
     @staticmethod
     def clean_dataframe(dataframe: DataFrame) -> DataFrame:
         dataframe.replace([np.inf, -np.inf], np.nan, inplace=True)
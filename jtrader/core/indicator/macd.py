@@ -1,5 +1,3 @@
-import talib
-
 from jtrader.core.indicator.indicator import Indicator
 
 
@@ -30,8 +28,10 @@ class MACD(Indicator):
 
     def is_valid(self, data, comparison_data=None):
         try:
-            macd, signal_line, histogram = talib.MACD(
-                data['close'],
+            macd, signal_line, histogram = self.compute(
+                data,
+                'MACD',
+                ['close'],
                 fastperiod=self.fast_period,
                 slowperiod=self.slow_period,
                 signalperiod=self.signal_period
@@ -50,3 +50,19 @@ class MACD(Indicator):
             return self.BEARISH
 
         return
+
+    def get_signals(self, data, window=45):
+        macd, signal_line, histogram = self.compute(
+            data,
+            'MACD',
+            ['close'],
+            as_series=False,
+            fastperiod=self.fast_period,
+            slowperiod=self.slow_period,
+            signalperiod=self.signal_period
+        )
+
+        return self.to_signals(
+            (macd > signal_line) & (signal_line < 0),
+            (macd < signal_line) & (signal_line > 0)
+        )
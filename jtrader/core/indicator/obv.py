@@ -1,5 +1,5 @@
+import numpy as np
 import pandas as pd
-import talib
 
 from jtrader.core.indicator.indicator import Indicator
 
@@ -23,7 +23,7 @@ class OBV(Indicator):
         price_has_higher_low = self.has_higher_low(data)
         price_has_higher_high = self.has_higher_high(data)
 
-        obv = talib.OBV(data['close'], data['volume'])
+        obv = self.compute(data, 'OBV', ['close', 'volume'])
         df = pd.DataFrame(obv).reset_index()
         df.columns = ['date', 'low']
 
@@ -49,3 +49,26 @@ class OBV(Indicator):
             return self.BULLISH
 
         return
+
+    def get_signals(self, data, window=45):
+        low = self.as_array(data, 'low')
+        high = self.as_array(data, 'high')
+        obv = self.compute(data, 'OBV', ['close', 'volume'], as_series=False)
+
+        lookback = self.time_period - 1
+        obv_low = self.previous_min(obv, lookback)
+        obv_high = self.previous_max(obv, lookback)
+
+        price_has_lower_low = low < self.previous_min(low, lookback)
+        price_has_higher_low = low > self.previous_max(low, lookback)
+        price_has_lower_high = high < self.previous_min(high, lookback)
+        price_has_higher_high = high > self.previous_max(high, lookback)
+
+        obv_not_has_lower_low = ~(obv < obv_low)
+        obv_not_has_higher_low = ~(obv > obv_high)
+
+        # OBV is a single series, so the high/low checks compare against the same extremes
+        bullish = (price_has_lower_low & obv_not_has_lower_low) | (price_has_higher_low & obv_not_has_higher_low) \
+            | (price_has_lower_high & obv_not_has_lower_low) | (price_has_higher_high & obv_not_has_higher_low)
+
+        return self.to_signals(bullish, np.zeros_like(bullish))
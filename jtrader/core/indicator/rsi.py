@@ -1,5 +1,3 @@
-import talib
-
 from jtrader.core.indicator.indicator import Indicator
 
 
@@ -34,7 +32,7 @@ class RSI(Indicator):
 
         try:
             # key 1 in the output is the smoothed line
-            rsi = talib.STOCHRSI(close, timeperiod=self.time_period)[1]
+            rsi = self.compute(data.loc[close.index], 'STOCHRSI', ['close'], timeperiod=self.time_period)[1]
         except Exception as e:
             self.log_error(e)
 
@@ -56,3 +54,8 @@ class RSI(Indicator):
             return self.BEARISH
 
         return
+
+    def get_signals(self, data, window=45):
+        rsi = self.compute(data, 'STOCHRSI', ['close'], as_series=False, timeperiod=self.time_period)[1]
+
+        return self.to_signals(rsi < 30, rsi > 80)
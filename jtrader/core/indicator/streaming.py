@@ -0,0 +1,600 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from jtrader.core.indicator.indicator import Indicator
+
+
+class EMA:
+    """
+    Exponential moving average updated one value at a time, seeded with the simple average of the first `period`
+    values like talib.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2 / (period + 1)
+        self.seed_total = 0.0
+        self.count = 0
+        self.value: Optional[float] = None
+
+    def seed(self, value: float) -> None:
+        self.value = value
+
+    def update(self, value: float) -> Optional[float]:
+        if self.value is not None:
+            self.value = (value - self.value) * self.k + self.value
+
+            return self.value
+
+        self.seed_total += value
+        self.count += 1
+
+        if self.count == self.period:
+            self.value = self.seed_total / self.period
+
+        return self.value
+
+
+class RollingWindow:
+    """
+    The last `size` values with running sum, min and max. Min and max scan the fixed size window, so every operation is
+    independent of the history length.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+
+    def append(self, value: float) -> None:
+        if len(self.values) == self.size:
+            self.total -= self.values[0]
+
+        self.values.append(value)
+        self.total += value
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.values) == self.size
+
+    def min(self) -> float:
+        return min(self.values)
+
+    def max(self) -> float:
+        return max(self.values)
+
+    def mean(self) -> float:
+        return self.total / len(self.values)
+
+
+class StreamingIndicator(ABC):
+    """
+    Rolling state of an indicator that is advanced once per closed candle in constant time, so the live traders do not
+    recompute every indicator over the whole history on each tick.
+
+    Values match the talib functions the batch indicators use, signals follow the rules of the batch indicator's
+    `get_signals` evaluated at the latest candle.
+    """
+
+    def __init__(self):
+        self.value = None
+
+    @staticmethod
+    @abstractmethod
+    def get_name() -> str:
+        pass
+
+    @property
+    def is_ready(self) -> bool:
+        return self.value is not None
+
+    @abstractmethod
+    def update(self, candle: dict):
+        """
+        Arguments:
+            candle: The closed candle (high, low, close and volume)
+
+        Returns:
+            The indicator value at that candle, None while there is not enough history
+        """
+        pass
+
+    def signal(self) -> Union[Indicator.BULLISH, Indicator.BEARISH, None]:
+        return None
+
+
+class StreamingMACD(StreamingIndicator):
+    """
+    MACD line, signal line and histogram (talib.MACD).
+    """
+
+    def __init__(
+            self,
+            fast_period: int = Indicator.WINDOW_SIZE_FOURTEEN,
+            slow_period: int = Indicator.WINDOW_SIZE_TWENTY_EIGHT,
+            signal_period: int = Indicator.WINDOW_SIZE_TEN
+    ):
+        super().__init__()
+
+        self.fast = EMA(fast_period)
+        self.slow = EMA(slow_period)
+        self.signal_line = EMA(signal_period)
+        # talib seeds both averages on the same bar, the fast one from the last `fast_period` closes of the slow seed
+        self.seed_closes = RollingWindow(fast_period)
+
+    @staticmethod
+    def get_name() -> str:
+        return 'MACD'
+
+    def update(self, candle):
+        close = float(candle['close'])
+
+        if self.slow.value is None:
+            self.seed_closes.append(close)
+
+            if self.slow.update(close) is None:
+                return None
+
+            self.fast.seed(self.seed_closes.mean())
+        else:
+            self.fast.update(close)
+            self.slow.update(close)
+
+        macd = self.fast.value - self.slow.value
+
+        if self.signal_line.update(macd) is None:
+            return None
+
+        self.value = (macd, self.signal_line.value, macd - self.signal_line.value)
+
+        return self.value
+
+    def signal(self):
+        if self.value is None:
+            return None
+
+        macd, signal_line, _ = self.value
+
+        if macd > signal_line and signal_line < 0:
+            return Indicator.BULLISH
+
+        if macd < signal_line and signal_line > 0:
+            return Indicator.BEARISH
+
+        return None
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    Wilder's relative strength index (talib.RSI).
+    """
+
+    def __init__(self, time_period: int = Indicator.WINDOW_SIZE_TEN):
+        super().__init__()
+
+        self.time_period = time_period
+        self.previous_close: Optional[float] = None
+        self.average_gain = 0.0
+        self.average_loss = 0.0
+        self.count = 0
+
+    @staticmethod
+    def get_name() -> str:
+        return 'RSI'
+
+    def update(self, candle):
+        close = float(candle['close'])
+
+        if self.previous_close is None:
+            self.previous_close = close
+
+            return None
+
+        change = close - self.previous_close
+        self.previous_close = close
+
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+
+        if self.count < self.time_period:
+            self.average_gain += gain / self.time_period
+            self.average_loss += loss / self.time_period
+            self.count += 1
+
+            if self.count < self.time_period:
+                return None
+        else:
+            self.average_gain = (self.average_gain * (self.time_period - 1) + gain) / self.time_period
+            self.average_loss = (self.average_loss * (self.time_period - 1) + loss) / self.time_period
+
+        total = self.average_gain + self.average_loss
+        self.value = 100 * self.average_gain / total if total != 0 else 0.0
+
+        return self.value
+
+
+class StreamingStochRSI(StreamingIndicator):
+    """
+    Stochastic RSI smoothed line (talib.STOCHRSI output 1), the series the `RSI` indicator trades on.
+    """
+
+    def __init__(self, time_period: int = Indicator.WINDOW_SIZE_TEN, fastk_period: int = 5, fastd_period: int = 3):
+        super().__init__()
+
+        self.rsi = StreamingRSI(time_period)
+        self.rsi_window = RollingWindow(fastk_period)
+        self.fastk_window = RollingWindow(fastd_period)
+
+    @staticmethod
+    def get_name() -> str:
+        return 'RSI'
+
+    def update(self, candle):
+        rsi = self.rsi.update(candle)
+
+        if rsi is None:
+            return None
+
+        self.rsi_window.append(rsi)
+
+        if not self.rsi_window.is_full:
+            return None
+
+        lowest = self.rsi_window.min()
+        highest = self.rsi_window.max()
+        fastk = 100 * (rsi - lowest) / (highest - lowest) if highest != lowest else 0.0
+
+        self.fastk_window.append(fastk)
+
+        if not self.fastk_window.is_full:
+            return None
+
+        self.value = self.fastk_window.mean()
+
+        return self.value
+
+    def signal(self):
+        if self.value is None:
+            return None
+
+        if self.value < 30:
+            return Indicator.BULLISH
+
+        if self.value > 80:
+            return Indicator.BEARISH
+
+        return None
+
+
+class StreamingOBV(StreamingIndicator):
+    """
+    On-balance volume (talib.OBV).
+    """
+
+    def __init__(self, time_period: int = Indicator.WINDOW_SIZE_TEN):
+        super().__init__()
+
+        lookback = time_period - 1
+        self.previous_close: Optional[float] = None
+        self.lows = RollingWindow(lookback)
+        self.highs = RollingWindow(lookback)
+        self.values = RollingWindow(lookback)
+        self.current_signal = None
+
+    @staticmethod
+    def get_name() -> str:
+        return 'OBV'
+
+    def update(self, candle):
+        close = float(candle['close'])
+        volume = float(candle['volume'])
+        low = float(candle['low'])
+        high = float(candle['high'])
+
+        if self.previous_close is None:
+            self.value = volume
+        elif close > self.previous_close:
+            self.value += volume
+        elif close < self.previous_close:
+            self.value -= volume
+
+        self.previous_close = close
+
+        self.current_signal = None
+        if self.values.is_full:
+            obv_not_has_lower_low = not self.value < self.values.min()
+            obv_not_has_higher_low = not self.value > self.values.max()
+
+            if (low < self.lows.min() or high < self.highs.min()) and obv_not_has_lower_low or \
+                    (low > self.lows.max() or high > self.highs.max()) and obv_not_has_higher_low:
+                self.current_signal = Indicator.BULLISH
+
+        self.lows.append(low)
+        self.highs.append(high)
+        self.values.append(self.value)
+
+        return self.value
+
+    def signal(self):
+        return self.current_signal
+
+
+class StreamingAPO(StreamingIndicator):
+    """
+    Absolute price oscillator, the difference of the fast and slow simple moving averages of the close (talib.APO).
+    """
+
+    def __init__(
+            self,
+            fast_period: int = Indicator.WINDOW_SIZE_FOURTEEN,
+            slow_period: int = Indicator.WINDOW_SIZE_TWENTY_EIGHT
+    ):
+        super().__init__()
+
+        self.fast = RollingWindow(fast_period)
+        self.slow = RollingWindow(slow_period)
+        self.lows = RollingWindow(slow_period)
+        self.highs = RollingWindow(slow_period)
+        self.values = RollingWindow(slow_period)
+        self.current_signal = None
+
+    @staticmethod
+    def get_name() -> str:
+        return 'Absolute Price Oscillator'
+
+    def update(self, candle):
+        close = float(candle['close'])
+        low = float(candle['low'])
+        high = float(candle['high'])
+
+        self.fast.append(close)
+        self.slow.append(close)
+
+        self.current_signal = None
+
+        if self.slow.is_full:
+            self.value = self.fast.mean() - self.slow.mean()
+
+            if self.values.is_full:
+                if low < self.lows.min() and self.value > self.values.max():
+                    self.current_signal = Indicator.BULLISH
+                elif high > self.highs.max() and self.value < self.values.min():
+                    self.current_signal = Indicator.BEARISH
+
+            self.values.append(self.value)
+
+        self.lows.append(low)
+        self.highs.append(high)
+
+        return self.value
+
+    def signal(self):
+        return self.current_signal
+
+
+class StreamingVWAP(StreamingIndicator):
+    """
+    Rolling volume weighted average price over the typical price (ta.volume.VolumeWeightedAveragePrice).
+
+    Signals when the VWAP leaves the band of one standard deviation around the linear regression of its last
+    `band_period` values (talib.LINEARREG / STDDEV), BEARISH above and BULLISH below, as the `VWAP` indicator does over
+    the bars it is handed.
+    """
+
+    def __init__(self, window: int = Indicator.WINDOW_SIZE_FOURTEEN, band_period: int = Indicator.WINDOW_SIZE_FORTY):
+        super().__init__()
+
+        self.price_volumes = RollingWindow(window)
+        self.volumes = RollingWindow(window)
+        self.values = RollingWindow(band_period)
+        self.current_signal = None
+
+    @staticmethod
+    def get_name() -> str:
+        return 'VWAP'
+
+    def update(self, candle):
+        typical_price = (float(candle['high']) + float(candle['low']) + float(candle['close'])) / 3
+        volume = float(candle['volume'])
+
+        self.price_volumes.append(typical_price * volume)
+        self.volumes.append(volume)
+
+        if not self.volumes.is_full or self.volumes.total == 0:
+            return None
+
+        self.value = self.price_volumes.total / self.volumes.total
+        self.values.append(self.value)
+
+        self.current_signal = None
+        if self.values.is_full:
+            values = np.fromiter(self.values.values, dtype=float)
+            slope, intercept = np.polyfit(np.arange(len(values)), values, 1)
+            regression = intercept + slope * (len(values) - 1)
+            standard = values.std()
+
+            if self.value > regression + standard:
+                self.current_signal = Indicator.BEARISH
+            elif self.value < regression - standard:
+                self.current_signal = Indicator.BULLISH
+
+        return self.value
+
+    def signal(self):
+        return self.current_signal
+
+
+class StreamingADX(StreamingIndicator):
+    """
+    Wilder's average directional movement index (talib.ADX).
+    """
+
+    def __init__(self, time_period: int = Indicator.WINDOW_SIZE_TEN):
+        super().__init__()
+
+        self.time_period = time_period
+        self.previous: Optional[dict] = None
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.true_range = 0.0
+        self.dx_total = 0.0
+        self.count = 0
+        self.values = RollingWindow(5)
+        self.current_signal = None
+
+    @staticmethod
+    def get_name() -> str:
+        return 'ADX'
+
+    def update(self, candle):
+        high = float(candle['high'])
+        low = float(candle['low'])
+        close = float(candle['close'])
+
+        if self.previous is None:
+            self.previous = {'high': high, 'low': low, 'close': close}
+
+            return None
+
+        diff_plus = high - self.previous['high']
+        diff_minus = self.previous['low'] - low
+        true_range = max(high - low, abs(high - self.previous['close']), abs(low - self.previous['close']))
+
+        self.previous = {'high': high, 'low': low, 'close': close}
+        self.count += 1
+
+        if self.count >= self.time_period:
+            self.plus_dm -= self.plus_dm / self.time_period
+            self.minus_dm -= self.minus_dm / self.time_period
+            self.true_range -= self.true_range / self.time_period
+
+        if diff_minus > 0 and diff_plus < diff_minus:
+            self.minus_dm += diff_minus
+        elif diff_plus > 0 and diff_plus > diff_minus:
+            self.plus_dm += diff_plus
+
+        self.true_range += true_range
+
+        if self.count < self.time_period:
+            return None
+
+        dx = None
+        if self.true_range != 0:
+            plus_di = 100 * self.plus_dm / self.true_range
+            minus_di = 100 * self.minus_dm / self.true_range
+
+            if plus_di + minus_di != 0:
+                dx = 100 * abs(minus_di - plus_di) / (plus_di + minus_di)
+
+        if self.count < self.time_period * 2 - 1:
+            self.dx_total += dx or 0.0
+
+            return None
+
+        if self.value is None:
+            self.value = (self.dx_total + (dx or 0.0)) / self.time_period
+        elif dx is not None:
+            self.value = (self.value * (self.time_period - 1) + dx) / self.time_period
+
+        self.current_signal = None
+        if self.values.is_full:
+            average = self.values.mean()
+
+            if self.value >= 25 > average:
+                self.current_signal = Indicator.BULLISH
+            elif self.value <= 20 < average:
+                self.current_signal = Indicator.BEARISH
+
+        self.values.append(self.value)
+
+        return self.value
+
+    def signal(self):
+        return self.current_signal
+
+
+class StreamingULTOSC(StreamingIndicator):
+    """
+    Ultimate oscillator over 1x, 2x and 3x the time period (talib.ULTOSC).
+    """
+
+    def __init__(self, time_period: int = Indicator.WINDOW_SIZE_TEN):
+        super().__init__()
+
+        self.previous_close: Optional[float] = None
+        self.buying_pressures = [RollingWindow(time_period * factor) for factor in (1, 2, 3)]
+        self.true_ranges = [RollingWindow(time_period * factor) for factor in (1, 2, 3)]
+        self.lows = RollingWindow(time_period)
+        self.highs = RollingWindow(time_period)
+        self.values = RollingWindow(time_period)
+        self.current_signal = None
+
+    @staticmethod
+    def get_name() -> str:
+        return 'Ultimate Oscillator'
+
+    def update(self, candle):
+        high = float(candle['high'])
+        low = float(candle['low'])
+        close = float(candle['close'])
+
+        if self.previous_close is None:
+            self.previous_close = close
+
+            return None
+
+        true_low = min(low, self.previous_close)
+        buying_pressure = close - true_low
+        true_range = max(high, self.previous_close) - true_low
+        self.previous_close = close
+
+        for buying_pressures, true_ranges in zip(self.buying_pressures, self.true_ranges):
+            buying_pressures.append(buying_pressure)
+            true_ranges.append(true_range)
+
+        if not self.true_ranges[-1].is_full:
+            return None
+
+        averages = [
+            buying_pressures.total / true_ranges.total if true_ranges.total != 0 else 0.0
+            for buying_pressures, true_ranges in zip(self.buying_pressures, self.true_ranges)
+        ]
+        self.value = 100 * (4 * averages[0] + 2 * averages[1] + averages[2]) / 7
+
+        self.current_signal = None
+        if self.values.is_full:
+            has_lower_low = low < self.lows.min()
+
+            if has_lower_low and self.value > self.values.max():
+                self.current_signal = Indicator.BULLISH
+            elif not has_lower_low and high > self.highs.max() and self.value < self.values.min():
+                self.current_signal = Indicator.BEARISH
+
+        self.values.append(self.value)
+        self.lows.append(low)
+        self.highs.append(high)
+
+        return self.value
+
+    def signal(self):
+        return self.current_signal
+
+
+def get_streaming_indicators() -> Dict[str, StreamingIndicator]:
+    """
+    A fresh state for every indicator the live traders follow, with the batch indicators' default parameters.
+    """
+    return {
+        'apo': StreamingAPO(),
+        'macd': StreamingMACD(),
+        'rsi': StreamingStochRSI(),
+        'obv': StreamingOBV(),
+        'vwap': StreamingVWAP(),
+        'adx': StreamingADX(),
+        'ultosc': StreamingULTOSC(),
+    }
@@ -1,4 +1,3 @@
-import talib
 from pandas import DataFrame
 
 from jtrader.core.indicator.indicator import Indicator
@@ -62,10 +61,10 @@ class ULTOSC(Indicator):
         return
 
     def get_chart(self, data: DataFrame):
-        chart = talib.ULTOSC(
-            data['high'],
-            data['low'],
-            data['close'],
+        chart = self.compute(
+            data,
+            'ULTOSC',
+            ['high', 'low', 'close'],
             timeperiod1=self.time_period,
             timeperiod2=self.time_period * 2,
             timeperiod3=self.time_period * 3
@@ -74,3 +73,24 @@ class ULTOSC(Indicator):
         self.clean_dataframe(chart)
 
         return chart
+
+    def get_signals(self, data, window=45):
+        low = self.as_array(data, 'low')
+        high = self.as_array(data, 'high')
+        chart = self.compute(
+            data,
+            'ULTOSC',
+            ['high', 'low', 'close'],
+            as_series=False,
+            timeperiod1=self.time_period,
+            timeperiod2=self.time_period * 2,
+            timeperiod3=self.time_period * 3
+        )
+
+        lookback = self.time_period
+        has_lower_low = low < self.previous_min(low, lookback)
+
+        return self.to_signals(
+            has_lower_low & (chart > self.previous_max(chart, lookback)),
+            ~has_lower_low & (high > self.previous_max(high, lookback)) & (chart < self.previous_min(chart, lookback))
+        )
@@ -8,6 +8,8 @@ import pandas as pd
 from pandas import DataFrame
 from sklearn.model_selection import train_test_split
 
+from jtrader.core.artifact_store import read_frame
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -35,7 +37,7 @@ class DataLoader(ABC):
         You can provide either a data locaiton or direct data
 
         Arguments:
-            local_data_location: The location of the file to load the data from
+            local_data_location: The location of the file to load the data from (Arrow / Feather, Parquet or pickle)
             data: The dataframe
         """
         assert (0 < validation_frac + test_frac < 1) and (
@@ -77,9 +79,7 @@ class DataLoader(ABC):
         """
         if self._data is not None:
             return self._data
-        self._data = pd.read_pickle(
-            self.local_data_location
-        )
+        self._data = read_frame(self.local_data_location)
         return self._data
 
     @property
@@ -1,2 +1,3 @@
 from .data_loader import LocalDataLoader
 from .linear_learner import LocalLinearLearner
+from .tuner import ProphetTuner
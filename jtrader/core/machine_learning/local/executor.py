@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+
+def get_executor(
+        max_workers: Optional[int] = None,
+        dask_cluster_address: Optional[str] = None
+) -> Tuple[Executor, Callable]:
+    """
+    Executor for model training tasks and the callable that releases it: the Dask cluster when an address is given,
+    local processes otherwise. A single worker runs in a thread of the current process, which also works inside
+    daemonic Dask workers that can not start processes of their own.
+    """
+    if dask_cluster_address:
+        from distributed import Client
+
+        client = Client(address=dask_cluster_address)
+
+        return client.get_executor(), client.close
+
+    if max_workers == 1:
+        executor = ThreadPoolExecutor(max_workers=1)
+    else:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    return executor, executor.shutdown
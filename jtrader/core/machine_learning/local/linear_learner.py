@@ -1,22 +1,19 @@
-import hashlib
-import itertools
-import json
-import gc
-from pathlib import Path
-from typing import Union, Optional
-
-import numpy as np
+from typing import List, Union, Optional
+
 import pandas as pd
 from pandas import DataFrame
 from prophet import Prophet
-from prophet.diagnostics import cross_validation, performance_metrics
 
+from jtrader.core.artifact_store import ArtifactStore
 from jtrader.core.machine_learning.base_model import BaseModel
 from jtrader.core.odm import ODM
 from .data_loader import DataLoader
+from .tuner import ProphetTuner, get_prophet_model
 
 MODEL_FOLDER = 'models'
 
+MODELS = ArtifactStore(MODEL_FOLDER)
+
 
 class LocalLinearLearner(BaseModel):
     container_name: str = "linear-learner"
@@ -40,33 +37,32 @@ class LocalLinearLearner(BaseModel):
 
     @staticmethod
     def save_model(model, name: str) -> None:
-        try:
-            Path(MODEL_FOLDER).mkdir(exist_ok=True, parents=True)
-        except Exception as ex:
-            pass
-        pd.to_pickle(model, f"{MODEL_FOLDER}/{name}.pkl")
+        MODELS.save_model(name, model)
+
+    def merge_extra_features(self, extra_features: dict = None) -> List[str]:
+        """
+        Merges the feature series into the training data and returns their names, to be added as regressors.
+        """
+        if extra_features is None:
+            return []
+
+        for feature in extra_features.keys():
+            if feature not in self.data.data:
+                df = extra_features[feature]
+                df.reset_index(level=0, inplace=True)
+                df.rename(columns={"date": "ds"}, inplace=True)
+                df.fillna(extra_features[feature].mean(), inplace=True)
+                data = pd.merge_asof(self.data.data, df, on='ds', direction='nearest')
+                self.data._data = data
+
+        return list(extra_features.keys())
 
     def get_prophet_model(self, prophet_params: dict, extra_features: dict = None):
-        model = Prophet(**prophet_params)
-
-        if extra_features is not None:
-            for feature in extra_features.keys():
-                model.add_regressor(feature)
-                if feature not in self.data.data:
-                    df = extra_features[feature]
-                    df.reset_index(level=0, inplace=True)
-                    df.rename(columns={"date": "ds"}, inplace=True)
-                    df.fillna(extra_features[feature].mean(), inplace=True)
-                    data = pd.merge_asof(self.data.data, df, on='ds', direction='nearest')
-                    self.data._data = data
+        return get_prophet_model(prophet_params, self.merge_extra_features(extra_features))
 
-        return model
-
-    def load_model(self, model_name: str = "") -> Union[bool, pd.DataFrame]:
-        path = Path(f"{MODEL_FOLDER}/{model_name}.pkl")
-        if path.is_file():
-            model = pd.read_pickle(f"{MODEL_FOLDER}/{model_name}.pkl")
-        else:
+    def load_model(self, model_name: str = "") -> Union[bool, Prophet]:
+        model = MODELS.load(model_name)
+        if model is None:
             model = False
 
         self._model = model
@@ -77,56 +73,22 @@ class LocalLinearLearner(BaseModel):
             self,
             hyperparameters: Optional[dict] = None,
             extra_features: Optional[dict] = None,
-            dask_cluster_address: Optional[str] = None
+            dask_cluster_address: Optional[str] = None,
+            max_workers: Optional[int] = None
     ) -> Prophet:
         if hyperparameters is None or len(hyperparameters) == 0:
             hyperparameters = self.db.get_prophet_params(self.stock, self.model_name, self.is_stock_specific)
 
         # if there are no hyperparameters provided, run auto-tuning
         if hyperparameters is None:
-            seasonality_grid = {
-                'fourier': [0.005, .01, 0.05, 0.5, 1, 5, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100],
-                'prior_scale': [0.005, .01, 0.05, 0.5, 1, 5, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
-            }
-
-            param_grid = {
-                'changepoint_prior_scale': [0.001, 0.01, 0.1, 0.5],
-                'seasonality_prior_scale': [0.01, 0.1, 1.0, 10.0],
-                'seasonality_mode': ['additive', 'multiplicative']
-            }
-
-            fitted_models = {}
-            all_params = [dict(zip(param_grid.keys(), v)) for v in itertools.product(*param_grid.values())]
-            rmses = []
-
-            for params in all_params:
-                gc.collect()
-
-                param_hash = hashlib.md5(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
-                model = self.get_prophet_model(params, extra_features)
-
-                model.fit(self.data.data)
-
-                fitted_models[param_hash] = model
-
-                mode = 'processes'
-                if dask_cluster_address:
-                    from distributed import Client
-                    Client(address=dask_cluster_address)
-                    mode = 'dask'
-
-                df_cv = cross_validation(model, horizon='30 days', parallel=mode)
-                df_p = performance_metrics(df_cv, rolling_window=1)
-                rmses.append(df_p['rmse'].values[0])
-
-            best_params = all_params[np.argmin(rmses)]
-
-            if len(rmses) > 0:
-                self.db.put_prophet_params(self.stock, self.model_name, best_params, self.is_stock_specific)
-
-            self._model = fitted_models[
-                hashlib.md5(json.dumps(best_params, sort_keys=True).encode('utf-8')).hexdigest()
-            ]
+            best_params, self._model, _ = ProphetTuner(
+                self.data.data,
+                regressors=self.merge_extra_features(extra_features),
+                max_workers=max_workers,
+                dask_cluster_address=dask_cluster_address
+            ).run()
+
+            self.db.put_prophet_params(self.stock, self.model_name, best_params, self.is_stock_specific)
         else:
             model = self.get_prophet_model(hyperparameters, extra_features)
 
@@ -151,7 +113,7 @@ class LocalLinearLearner(BaseModel):
 
         if extra_features is not None:
             for feature in extra_features.keys():
-                extra_features[feature].drop(extra_features[feature].columns.difference(['ds', 'yhat']), 1,
+                extra_features[feature].drop(extra_features[feature].columns.difference(['ds', 'yhat']), axis=1,
                                              inplace=True)
                 extra_features[feature].rename(columns={"yhat": feature}, inplace=True)
                 prediction_no_weekdays = pd.merge(prediction_no_weekdays, extra_features[feature], on='ds')
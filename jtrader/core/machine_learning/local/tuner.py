@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import itertools
+import math
+import os
+from logging import getLogger
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from prophet.diagnostics import generate_cutoffs
+
+from .executor import get_executor
+
+PARAM_GRID = {
+    'changepoint_prior_scale': [0.001, 0.01, 0.1, 0.5],
+    'seasonality_prior_scale': [0.01, 0.1, 1.0, 10.0],
+    'seasonality_mode': ['additive', 'multiplicative']
+}
+
+
+def get_prophet_model(params: dict, regressors: Optional[List[str]] = None) -> Prophet:
+    model = Prophet(**params)
+
+    for regressor in regressors or []:
+        model.add_regressor(regressor)
+
+    return model
+
+
+def evaluate_fold(
+        data: pd.DataFrame,
+        params: dict,
+        regressors: List[str],
+        cutoff: pd.Timestamp,
+        horizon: pd.Timedelta
+) -> Tuple[float, int]:
+    """
+    Fits `params` on the data up to `cutoff` and forecasts the following `horizon`, the same simulated forecast as one
+    Prophet cross validation fold. Returns the sum of squared errors and the number of forecast points, so folds can be
+    accumulated into an RMSE as candidates advance.
+    """
+    train = data[data['ds'] <= cutoff]
+    test = data[(data['ds'] > cutoff) & (data['ds'] <= cutoff + horizon)]
+
+    if len(test) == 0:
+        return 0.0, 0
+
+    model = get_prophet_model(params, regressors)
+    model.fit(train)
+
+    errors = test['y'].to_numpy() - model.predict(test.drop(columns='y'))['yhat'].to_numpy()
+
+    return float(np.sum(errors ** 2)), len(errors)
+
+
+class ProphetTuner:
+    """
+    Hyperparameter search for Prophet by successive halving over cross validation folds.
+
+    Every candidate of the grid is first scored on a few folds spread across the history, only the best `1 / eta` of
+    them advance to the next rung where they are scored on `eta` times as many folds, until one candidate is left or
+    every fold has been used. Folds are dispatched one task each to a process pool, or to the Dask cluster when an
+    address is given, and return scores only, so the single model kept is the winner refitted on the full data.
+    """
+
+    def __init__(
+            self,
+            data: pd.DataFrame,
+            param_grid: Optional[Dict[str, list]] = None,
+            regressors: Optional[List[str]] = None,
+            horizon: str = '30 days',
+            initial: Optional[str] = None,
+            period: Optional[str] = None,
+            min_folds: int = 3,
+            eta: int = 3,
+            max_workers: Optional[int] = None,
+            dask_cluster_address: Optional[str] = None
+    ):
+        self.data = data
+        self.param_grid = param_grid or PARAM_GRID
+        self.regressors = regressors or []
+        self.horizon = pd.Timedelta(horizon)
+        self.initial = pd.Timedelta(initial) if initial is not None else 3 * self.horizon
+        self.period = pd.Timedelta(period) if period is not None else self.horizon / 2
+        self.min_folds = min_folds
+        self.eta = eta
+        self.max_workers = max_workers or os.cpu_count()
+        self.dask_cluster_address = dask_cluster_address
+        self.logger = getLogger()
+
+    @property
+    def candidates(self) -> List[dict]:
+        return [dict(zip(self.param_grid.keys(), values)) for values in itertools.product(*self.param_grid.values())]
+
+    @staticmethod
+    def get_fold_indices(total: int, count: int) -> List[int]:
+        """
+        `count` folds evenly spread over `total`, so early rungs already see the whole history.
+        """
+        return sorted(set(np.linspace(0, total - 1, min(count, total)).round().astype(int).tolist()))
+
+    def run(self) -> Tuple[dict, Prophet, Dict[int, float]]:
+        """
+        Returns the best parameters, the model refitted with them on the full data and the RMSE of every candidate
+        after the last rung it reached.
+        """
+        candidates = self.candidates
+        cutoffs = generate_cutoffs(self.data, self.horizon, self.initial, self.period)
+
+        errors: Dict[int, Dict[int, Tuple[float, int]]] = {candidate: {} for candidate in range(len(candidates))}
+        rmses: Dict[int, float] = {}
+
+        executor, close = get_executor(self.max_workers, self.dask_cluster_address)
+        try:
+            alive = list(range(len(candidates)))
+            fold_count = self.min_folds
+
+            while True:
+                folds = self.get_fold_indices(len(cutoffs), fold_count)
+
+                # folds already scored at a lower rung are not refitted
+                futures = {
+                    (candidate, fold): executor.submit(
+                        evaluate_fold,
+                        self.data,
+                        candidates[candidate],
+                        self.regressors,
+                        cutoffs[fold],
+                        self.horizon
+                    )
+                    for candidate in alive for fold in folds if fold not in errors[candidate]
+                }
+
+                for (candidate, fold), future in futures.items():
+                    errors[candidate][fold] = future.result()
+
+                for candidate in alive:
+                    squared_error = sum(error for error, _ in errors[candidate].values())
+                    points = sum(count for _, count in errors[candidate].values())
+                    rmses[candidate] = math.sqrt(squared_error / points) if points > 0 else math.inf
+
+                alive.sort(key=lambda candidate: rmses[candidate])
+
+                self.logger.info(
+                    f"Scored {len(alive)} candidates on {len(folds)}/{len(cutoffs)} folds, "
+                    f"best rmse {rmses[alive[0]]:.4f}"
+                )
+
+                if len(alive) == 1 or len(folds) == len(cutoffs):
+                    break
+
+                alive = alive[:max(1, len(alive) // self.eta)]
+                fold_count *= self.eta
+        finally:
+            close()
+
+        best_params = candidates[alive[0]]
+
+        model = get_prophet_model(best_params, self.regressors)
+        model.fit(self.data)
+
+        return best_params, model, rmses
@@ -1,26 +1,52 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from dask.distributed import Worker, Scheduler
+from prophet import Prophet
 
 import jtrader.core.machine_learning as ml
+from jtrader.core.algorithms import ALGORITHMS  # noqa: F401
+from jtrader.core.artifact_store import ArtifactStore
+from jtrader.core.bar_store import BarStore
+from jtrader.core.indicator.features import TECHNICAL_FEATURES, WARMUP_DAYS, compute_technical
+from jtrader.core.machine_learning.local.executor import get_executor
 from jtrader.core.provider import IEX
 
 API_RESULT_FOLDER = 'provider_data'
 PREDICTION_FOLDER = 'predictions'
-ALGORITHMS = [
-    'linear-learner'
-]
+
+API_RESULTS = ArtifactStore(API_RESULT_FOLDER)
+PREDICTIONS = ArtifactStore(PREDICTION_FOLDER)
+
+# how long a saved API result is used before its newest rows are fetched again
+API_RESULT_TTLS = {
+    IEX.IEX_DATA_TYPE_INDICATOR: timedelta(days=1),
+    IEX.IEX_DATA_TYPE_ECONOMICS: timedelta(days=30),
+}
+
+# IEX technicals ranges, smallest first, with the days they cover. IEX computes an indicator over the requested range
+# only, so a refresh also requests WARMUP_DAYS before the gap and keeps just the rows after the saved ones
+TECHNICALS_RANGES = [('5d', 5), ('1m', 30), ('3m', 91), ('6m', 182), ('1y', 365), ('2y', 730), ('5y', 1826)]
+
+
+def timed(function: Callable, *args, **kwargs) -> Tuple[Any, float]:
+    start = time.perf_counter()
+
+    return function(*args, **kwargs), time.perf_counter() - start
 
 
 class ML:
     def __init__(self, iex_provider: IEX):
         self.client = iex_provider
+        self.bar_store = BarStore()
 
     @staticmethod
     def start_dask_worker(
@@ -51,50 +77,457 @@ class ML:
 
     @staticmethod
     def save_api_result(api_result, name) -> None:
-        try:
-            Path(API_RESULT_FOLDER).mkdir(exist_ok=True, parents=True)
-        except Exception as ex:
-            pass
-        pd.to_pickle(api_result, f"{API_RESULT_FOLDER}/{name}.pkl")
+        API_RESULTS.save_frame(name, api_result)
 
     @staticmethod
     def save_prediction_result(prediction, name) -> None:
-        try:
-            Path(PREDICTION_FOLDER).mkdir(exist_ok=True, parents=True)
-        except Exception as ex:
-            pass
-        pd.to_pickle(prediction, f"{PREDICTION_FOLDER}/{name}.pkl")
+        PREDICTIONS.save_frame(name, prediction)
 
     @staticmethod
     def load_api_result(name) -> Union[None, pd.DataFrame]:
-        path = Path(f"{API_RESULT_FOLDER}/{name}.pkl")
-        if path.is_file():
-            model = pd.read_pickle(f"{API_RESULT_FOLDER}/{name}.pkl")
-        else:
-            model = None
-        return model
+        return API_RESULTS.load(name)
 
     @staticmethod
     def load_prediction_result(name) -> Union[None, pd.DataFrame]:
-        path = Path(f"{PREDICTION_FOLDER}/{name}.pkl")
-        if path.is_file():
-            prediction = pd.read_pickle(f"{PREDICTION_FOLDER}/{name}.pkl")
-        else:
-            prediction = None
-        return prediction
+        return PREDICTIONS.load(name)
 
     @staticmethod
-    def load_model(name: str) -> Union[None, pd.DataFrame]:
+    def load_model(name: str) -> Union[None, Prophet]:
         path = Path(name)
         if path.is_file():
-            model = pd.read_pickle(f"{name}")
+            return pd.read_pickle(path)
+
+        return ml.local.linear_learner.MODELS.load(name)
+
+    @staticmethod
+    def optimize_machine_learning_params(
+            data: pd.DataFrame,
+            param_grid: Optional[Dict[str, list]] = None,
+            regressors: Optional[List[str]] = None,
+            dask_cluster_address: Optional[str] = None
+    ) -> Tuple[dict, Prophet]:
+        """
+        Searches the Prophet parameter grid for `data` (`ds`/`y` plus regressor columns) and returns the best parameters
+        with the model fitted on them.
+
+        Arguments:
+            data: The training data
+            param_grid: Candidate values per Prophet parameter, the trainer's default grid if not provided
+            regressors: Extra columns of `data` to add as regressors
+            dask_cluster_address: Dispatch the candidates to this Dask scheduler instead of local processes
+        """
+        best_params, model, _ = ml.local.ProphetTuner(
+            data,
+            param_grid=param_grid,
+            regressors=regressors,
+            dask_cluster_address=dask_cluster_address
+        ).run()
+
+        return best_params, model
+
+    def fetch_api_result(self, stock: str, data_type: str, indicator_name: str, timeframe: str) -> pd.DataFrame:
+        if data_type == self.client.IEX_DATA_TYPE_INDICATOR:
+            return self.client.technicals(
+                stock,
+                indicator_name,
+                timeframe,
+                True
+            ).sort_values(by='date', ascending=True)
+        elif data_type == self.client.IEX_DATA_TYPE_ECONOMICS:
+            return self.client.economic(
+                indicator_name,
+                timeframe,
+                True
+            ).sort_values(by='date', ascending=True)
+
+        raise RuntimeError
+
+    @staticmethod
+    def get_refresh_timeframe(data_type: str, gap: timedelta, timeframe: str) -> str:
+        """
+        The smallest range that covers the `gap` since the last saved row and the indicator's warmup before it, the
+        full `timeframe` when none does.
+        """
+        if data_type == IEX.IEX_DATA_TYPE_ECONOMICS:
+            # economic rows are dated by counting back from the latest release, so a partial download does not line up
+            # with the saved rows, the series is small enough to download again
+            return timeframe
+
+        for refresh_timeframe, days in TECHNICALS_RANGES:
+            if refresh_timeframe == timeframe or gap + timedelta(days=WARMUP_DAYS) < timedelta(days=days):
+                return refresh_timeframe
+
+        return timeframe
+
+    @staticmethod
+    def merge_api_result(api_result: pd.DataFrame, recent: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """
+        Appends the rows of `recent` dated after the saved API result and drops the rows that fell out of `timeframe`.
+        Saved rows are kept as they are, the first rows of a short range are not warmed up.
+        """
+        merged = pd.concat([api_result, recent[recent.index > api_result.index.max()]]).sort_index()
+
+        start = pd.Timestamp.now(tz=merged.index.tz) - pd.DateOffset(years=int(timeframe[:-1]))
+
+        return merged[merged.index >= start]
+
+    def compute_local_technical(self, stock: str, indicator_name: str, timeframe: str) -> Union[None, pd.DataFrame]:
+        """
+        Computes a technical indicator from the stored daily bars instead of requesting it from IEX, None when there are
+        no bars for the stock.
+        """
+        start = pd.Timestamp.now().normalize() - pd.DateOffset(years=int(timeframe[:-1]))
+        bars = self.bar_store.read(stock, start - timedelta(days=WARMUP_DAYS))
+
+        if bars.empty:
+            return None
+
+        technical = compute_technical(bars, indicator_name)
+
+        return technical[technical.index >= start]
+
+    def get_feature_result(self, stock: str, data_type: str, indicator_name: str, timeframe: str) -> pd.DataFrame:
+        if data_type == self.client.IEX_DATA_TYPE_INDICATOR and indicator_name in TECHNICAL_FEATURES:
+            technical = self.compute_local_technical(stock, indicator_name, timeframe)
+
+            if technical is not None:
+                return technical
+
+        api_result_name = f"{stock}_{indicator_name}_{timeframe}"
+        if data_type == self.client.IEX_DATA_TYPE_ECONOMICS:
+            api_result_name = f"{indicator_name}_{timeframe}"
+
+        api_result = self.load_api_result(api_result_name)
+
+        if api_result is None:
+            print(f"creating new api result for {indicator_name} indicator...")
+
+            api_result = self.fetch_api_result(stock, data_type, indicator_name, timeframe)
+
+            self.save_api_result(api_result, api_result_name)
         else:
-            model = None
-        return model
+            entry = API_RESULTS.get_entry(api_result_name)
+
+            # results saved before the artifact store have no age, they are refreshed once
+            if entry is None or datetime.now() - datetime.fromisoformat(entry['created']) > API_RESULT_TTLS[data_type]:
+                last_date = api_result.index.max()
+                gap = pd.Timestamp.now(tz=last_date.tz) - last_date
+                refresh_timeframe = self.get_refresh_timeframe(data_type, gap, timeframe)
+
+                print(f"refreshing api result for {indicator_name} indicator ({refresh_timeframe})...")
+
+                recent = self.fetch_api_result(stock, data_type, indicator_name, refresh_timeframe)
+
+                if refresh_timeframe == timeframe:
+                    api_result = recent
+                else:
+                    api_result = self.merge_api_result(api_result, recent, timeframe)
+
+                self.save_api_result(api_result, api_result_name)
+
+        api_result.drop(
+            [
+                'symbol',
+                'label',
+                'subkey',
+                'updated',
+                'key',
+                'id',
+            ],
+            axis=1,
+            inplace=True,
+            errors='ignore'
+        )
+
+        return api_result
+
+    @staticmethod
+    def train_feature(
+            stock: Optional[str],
+            indicator_name: str,
+            data: pd.DataFrame,
+            is_stock_specific: bool,
+            timeframe: str,
+            periods: int,
+            with_aws: bool = False,
+            max_workers: Optional[int] = None
+    ) -> Union[None, pd.DataFrame]:
+        """
+        Trains the model of one feature series and predicts it `periods` ahead, runs in a worker process.
+        """
+        data_loader = ml.local.LocalDataLoader([], data=data)
+
+        if with_aws:
+            sagemaker = ml.aws.Sagemaker()
+            linear = ml.aws.LinearAwsLinearLearner(data=data_loader, aws_executor=sagemaker)
+
+            linear.train()
+
+            return None
+
+        local_trainer = ml.local.LocalLinearLearner(
+            data=data_loader,
+            stock=stock,
+            timeframe=timeframe,
+            model_name=indicator_name,
+            is_stock_specific=is_stock_specific
+        )
+
+        model = local_trainer.train(max_workers=max_workers)
+
+        model_name = f"{stock}_{indicator_name}_{timeframe}" if is_stock_specific else f"{indicator_name}_{timeframe}"
+        local_trainer.save_model(model, model_name)
+
+        return local_trainer.predict(periods=periods)
+
+    @staticmethod
+    def train_close(
+            stock: str,
+            api_result: pd.DataFrame,
+            feature_training_data: Dict[str, pd.DataFrame],
+            predictions: Dict[str, pd.DataFrame],
+            timeframe: str,
+            periods: int,
+            dask_cluster_address: Optional[str] = None,
+            max_workers: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Trains the `close` model of a stock with the feature series as regressors and predicts it `periods` ahead.
+        """
+        final_prediction_data = pd.DataFrame(
+            {
+                "ds": api_result.index,
+                "y": api_result['close']
+            }
+        )
+
+        final_prediction_data['ds'] = pd.to_datetime(final_prediction_data['ds'])
+        final_prediction_data.reset_index(level=0, drop=True, inplace=True)
+
+        data_loader = ml.local.LocalDataLoader([], data=final_prediction_data)
+        local_trainer = ml.local.LocalLinearLearner(
+            data=data_loader,
+            stock=stock,
+            timeframe=timeframe,
+            model_name='close'
+        )
+
+        # the trainer reshapes the feature frames in place and they are shared between the stocks of a batch
+        model = local_trainer.train(
+            dask_cluster_address=dask_cluster_address,
+            extra_features={name: frame.copy() for name, frame in feature_training_data.items()},
+            max_workers=max_workers
+        )
+
+        local_trainer.save_model(model, f"{stock}_close_{timeframe}")
+
+        return local_trainer.predict(
+            periods=periods,
+            extra_features={name: frame.copy() for name, frame in predictions.items()}
+        )
+
+    @staticmethod
+    def run_training_tasks(
+            function: Callable,
+            tasks: Dict[str, tuple],
+            dask_cluster_address: Optional[str] = None,
+            **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Runs independent training tasks concurrently, on local processes or on the Dask cluster, and reports how long
+        each one took.
+
+        Arguments:
+            function: The task, called with each task's arguments, `kwargs` and `max_workers` for its tuner
+            tasks: The arguments of each task, by task label
+            dask_cluster_address: Dispatch the tasks to this Dask scheduler instead of local processes
+        """
+        if len(tasks) == 0:
+            return {}
+
+        cpu_count = os.cpu_count() or 1
+        task_workers = min(len(tasks), cpu_count)
+
+        # tasks tuned at the same time share the cores, a cluster worker tunes in its own process
+        tuner_workers = 1 if dask_cluster_address else max(1, cpu_count // task_workers)
+
+        results = {}
+        timings = {}
+
+        start = time.perf_counter()
+        executor, close = get_executor(task_workers, dask_cluster_address)
+        try:
+            futures = {
+                label: executor.submit(timed, function, *arguments, max_workers=tuner_workers, **kwargs)
+                for label, arguments in tasks.items()
+            }
 
-    def optimize_machine_learning_params(self) -> None:
-        # optuna
-        pass
+            for label, future in futures.items():
+                results[label], timings[label] = future.result()
+
+                print(f"trained {label} model in {timings[label]:.1f}s")
+        finally:
+            close()
+
+        print(
+            f"trained {len(timings)} models in {time.perf_counter() - start:.1f}s "
+            f"({sum(timings.values()):.1f}s of training)"
+        )
+
+        return results
+
+    def get_feature_tasks(
+            self,
+            stock: Optional[str],
+            data_type: str,
+            timeframe: str,
+            periods: int
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame], Dict[str, tuple], Union[None, pd.DataFrame]]:
+        """
+        Loads the feature series of one data type. Returns their training data, the predictions already saved, the
+        `train_feature` arguments of the features that still need a model (with their prediction save name) and the
+        last API result loaded.
+        """
+        feature_training_data = {}
+        predictions = {}
+        feature_tasks = {}
+        api_result = None
+        for indicator_name in self.client.IEX_TRAINABLE_DATA_POINTS[data_type]:
+            is_stock_specific_param = True
+            prediction_save_name = f"prediction_{stock}_{indicator_name}_{periods}"
+
+            if data_type == self.client.IEX_DATA_TYPE_ECONOMICS:
+                prediction_save_name = f"prediction_{indicator_name}_{periods}"
+                is_stock_specific_param = False
+
+            api_result = self.get_feature_result(stock, data_type, indicator_name, timeframe)
+
+            if indicator_name in self.client.SPECIAL_INDICATORS:
+                indicator_name = self.client.SPECIAL_INDICATORS[indicator_name]
+
+            indicator_data = api_result.iloc[:, api_result.columns.get_loc(indicator_name):]
+
+            if True in indicator_data.isnull().all().values or indicator_data[indicator_name].sum() == 0:
+                continue
+
+            feature_training_data[indicator_name] = indicator_data
+
+            prediction_result = self.load_prediction_result(prediction_save_name)
+
+            if prediction_result is None:
+                data = api_result.copy()
+                data.replace([np.inf, -np.inf, np.nan], 0, inplace=True)
+                data.reset_index(level=0, inplace=True)
+                data.rename(columns={"date": "ds", indicator_name: "y"}, inplace=True)
+
+                feature_tasks[indicator_name] = (
+                    prediction_save_name,
+                    (stock, indicator_name, data, is_stock_specific_param, timeframe, periods)
+                )
+
+                continue
+
+            predictions[indicator_name] = prediction_result
+
+        return feature_training_data, predictions, feature_tasks, api_result
+
+    def train_features(
+            self,
+            feature_tasks: Dict[str, tuple],
+            with_aws: bool = False,
+            dask_cluster_address: Optional[str] = None
+    ) -> Dict[str, Union[None, pd.DataFrame]]:
+        """
+        Trains the feature models concurrently and saves their predictions.
+        """
+        predictions = self.run_training_tasks(
+            self.train_feature,
+            {label: arguments for label, (_, arguments) in feature_tasks.items()},
+            dask_cluster_address,
+            with_aws=with_aws
+        )
+
+        for label, prediction_result in predictions.items():
+            if prediction_result is not None:
+                self.save_prediction_result(prediction_result, feature_tasks[label][0])
+
+        return predictions
+
+    def run_batch_trainer(
+            self,
+            stocks: List[str],
+            training_algorithm: str,
+            with_aws: bool = False,
+            dask_cluster_address: str = None,
+            timeframe: str = '5y',
+            periods: int = 60
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Trains the `close` models of several stocks. The economic series are the same for every stock so their models
+        are trained once, the stock indicator models and then the `close` models of every stock are trained
+        concurrently. Returns the `close` predictions, which are also saved.
+
+        Arguments:
+            stocks: The tickers to train
+            training_algorithm: The training algorithm
+            with_aws: Train the feature models on SageMaker
+            dask_cluster_address: Train on this Dask cluster instead of local processes
+            timeframe: How much history to train on
+            periods: Days to predict
+        """
+        shared_training_data, shared_predictions, shared_tasks, _ = self.get_feature_tasks(
+            None,
+            self.client.IEX_DATA_TYPE_ECONOMICS,
+            timeframe,
+            periods
+        )
+        shared_predictions.update(self.train_features(shared_tasks, with_aws, dask_cluster_address))
+
+        stock_features = {}
+        feature_tasks = {}
+        for stock in stocks:
+            training_data, predictions, tasks, api_result = self.get_feature_tasks(
+                stock,
+                self.client.IEX_DATA_TYPE_INDICATOR,
+                timeframe,
+                periods
+            )
+
+            if api_result is None:
+                print(f"API result missing for {stock}")
+
+                continue
+
+            stock_features[stock] = (
+                api_result,
+                {**shared_training_data, **training_data},
+                {**shared_predictions, **predictions}
+            )
+
+            for indicator_name, task in tasks.items():
+                feature_tasks[f"{stock} {indicator_name}"] = task
+
+        for label, prediction_result in self.train_features(feature_tasks, with_aws, dask_cluster_address).items():
+            stock, indicator_name = label.split(' ', 1)
+            stock_features[stock][2][indicator_name] = prediction_result
+
+        close_predictions = self.run_training_tasks(
+            self.train_close,
+            {
+                f"{stock} close": (stock, api_result, training_data, predictions, timeframe, periods)
+                for stock, (api_result, training_data, predictions) in stock_features.items()
+            },
+            dask_cluster_address
+        )
+
+        results = {}
+        for label, prediction in close_predictions.items():
+            stock = label.split(' ', 1)[0]
+
+            self.save_prediction_result(prediction, f"prediction_{stock}_close_{periods}")
+            results[stock] = prediction
+
+        return results
 
     def run_trainer(
             self,
@@ -105,140 +538,28 @@ class ML:
             dask_cluster_address: str = None,
             timeframe: str = '5y'
     ):
-        periods = 60
-
         if with_numerai:
             raise NotImplementedError()
-        else:
-            predictions = {}
-            feature_training_data = {}
-            api_result = None
-            for data_type in self.client.IEX_TRAINABLE_DATA_POINTS.keys():
-                for indicator_name in self.client.IEX_TRAINABLE_DATA_POINTS[data_type]:
-                    is_stock_specific_param = True
-                    api_result_name = f"{stock}_{indicator_name}_{timeframe}"
-                    prediction_save_name = f"prediction_{stock}_{indicator_name}_{periods}"
-
-                    if data_type == self.client.IEX_DATA_TYPE_ECONOMICS:
-                        api_result_name = f"{indicator_name}_{timeframe}"
-                        prediction_save_name = f"prediction_{indicator_name}_{periods}"
-                        is_stock_specific_param = False
-
-                    api_result = self.load_api_result(api_result_name)
-
-                    if api_result is None:
-                        print(f"creating new api result for {indicator_name} indicator...")
-
-                        if data_type == self.client.IEX_DATA_TYPE_INDICATOR:
-                            api_result = self.client.technicals(
-                                stock,
-                                indicator_name,
-                                timeframe,
-                                True
-                            ).sort_values(by='date', ascending=True)
-                        elif data_type == self.client.IEX_DATA_TYPE_ECONOMICS:
-                            api_result = self.client.economic(
-                                indicator_name,
-                                timeframe,
-                                True
-                            ).sort_values(by='date', ascending=True)
-                        else:
-                            raise RuntimeError
-
-                        self.save_api_result(api_result, api_result_name)
-
-                    api_result.drop(
-                        [
-                            'symbol',
-                            'label',
-                            'subkey',
-                            'updated',
-                            'key',
-                            'id',
-                        ],
-                        axis=1,
-                        inplace=True,
-                        errors='ignore'
-                    )
-
-                    if indicator_name in self.client.SPECIAL_INDICATORS:
-                        indicator_name = self.client.SPECIAL_INDICATORS[indicator_name]
-
-                    indicator_data = api_result.iloc[:, api_result.columns.get_loc(indicator_name):]
-
-                    if True in indicator_data.isnull().all().values or indicator_data[indicator_name].sum() == 0:
-                        continue
-
-                    feature_training_data[indicator_name] = indicator_data
-
-                    prediction_result = self.load_prediction_result(prediction_save_name)
-
-                    if prediction_result is None:
-                        data = api_result.copy()
-                        data.replace([np.inf, -np.inf, np.nan], 0, inplace=True)
-                        data.reset_index(level=0, inplace=True)
-                        data.rename(columns={"date": "ds", indicator_name: "y"}, inplace=True)
-
-                        data_loader = ml.local.LocalDataLoader([], data=data)
-
-                        if with_aws:
-                            sagemaker = ml.aws.Sagemaker()
-                            linear = ml.aws.LinearAwsLinearLearner(data=data_loader, aws_executor=sagemaker)
-
-                            linear.train()
-                        else:
-                            local_trainer = ml.local.LocalLinearLearner(
-                                data=data_loader,
-                                stock=stock,
-                                timeframe=timeframe,
-                                model_name=indicator_name,
-                                is_stock_specific=is_stock_specific_param
-                            )
-
-                            local_trainer.train(dask_cluster_address=dask_cluster_address)
-
-                            prediction_result = local_trainer.predict(periods=periods)
-
-                            self.save_prediction_result(prediction_result, prediction_save_name)
-
-                    predictions[indicator_name] = prediction_result
-
-            if api_result is None:
-                print('API result missing')
-
-                return
-
-            final_prediction_data = pd.DataFrame(
-                {
-                    "ds": api_result.index,
-                    "y": api_result['close']
-                }
-            )
-
-            final_prediction_data['ds'] = pd.to_datetime(final_prediction_data['ds'])
-            final_prediction_data.reset_index(level=0, drop=True, inplace=True)
 
-            data_loader = ml.local.LocalDataLoader([], data=final_prediction_data)
-            local_trainer = ml.local.LocalLinearLearner(
-                data=data_loader,
-                stock=stock,
-                timeframe=timeframe,
-                model_name='close'
-            )
+        prediction = self.run_batch_trainer(
+            [stock],
+            training_algorithm,
+            with_aws,
+            dask_cluster_address,
+            timeframe
+        ).get(stock)
 
-            local_trainer.train(
-                dask_cluster_address=dask_cluster_address,
-                extra_features=feature_training_data
-            )
+        if prediction is None:
+            print('API result missing')
 
-            prediction = local_trainer.predict(periods=periods, extra_features=predictions)
+            return
 
-            prediction.to_csv(
-                'pred.csv',
-                columns=['ds', 'trend', 'additive_terms', 'multiplicative_terms', 'yhat'],
-                header=['date', 'trend', 'additive_terms', 'multiplicative_terms', 'prediction'],
-                index=False
-            )
+        prediction.to_csv(
+            'pred.csv',
+            columns=['ds', 'trend', 'additive_terms', 'multiplicative_terms', 'yhat'],
+            header=['date', 'trend', 'additive_terms', 'multiplicative_terms', 'prediction'],
+            index=False
+        )
 
     def run_predictor(self, model_name: str, prediction: list) -> None:
         model = self.load_model(model_name)
@@ -1,14 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from typing import Dict, Iterator, List, Optional
 
 import boto3
 from boto3.dynamodb.conditions import Key
 
 
 class ODM:
-    def __init__(self):
+    # projection of the bar reads, the rest of a `stocks` item is adjusted prices and provider metadata
+    BAR_ATTRIBUTES = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, max_workers: int = 16):
         self.stock_table = boto3.resource('dynamodb').Table('stocks')
         self.prophet_params_table = boto3.resource('dynamodb').Table('prophet_params')
+        # low level clients are thread safe, resources are not; bulk reads share this one. It carries the resource's
+        # (de)serialization hooks, so values go in and come out as plain python types
+        self.client = self.stock_table.meta.client
+        self.max_workers = max_workers
 
     def get_symbols(self):
         today = date.today()
@@ -16,14 +25,61 @@ class ODM:
         return self.stock_table.query(KeyConditionExpression=Key('date').eq(today.isoformat()), ScanIndexForward=False)
 
     def get_last_stock_day(self, ticker) -> datetime:
-        response = self.stock_table.query(
-            KeyConditionExpression=Key('ticker').eq(ticker)
+        items = next(
+            self.query_pages(
+                ticker,
+                projection=['date'],
+                ScanIndexForward=False,
+                Limit=1,
+                PaginationConfig={'MaxItems': 1}
+            ),
+            []
         )
 
-        if 'Items' not in response or len(response['Items']) == 0:
+        if len(items) == 0:
             return datetime.now() - timedelta(days=2 * 365)
 
-        return datetime.strptime(response['Items'][-1]['date'], '%Y-%m-%d')
+        return datetime.strptime(items[0]['date'], '%Y-%m-%d')
+
+    def query_pages(
+            self,
+            ticker: str,
+            start: Optional[date] = None,
+            projection: Optional[List[str]] = None,
+            **kwargs
+    ) -> Iterator[List[dict]]:
+        """
+        Yields every page of a `stocks` query for the ticker, following LastEvaluatedKey past the 1 MB page limit.
+
+        Arguments:
+            ticker: The partition to query
+            start: Only return days on or after this date (optional)
+            projection: Attributes to return instead of the whole item (optional)
+            kwargs: Extra arguments handed to the query paginator
+        """
+        names = {'#ticker': 'ticker'}
+        values = {':ticker': ticker}
+        key_condition = '#ticker = :ticker'
+
+        if start is not None:
+            names['#date'] = 'date'
+            values[':start'] = start.isoformat()
+            key_condition += ' AND #date >= :start'
+
+        if projection is not None:
+            names.update({f"#{attribute}": attribute for attribute in projection})
+            kwargs['ProjectionExpression'] = ', '.join(f"#{attribute}" for attribute in projection)
+
+        paginator = self.client.get_paginator('query')
+
+        for page in paginator.paginate(
+                TableName=self.stock_table.name,
+                KeyConditionExpression=key_condition,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                **kwargs
+        ):
+            yield page.get('Items', [])
 
     def get_historical_stock_day(self, ticker: str, day: str):
         response = self.stock_table.get_item(
@@ -35,12 +91,26 @@ class ODM:
 
         return response['Item'] if 'Item' in response else None
 
-    def get_historical_stock_range(self, ticker: str, start: date):
-        response = self.stock_table.query(
-            KeyConditionExpression=Key('ticker').eq(ticker) & Key('date').gte(start.isoformat())
-        )
-
-        return response['Items'] if 'Items' in response else []
+    def get_historical_stock_range(self, ticker: str, start: date, projection: Optional[List[str]] = None):
+        items = []
+        for page in self.query_pages(ticker, start, projection):
+            items.extend(page)
+
+        return items
+
+    def get_historical_stock_ranges(
+            self,
+            tickers: List[str],
+            start: date,
+            projection: Optional[List[str]] = None
+    ) -> Dict[str, List[dict]]:
+        """
+        Reads the range for many tickers at once on a thread pool sharing this ODM's client.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            ranges = executor.map(lambda ticker: self.get_historical_stock_range(ticker, start, projection), tickers)
+
+            return dict(zip(tickers, ranges))
 
     def get_prophet_params(self, ticker: str, feature: str, with_prefix: bool = True):
         prefix = ''
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from logging import getLogger
+from typing import Any, Callable, Iterable, List, Optional
+
+
+class TokenBucket:
+    """
+    Async token bucket: allows bursts of up to `capacity` calls and refills at `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated_at = None
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+
+            while True:
+                now = loop.time()
+                if self.updated_at is not None:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+
+                    return
+
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class Orchestrator:
+    """
+    Runs a fetch step for many items with bounded concurrency, optionally rate limited, and hands each result to an
+    evaluate step.
+
+    Fetching is blocking I/O (provider HTTP calls, DynamoDB, local disk) and runs on a thread pool sized to the
+    concurrency level. Evaluation is CPU bound (indicator math) and runs on a process pool, so it never competes with
+    the fetchers for the GIL.
+    """
+
+    def __init__(
+            self,
+            concurrency: int = 8,
+            rate_limit: Optional[float] = None,
+            process_workers: Optional[int] = None
+    ):
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.process_workers = process_workers or os.cpu_count()
+        self.logger = getLogger()
+
+        self.thread_pool = ThreadPoolExecutor(max_workers=concurrency)
+        self.process_pool_prop = None
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self.process_pool_prop is None:
+            self.process_pool_prop = ProcessPoolExecutor(max_workers=self.process_workers)
+
+        return self.process_pool_prop
+
+    def run(
+            self,
+            items: Iterable,
+            fetch: Callable[[Any], Any],
+            evaluate: Optional[Callable[[Any, Any], Any]] = None,
+            rate_limited: bool = True
+    ) -> List:
+        """
+        Arguments:
+            items: The work items (tickers, symbol batches...)
+            fetch: Blocking call made once per item on the thread pool
+            evaluate: Picklable call made with (item, fetched data) on the process pool (optional)
+            rate_limited: Whether fetches are throttled by the rate limit
+
+        Returns:
+            The result of each item, in item order. Failed items are logged and yield None
+        """
+        return asyncio.run(self.run_async(list(items), fetch, evaluate, rate_limited))
+
+    async def run_async(
+            self,
+            items: List,
+            fetch: Callable[[Any], Any],
+            evaluate: Optional[Callable[[Any, Any], Any]] = None,
+            rate_limited: bool = True
+    ) -> List:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(self.rate_limit) if rate_limited and self.rate_limit else None
+
+        return await asyncio.gather(*[self.run_item(item, fetch, evaluate, semaphore, bucket) for item in items])
+
+    async def run_item(
+            self,
+            item,
+            fetch: Callable[[Any], Any],
+            evaluate: Optional[Callable[[Any, Any], Any]],
+            semaphore: asyncio.Semaphore,
+            bucket: Optional[TokenBucket]
+    ):
+        loop = asyncio.get_running_loop()
+
+        try:
+            async with semaphore:
+                if bucket is not None:
+                    await bucket.acquire()
+
+                data = await loop.run_in_executor(self.thread_pool, fetch, item)
+
+            if evaluate is None:
+                return data
+
+            return await loop.run_in_executor(self.process_pool, evaluate, item, data)
+        except Exception as e:
+            self.logger.error(f"{item}: {e}")
+
+            return None
+
+    def close(self) -> None:
+        self.thread_pool.shutdown()
+
+        if self.process_pool_prop is not None:
+            self.process_pool_prop.shutdown()
+            self.process_pool_prop = None
+
+    def __enter__(self) -> Orchestrator:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,3 @@
+from .index import PairsIndex
+from .monitor import SpreadMonitor
+from .screener import PairsScreener
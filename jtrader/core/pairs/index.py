@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from logging import getLogger
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from jtrader.core.artifact_store import ArtifactStore
+from jtrader.core.bar_store import BarStore
+from .screener import align_closes
+
+PAIRS_FOLDER = 'data/pairs'
+
+# Engle-Granger 5% critical value for two series with a constant (MacKinnon)
+COINTEGRATION_CRITICAL_VALUE = -3.34
+
+# log prices and their standardized copy, set once per pool worker instead of being pickled with every block
+LOG_PRICES = None
+STANDARDIZED = None
+
+INDEX_COLUMNS = ['ticker', 'pair', 'correlation', 'beta', 'alpha', 'spread_std', 'adf_stat', 'half_life']
+
+
+def set_prices(log_prices: np.ndarray) -> None:
+    global LOG_PRICES, STANDARDIZED
+
+    LOG_PRICES = log_prices
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        STANDARDIZED = (log_prices - log_prices.mean(axis=0)) / log_prices.std(axis=0, ddof=1)
+
+
+def engle_granger(x: np.ndarray, y: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Engle-Granger test of every column pair of `x` and `y` (shape `(n, pairs)`): `y` is regressed on `x`, then the
+    change of the residual spread is regressed on its previous value.
+
+    Returns:
+        Per pair the hedge ratio `beta`, `alpha`, the `spread_std`, the Dickey-Fuller statistic `adf_stat` of the
+        spread and its mean reversion `half_life` in bars (inf when the spread does not revert)
+    """
+    n = len(x)
+
+    x_mean = x.mean(axis=0)
+    y_mean = y.mean(axis=0)
+    x_centered = x - x_mean
+
+    beta = np.einsum('ij,ij->j', x_centered, y - y_mean) / np.einsum('ij,ij->j', x_centered, x_centered)
+    spread = y - y_mean - x_centered * beta
+
+    lagged = spread[:-1] - spread[:-1].mean(axis=0)
+    change = np.diff(spread, axis=0)
+    change -= change.mean(axis=0)
+
+    lagged_variance = np.einsum('ij,ij->j', lagged, lagged)
+    reversion = np.einsum('ij,ij->j', lagged, change) / lagged_variance
+
+    errors = change - lagged * reversion
+    standard_error = np.sqrt(np.einsum('ij,ij->j', errors, errors) / (n - 3) / lagged_variance)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        half_life = np.where(
+            (reversion < 0) & (reversion > -1),
+            -math.log(2) / np.log1p(reversion),
+            np.inf
+        )
+
+    return {
+        'beta': beta,
+        'alpha': y_mean - beta * x_mean,
+        'spread_std': spread.std(axis=0, ddof=2),
+        'adf_stat': reversion / standard_error,
+        'half_life': half_life,
+    }
+
+
+def screen_block(
+        start: int,
+        stop: int,
+        groups: Optional[np.ndarray],
+        min_correlation: float,
+        max_adf_stat: float,
+        top: int,
+        chunk_size: int = 50000
+) -> pd.DataFrame:
+    """
+    Tests tickers `start` to `stop` of the shared price matrix against every other ticker (of the same group when
+    `groups` is given), keeping the `top` cointegrated pairs of each one.
+    """
+    n = len(STANDARDIZED)
+
+    correlations = STANDARDIZED[:, start:stop].T @ STANDARDIZED / (n - 1)
+
+    candidates = correlations >= min_correlation
+    candidates[np.arange(stop - start), np.arange(start, stop)] = False
+
+    if groups is not None:
+        candidates &= groups[start:stop, None] == groups[None, :]
+
+    rows, columns = np.nonzero(candidates)
+
+    results = []
+    for offset in range(0, len(rows), chunk_size):
+        chunk_rows = rows[offset:offset + chunk_size]
+        chunk_columns = columns[offset:offset + chunk_size]
+
+        statistics = engle_granger(LOG_PRICES[:, start + chunk_rows], LOG_PRICES[:, chunk_columns])
+
+        result = pd.DataFrame({
+            'ticker': start + chunk_rows,
+            'pair': chunk_columns,
+            'correlation': correlations[chunk_rows, chunk_columns],
+            **statistics,
+        })
+
+        results.append(result[(result['adf_stat'] <= max_adf_stat) & np.isfinite(result['half_life'])])
+
+    if len(results) == 0:
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+
+    return pd.concat(results).sort_values(by='adf_stat').groupby('ticker').head(top)
+
+
+class PairsIndex:
+    """
+    Precomputed index of the cointegrated pairs of the whole universe, or of each sector.
+
+    The universe's log closes over the last `window` trading days are laid out as one matrix and split into blocks of
+    tickers. A process pool correlates each block with every ticker in one matrix product, then runs an Engle-Granger
+    test on the correlated pairs. The `top` pairs of each ticker are saved to the artifact store with their hedge ratio
+    and half-life. Pairs are kept in both orientations, `pair` regressed on `ticker`.
+    """
+
+    INDEX_NAME = 'pairs_index'
+
+    def __init__(
+            self,
+            bar_store: Optional[BarStore] = None,
+            folder: str = PAIRS_FOLDER,
+            window: int = 252,
+            min_correlation: float = .9,
+            max_adf_stat: float = COINTEGRATION_CRITICAL_VALUE,
+            top: int = 10,
+            block_size: int = 256,
+            max_workers: Optional[int] = None
+    ):
+        self.bar_store = bar_store or BarStore()
+        self.store = ArtifactStore(folder)
+        self.window = window
+        self.min_correlation = min_correlation
+        self.max_adf_stat = max_adf_stat
+        self.top = top
+        self.block_size = block_size
+        self.max_workers = max_workers or os.cpu_count()
+        self.logger = getLogger()
+        self.index = None
+
+    def load_log_prices(self, tickers: List[str], start: Union[date, datetime]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The tickers with a close on each of the last `window` trading days of the universe, and their log closes.
+        """
+        frames = self.bar_store.read_many(tickers, start, columns=['date', 'close'])
+        frames = [frames[ticker] for ticker in tickers]
+
+        dates = [frame['date'].to_numpy(dtype='datetime64[ns]') for frame in frames if not frame.empty]
+        calendar = np.unique(np.concatenate(dates or [np.array([], dtype='datetime64[ns]')]))[-self.window:]
+
+        closes = align_closes(calendar, frames)
+        complete = (closes > 0).all(axis=0) & (len(calendar) == self.window)
+
+        return np.asarray(tickers)[complete], np.log(closes[:, complete])
+
+    def build(
+            self,
+            tickers: List[str],
+            start: Union[date, datetime],
+            sectors: Optional[Dict[str, str]] = None
+    ) -> pd.DataFrame:
+        """
+        Builds and saves the index of `tickers` from their bars since `start`, within each sector when `sectors`
+        (ticker to sector) is given.
+        """
+        tickers, log_prices = self.load_log_prices(tickers, start)
+
+        groups = None
+        if sectors is not None:
+            # tickers without a sector are paired with each other only
+            groups = pd.factorize(pd.Series([sectors.get(ticker) for ticker in tickers], dtype=object))[0]
+
+        self.logger.info(f"Indexing pairs of {len(tickers)} tickers over {self.window} days...")
+
+        blocks = [
+            (block, min(block + self.block_size, len(tickers))) for block in range(0, len(tickers), self.block_size)
+        ]
+        args = (groups, self.min_correlation, self.max_adf_stat, self.top)
+
+        if self.max_workers == 1:
+            set_prices(log_prices)
+            results = [screen_block(*block, *args) for block in blocks]
+        else:
+            with ProcessPoolExecutor(self.max_workers, initializer=set_prices, initargs=(log_prices,)) as executor:
+                futures = [executor.submit(screen_block, *block, *args) for block in blocks]
+                results = [future.result() for future in futures]
+
+        results = [result for result in results if not result.empty]
+        index = pd.concat(results) if len(results) > 0 else pd.DataFrame(columns=INDEX_COLUMNS)
+        index['ticker'] = tickers[index['ticker'].to_numpy(dtype=int)]
+        index['pair'] = tickers[index['pair'].to_numpy(dtype=int)]
+
+        if sectors is not None:
+            index['sector'] = index['ticker'].map(sectors)
+
+        self.index = index.sort_values(by=['ticker', 'adf_stat']).reset_index(drop=True)
+        self.store.save_frame(self.INDEX_NAME, self.index)
+
+        self.logger.info(f"Indexed {len(self.index)} pairs")
+
+        return self.index
+
+    def load(self) -> Optional[pd.DataFrame]:
+        if self.index is None:
+            self.index = self.store.load(self.INDEX_NAME)
+
+        return self.index
+
+    def get_candidates(self, ticker: str) -> pd.DataFrame:
+        """
+        The indexed pairs of `ticker`, most cointegrated first, indexed by the paired ticker.
+        """
+        index = self.load()
+
+        if index is None:
+            return pd.DataFrame()
+
+        return index[index['ticker'] == ticker].set_index('pair')
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class SpreadMonitor:
+    """
+    Live spreads of many pairs, each advanced in constant time when a new bar arrives.
+
+    Every pair keeps exponentially weighted means, variances and covariance of its two log prices, updated with
+    Welford's recurrence over `period` bars. Those give the hedge ratio `beta = cov / var(ticker)` and the spread of
+    `pair` on `ticker` at each bar. A new bar is priced against the state before it, then folded in. Pair state is kept
+    in arrays, so a bar updates every pair of the tickers it touches in a few vectorized operations.
+
+    The spread is measured in standard deviations of the regression residual. A crossing is emitted when it moves above
+    `upper_threshold` (BEARISH for the pair, which is expensive against the ticker), below `lower_threshold` (BULLISH)
+    or back in between (the spread has reverted).
+    """
+
+    CROSSING_COLUMNS = ['ticker', 'pair', 'signal', 'zscore', 'spread', 'beta']
+
+    # the values of Indicator.SIGNAL_BULLISH / SIGNAL_BEARISH, without importing the talib indicators
+    SIGNAL_BULLISH = 1
+    SIGNAL_BEARISH = -1
+    SIGNAL_REVERTED = 0
+
+    def __init__(self, period: int = 60, lower_threshold: float = -2., upper_threshold: float = 3.):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.lower_threshold = lower_threshold
+        self.upper_threshold = upper_threshold
+
+        self.tickers: Dict[str, int] = {}
+        self.names = np.array([], dtype=object)
+        self.log_prices = np.array([], dtype=float)
+        self.ticker_pairs: Dict[int, List[int]] = {}
+
+        self.legs = np.empty((0, 2), dtype=int)
+        self.count = np.array([], dtype=int)
+        self.zone = np.array([], dtype=np.int8)
+        self.mean_x = np.array([], dtype=float)
+        self.mean_y = np.array([], dtype=float)
+        self.var_x = np.array([], dtype=float)
+        self.var_y = np.array([], dtype=float)
+        self.cov = np.array([], dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.legs)
+
+    def get_ticker_id(self, ticker: str) -> int:
+        if ticker not in self.tickers:
+            self.tickers[ticker] = len(self.names)
+            self.names = np.append(self.names, ticker)
+            self.log_prices = np.append(self.log_prices, np.nan)
+
+        return self.tickers[ticker]
+
+    def add_pairs(self, pairs: List[Tuple[str, str]]) -> None:
+        """
+        Starts monitoring `pair` regressed on `ticker` for each `(ticker, pair)`.
+        """
+        start = len(self.legs)
+        legs = np.array(
+            [[self.get_ticker_id(ticker), self.get_ticker_id(pair)] for ticker, pair in pairs],
+            dtype=int
+        ).reshape(-1, 2)
+
+        for offset, (ticker_id, pair_id) in enumerate(legs):
+            self.ticker_pairs.setdefault(ticker_id, []).append(start + offset)
+            self.ticker_pairs.setdefault(pair_id, []).append(start + offset)
+
+        added = len(pairs)
+
+        self.legs = np.concatenate([self.legs, legs])
+        self.count = np.concatenate([self.count, np.zeros(added, dtype=int)])
+        self.zone = np.concatenate([self.zone, np.zeros(added, dtype=np.int8)])
+
+        for moment in ('mean_x', 'mean_y', 'var_x', 'var_y', 'cov'):
+            setattr(self, moment, np.concatenate([getattr(self, moment), np.zeros(added)]))
+
+    def update(self, closes: Dict[str, float]) -> pd.DataFrame:
+        """
+        Advances the pairs of every ticker in `closes` by one bar and returns the threshold crossings it caused.
+
+        Arguments:
+            closes: The close of each ticker with a new bar, pass every ticker of a bar period in one call so a pair
+                moves once per bar. The other leg of a pair is priced at its last close.
+        """
+        known = [ticker for ticker in closes if ticker in self.tickers]
+
+        if len(known) == 0:
+            return pd.DataFrame(columns=self.CROSSING_COLUMNS)
+
+        ids = [self.tickers[ticker] for ticker in known]
+        self.log_prices[ids] = np.log([closes[ticker] for ticker in known])
+
+        pairs = np.unique(np.concatenate([self.ticker_pairs.get(ticker_id, []) for ticker_id in ids])).astype(int)
+
+        x = self.log_prices[self.legs[pairs, 0]]
+        y = self.log_prices[self.legs[pairs, 1]]
+
+        priced = ~np.isnan(x) & ~np.isnan(y)
+        pairs, x, y = pairs[priced], x[priced], y[priced]
+
+        # the bar is priced against the fit before it
+        delta_x = x - self.mean_x[pairs]
+        delta_y = y - self.mean_y[pairs]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            beta = self.cov[pairs] / self.var_x[pairs]
+            spread = delta_y - beta * delta_x
+            zscore = spread / np.sqrt(self.var_y[pairs] - beta * self.cov[pairs])
+
+        first = self.count[pairs] == 0
+        alpha = np.where(first, 1., self.alpha)
+
+        self.mean_x[pairs] += alpha * delta_x
+        self.mean_y[pairs] += alpha * delta_y
+        self.var_x[pairs] = (1 - alpha) * (self.var_x[pairs] + alpha * delta_x ** 2)
+        self.var_y[pairs] = (1 - alpha) * (self.var_y[pairs] + alpha * delta_y ** 2)
+        self.cov[pairs] = (1 - alpha) * (self.cov[pairs] + alpha * delta_x * delta_y)
+
+        ready = (self.count[pairs] >= self.period) & np.isfinite(zscore)
+        self.count[pairs] += 1
+
+        zone = np.where(zscore > self.upper_threshold, 1, np.where(zscore < self.lower_threshold, -1, 0))
+        crossed = ready & (zone != self.zone[pairs])
+
+        pairs, zone = pairs[crossed], zone[crossed]
+        self.zone[pairs] = zone
+
+        return pd.DataFrame({
+            'ticker': self.names[self.legs[pairs, 0]],
+            'pair': self.names[self.legs[pairs, 1]],
+            'signal': np.select(
+                [zone == 1, zone == -1],
+                [self.SIGNAL_BEARISH, self.SIGNAL_BULLISH],
+                self.SIGNAL_REVERTED
+            ),
+            'zscore': zscore[crossed],
+            'spread': spread[crossed],
+            'beta': beta[crossed],
+        }, columns=self.CROSSING_COLUMNS)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from jtrader.core.bar_store import BarStore
+
+
+def align_closes(calendar: np.ndarray, frames: List[pd.DataFrame]) -> np.ndarray:
+    """
+    Lays the closes of each frame out as one column of a `(len(calendar), len(frames))` matrix on the `calendar` dates,
+    NaN where a ticker has no bar.
+    """
+    closes = np.full((len(calendar), len(frames)), np.nan)
+
+    if len(calendar) == 0:
+        return closes
+
+    for column, frame in enumerate(frames):
+        if frame.empty:
+            continue
+
+        dates = frame['date'].to_numpy(dtype='datetime64[ns]')
+        rows = np.searchsorted(calendar, dates).clip(max=len(calendar) - 1)
+        on_calendar = calendar[rows] == dates
+
+        closes[rows[on_calendar], column] = frame['close'].to_numpy(dtype=float)[on_calendar]
+
+    return closes
+
+
+def regress(x: np.ndarray, y: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Ordinary least squares of every column of `y` on `x` (`y = alpha + beta * x`) in a few matrix operations.
+
+    Arguments:
+        x: The comparison series, shape `(n,)`
+        y: The candidate series, shape `(n, candidates)`
+
+    Returns:
+        Per candidate `correlation`, `beta` (the hedge ratio), `alpha`, `r2`, the latest `spread` (the residual of the
+        last row) and its `zscore` against the residuals of the window
+    """
+    n = len(x)
+
+    x_mean = x.mean()
+    y_mean = y.mean(axis=0)
+    x_centered = x - x_mean
+    y_centered = y - y_mean
+
+    x_variance = x_centered @ x_centered / (n - 1)
+    y_variance = np.einsum('ij,ij->j', y_centered, y_centered) / (n - 1)
+    covariance = x_centered @ y_centered / (n - 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = covariance / x_variance
+        correlation = covariance / np.sqrt(x_variance * y_variance)
+
+        residuals = y_centered - np.outer(x_centered, beta)
+        residual_std = residuals.std(axis=0, ddof=2)
+
+        spread = residuals[-1]
+        zscore = spread / residual_std
+
+    return {
+        'correlation': correlation,
+        'beta': beta,
+        'alpha': y_mean - beta * x_mean,
+        'r2': correlation ** 2,
+        'spread': spread,
+        'zscore': zscore,
+    }
+
+
+class PairsScreener:
+    """
+    Screens a universe of tickers against one comparison ticker in a single pass.
+
+    The closes of the whole universe are read from the `BarStore` in parallel and aligned on the comparison ticker's
+    trading days into one log price matrix, then every candidate is regressed on the comparison ticker at once over the
+    last `window` days.
+    """
+
+    def __init__(self, bar_store: Optional[BarStore] = None, window: int = 60):
+        self.bar_store = bar_store or BarStore()
+        self.window = window
+
+    def load_log_prices(
+            self,
+            comparison_ticker: str,
+            tickers: List[str],
+            start: Union[date, datetime]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The comparison ticker's log closes over its last `window` days and the aligned `(window, len(tickers))` log
+        closes of the candidates.
+        """
+        frames = self.bar_store.read_many([comparison_ticker] + tickers, start, columns=['date', 'close'])
+
+        comparison = frames[comparison_ticker].tail(self.window)
+        calendar = comparison['date'].to_numpy(dtype='datetime64[ns]')
+        closes = align_closes(calendar, [frames[ticker] for ticker in tickers])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.log(comparison['close'].to_numpy(dtype=float)), np.log(np.where(closes > 0, closes, np.nan))
+
+    def run(self, comparison_ticker: str, tickers: List[str], start: Union[date, datetime]) -> pd.DataFrame:
+        """
+        Regression statistics of every candidate with a full window of bars, indexed by ticker and sorted by R².
+        """
+        tickers = [ticker for ticker in tickers if ticker != comparison_ticker]
+
+        x, y = self.load_log_prices(comparison_ticker, tickers, start)
+
+        complete = ~np.isnan(y).any(axis=0)
+
+        if len(x) < self.window or not complete.any():
+            return pd.DataFrame(columns=['correlation', 'beta', 'alpha', 'r2', 'spread', 'zscore'])
+
+        statistics = regress(x, y[:, complete])
+
+        screen = pd.DataFrame(statistics, index=pd.Index(np.asarray(tickers)[complete], name='ticker'))
+
+        return screen.sort_values(by='r2', ascending=False)
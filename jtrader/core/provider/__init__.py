@@ -1,4 +1,19 @@
+from importlib import import_module
+
 from jtrader.core.provider.provider import Provider
-from .iex import IEX
-from .kucoin import KuCoin
-from .loopring import LoopRing
+
+# each provider pulls in its exchange SDK, so it is only imported when first used (PEP 562)
+__PROVIDERS__ = {
+    'IEX': 'jtrader.core.provider.iex',
+    'KuCoin': 'jtrader.core.provider.kucoin',
+    'LoopRing': 'jtrader.core.provider.loopring',
+}
+
+__all__ = ['Provider', *__PROVIDERS__]
+
+
+def __getattr__(name: str):
+    if name not in __PROVIDERS__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module(__PROVIDERS__[name]), name)
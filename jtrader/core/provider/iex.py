@@ -2,17 +2,26 @@ from __future__ import annotations
 
 import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Iterator, List, Optional
 from typing import Union
 
+import numpy as np
 import pandas as pd
 import pyEX as IEXClient
 
 from jtrader.core.provider import Provider
+from jtrader.core.provider.refdata import SymbolCache
 
 
 class IEX(Provider):
+    BATCH_SIZE = 100
+    BATCH_WORKERS = 8
+    BATCH_RETRIES = 3
+    BATCH_BACKOFF = 1.0
+
     IEX_DATA_TYPE_ECONOMICS = 'economics'
     IEX_DATA_TYPE_INDICATOR = 'indicators'
 
@@ -72,6 +81,7 @@ class IEX(Provider):
             token = os.environ.get('IEX_CLOUD_SANDBOX_API_TOKEN')
 
         self.client_prop = IEXClient.Client(token, version)
+        self.symbol_cache = SymbolCache('iex_sandbox' if self.is_sandbox else 'iex', self.symbols)
         self.last_date = None
 
     async def register_websockets(
@@ -85,12 +95,85 @@ class IEX(Provider):
     def chart(self, stock: str, start: datetime | None, end: datetime | None, timeframe='1d') -> dict | list:
         return self.client.stocks.chart(stock, timeframe=timeframe)
 
+    def batch(self, stocks: List[str], fields: List[str], **kwargs) -> Dict[str, dict]:
+        """
+        One batch request, retried with exponential backoff when IEX errors out (throttling, 5xx...).
+        """
+        for attempt in range(self.BATCH_RETRIES + 1):
+            try:
+                return self.client.stocks.batch(stocks, fields, **kwargs)
+            except IEXClient.PyEXception as e:
+                if attempt == self.BATCH_RETRIES:
+                    raise
+
+                delay = self.BATCH_BACKOFF * 2 ** attempt
+                self.logger.warning(f"Batch request failed ({e}), retrying in {delay}s...")
+                time.sleep(delay)
+
+    def batch_iter(
+            self,
+            stocks: List[str],
+            fields: List[str],
+            max_workers: Optional[int] = None,
+            **kwargs
+    ) -> Iterator[Dict[str, dict]]:
+        """
+        Fetches `stocks` in batch sized requests, several at a time, and yields each batch's data as it arrives (not in
+        request order). A batch that still fails after its retries is logged and skipped.
+
+        Arguments:
+            stocks: The symbols to fetch
+            fields: The batch endpoints (quote, stats...)
+            max_workers: Requests in flight at once, BATCH_WORKERS by default
+        """
+        with ThreadPoolExecutor(max_workers=max_workers or self.BATCH_WORKERS) as executor:
+            futures = {
+                executor.submit(self.batch, chunk, fields, **kwargs): chunk
+                for chunk in self.chunks(stocks, self.BATCH_SIZE)
+            }
+
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except IEXClient.PyEXception as e:
+                    self.logger.error(f"Batch request for {','.join(futures[future])} failed: {e}")
+
+    def batch_chart(self, stocks: List[str], timeframe: str = '1m') -> Dict[str, list]:
+        charts = {}
+        for chunk in self.chunks(stocks, self.BATCH_SIZE):
+            data = self.batch(chunk, ['chart'], range_=timeframe)
+
+            for stock in chunk:
+                if stock not in data or data[stock].get('chart') is None:
+                    continue
+
+                charts[stock] = data[stock]['chart']
+
+        return charts
+
     def intraday(self, stock: str) -> dict:
         return self.client.stocks.intraday(stock)
 
     def symbols(self) -> dict:
         return self.client.refdata.iexSymbols()
 
+    def enabled_symbols(self) -> np.ndarray:
+        return self.symbol_cache.enabled_symbols()
+
+    def sectors(self, stocks: List[str]) -> Dict[str, str]:
+        """
+        The sector of each stock, from the company batch endpoint. Stocks IEX has no sector for are left out.
+        """
+        sectors = {}
+        for data in self.batch_iter(stocks, ['company']):
+            for stock, fields in data.items():
+                sector = (fields.get('company') or {}).get('sector')
+
+                if sector:
+                    sectors[stock] = sector
+
+        return sectors
+
     def technicals(
             self,
             stock: str,
@@ -106,6 +189,9 @@ class IEX(Provider):
     def economic(self, economic_type: str, timeframe: str, as_dataframe: bool = False):
         assert economic_type in self.SPECIAL_INDICATORS
 
+        # the series dates are counted back from its latest entry, every request starts over
+        self.last_date = None
+
         now = datetime.now()
         args = {
             "id": 'ECONOMIC',
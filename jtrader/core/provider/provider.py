@@ -5,13 +5,16 @@ import os
 from abc import ABC, abstractmethod
 from datetime import datetime
 from logging import getLogger
-from typing import Optional
+from typing import Dict, List, Optional
 
+import numpy as np
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
 
 class Provider(ABC):
+    BATCH_SIZE = 1
+
     def __init__(self, is_sandbox: bool, no_notifications: Optional[bool] = False):
         self.is_sandbox = is_sandbox
         self.logger = getLogger()
@@ -31,6 +34,12 @@ class Provider(ABC):
     def chart(self, stock: str, start: datetime | None, end: datetime | None, timeframe: str) -> dict | list:
         raise NotImplemented
 
+    def batch_chart(self, stocks: List[str], timeframe: str) -> Dict[str, list]:
+        """
+        Charts for several stocks at once, keyed by stock. Providers without a batch endpoint chart one stock at a time.
+        """
+        return {stock: self.chart(stock, None, None, timeframe) for stock in stocks}
+
     @abstractmethod
     def economic(self, economic_type: str, timeframe: str, as_dataframe: bool = False):
         raise NotImplemented
@@ -43,6 +52,14 @@ class Provider(ABC):
     def symbols(self) -> dict:
         raise NotImplemented
 
+    def enabled_symbols(self) -> np.ndarray:
+        """
+        Tickers currently enabled for trading. Providers without cached reference data filter `symbols` on every call.
+        """
+        symbols = [symbol['symbol'] for symbol in self.symbols() if symbol.get('isEnabled') is not False]
+
+        return np.array(symbols, dtype=str)
+
     @abstractmethod
     async def register_websockets(
             self,
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+
+REFDATA_FOLDER = 'data/refdata'
+
+
+class SymbolCache:
+    """
+    On-disk copy of a provider's symbol reference data, refreshed at most once per trading day.
+
+    Only the ticker and whether it is enabled are kept, as NumPy arrays in `{folder}/{name}.npz`, so commands read a
+    small local file at startup instead of downloading the full reference JSON every time.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], List[dict]], folder: str = REFDATA_FOLDER):
+        self.name = name
+        self.fetch = fetch
+        self.folder = Path(folder)
+        self.logger = getLogger()
+        self.trading_day = None
+        self.symbols = None
+        self.enabled = None
+
+    @property
+    def path(self) -> Path:
+        return self.folder / f"{self.name}.npz"
+
+    @staticmethod
+    def get_trading_day(now: Optional[datetime] = None) -> str:
+        """
+        The trading day `now` falls in, weekends roll back to the Friday before.
+        """
+        today = np.datetime64((now or datetime.now()).date(), 'D')
+
+        return str(np.busday_offset(today, 0, roll='backward'))
+
+    def load(self, refresh: bool = False) -> None:
+        trading_day = self.get_trading_day()
+
+        if not refresh and self.trading_day == trading_day:
+            return
+
+        if not refresh and self.path.is_file():
+            with np.load(self.path, allow_pickle=False) as cached:
+                if str(cached['trading_day']) == trading_day:
+                    self.trading_day = trading_day
+                    self.symbols = cached['symbols']
+                    self.enabled = cached['enabled']
+
+                    return
+
+        self.refresh(trading_day)
+
+    def refresh(self, trading_day: str) -> None:
+        self.logger.info(f"Refreshing {self.name} reference data...")
+
+        symbols = self.fetch()
+
+        self.trading_day = trading_day
+        self.symbols = np.array([symbol['symbol'] for symbol in symbols], dtype=str)
+        self.enabled = np.array([symbol.get('isEnabled') is not False for symbol in symbols], dtype=bool)
+
+        self.folder.mkdir(exist_ok=True, parents=True)
+
+        # write next to the cache and swap it in, so a concurrent command never reads a partial file
+        temp_path = self.folder / f"{self.name}.{os.getpid()}.tmp.npz"
+        np.savez(temp_path, symbols=self.symbols, enabled=self.enabled, trading_day=np.array(trading_day))
+        os.replace(temp_path, self.path)
+
+    def enabled_symbols(self) -> np.ndarray:
+        """
+        Tickers currently enabled for trading, reloaded when the trading day rolls over.
+        """
+        self.load()
+
+        return self.symbols[self.enabled]
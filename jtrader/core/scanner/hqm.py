@@ -2,13 +2,13 @@
 # coding: utf-8
 
 import io
-from statistics import mean
+from typing import Optional
 
 import pandas as pd
-from scipy import stats
 
-from jtrader import chunks
 from jtrader.core.provider import IEX
+from jtrader.core.scanner.universe import UniverseSnapshot
+from jtrader.core.utils.ranking import add_percentile_scores
 
 csv_columns = [
     'Ticker',
@@ -24,71 +24,40 @@ csv_columns = [
     'HQM Score'
 ]
 
-time_periods = [
-    'One-Year',
-    'Six-Month',
-    'Three-Month',
-    'One-Month'
-]
+time_periods = {
+    'One-Year': 'year1ChangePercent',
+    'Six-Month': 'month6ChangePercent',
+    'Three-Month': 'month3ChangePercent',
+    'One-Month': 'month1ChangePercent',
+}
 
 
 class HighQualityMomentum(IEX):
-    def run(self):
-        stocks = self.client.symbols()
-
-        stock_chunks = chunks(stocks, 100)
-        symbol_strings = []
-        for chunk in stock_chunks:
-            symbols = []
-            for stock in chunk:
-                symbols.append(stock['symbol'])
-
-            symbol_strings.append(','.join(symbols))
-
-        series = []
-        df = None
-        for symbol_string in symbol_strings:
-            data = self.client.stocks.batch(symbol_string, ["quote", "stats"])
-            for symbol in symbol_string.split(','):
-                if symbol not in data or 'quote' not in data[symbol] or data[symbol]['quote'] is None \
-                        or data[symbol]['quote']['close'] is None or data[symbol]['quote']['peRatio'] is None:
-                    continue
-
-                series.append(
-                    pd.Series(
-                        [
-                            symbol,
-                            data[symbol]['quote']['close'],
-                            data[symbol]['stats']['year1ChangePercent'],
-                            'N/A',
-                            data[symbol]['stats']['month6ChangePercent'],
-                            'N/A',
-                            data[symbol]['stats']['month3ChangePercent'],
-                            'N/A',
-                            data[symbol]['stats']['month1ChangePercent'],
-                            'N/A',
-                            'N/A'
-                        ],
-                        index=csv_columns
-                    )
-                )
-
-            df = pd.DataFrame(series, columns=csv_columns)
-
-            for row in df.index:
-                momentum_percentiles = []
-                for time_period in time_periods:
-                    change_col = f'{time_period} Price Return'
-                    percentile_col = f'{time_period} Return Percentile'
-
-                    df[change_col].fillna(value=0.0, inplace=True)
-                    df.loc[row, percentile_col] = stats.percentileofscore(df[change_col], df.loc[row, change_col]) / 100
-                    momentum_percentiles.append(df.loc[row, percentile_col])
-                df.loc[row, 'HQM Score'] = mean(momentum_percentiles)
-
-        if df is None:
+    def run(self, universe: Optional[UniverseSnapshot] = None):
+        if universe is None:
+            universe = UniverseSnapshot(self)
+
+        snapshot = universe.load()
+
+        snapshot = snapshot[snapshot['quote.close'].notna() & snapshot['quote.peRatio'].notna()]
+
+        if snapshot.empty:
             return
 
+        df = pd.DataFrame(index=snapshot.index, columns=csv_columns)
+        df['Ticker'] = snapshot.index
+        df['Price'] = snapshot['quote.close']
+        for time_period, field in time_periods.items():
+            df[f'{time_period} Price Return'] = snapshot[UniverseSnapshot.get_column('stats', field)]
+        df.reset_index(drop=True, inplace=True)
+
+        # rank the whole universe once
+        percentile_columns = {
+            f'{time_period} Price Return': f'{time_period} Return Percentile' for time_period in time_periods
+        }
+        df[list(percentile_columns.keys())] = df[list(percentile_columns.keys())].fillna(value=0.0)
+        add_percentile_scores(df, percentile_columns, 'HQM Score')
+
         df.sort_values('HQM Score', ascending=False, inplace=True)
         df = df[:50]
         df.reset_index(inplace=True, drop=True)
@@ -97,7 +66,7 @@ class HighQualityMomentum(IEX):
 
         writer = pd.ExcelWriter(file_name, engine='xlsxwriter')
 
-        df.to_excel(writer, 'HighQualityMomentum', index=False)
+        df.to_excel(writer, sheet_name='HighQualityMomentum', index=False)
 
         bg_color = '#0a0a23'
         font_color = '#ffffff'
@@ -150,7 +119,7 @@ class HighQualityMomentum(IEX):
                 column_formats[column][1]
             )
 
-        writer.save()
+        writer.close()
 
         with open(file_name, 'rb') as f:
             self.send_slack_file(file_name, 'HighQualityMomentum.xlsx', file=io.BytesIO(f.read()))
@@ -3,11 +3,12 @@
 
 import io
 import time
+from typing import Optional
 
 import pandas as pd
 
-from jtrader import chunks
 from jtrader.core.provider import IEX
+from jtrader.core.scanner.universe import UniverseSnapshot
 
 relative_volume = 'Relative Volume (30 Day)'
 change_from_close = 'Change From Close (%)'
@@ -26,47 +27,24 @@ csv_columns = [
 
 
 class Momentum(IEX):
-    def run(self):
-        stocks = self.client.symbols()
-
-        stock_chunks = chunks(stocks, 100)
-        symbol_strings = []
-        for chunk in stock_chunks:
-            symbols = []
-            for stock in chunk:
-                symbols.append(stock['symbol'])
-
-            symbol_strings.append(','.join(symbols))
-
-        series = []
-        for symbol_string in symbol_strings:
-            data = self.client.stocks.batch(symbol_string, ['quote', 'stats'])
-            for symbol in symbol_string.split(','):
-                if symbol not in data:
-                    continue
-
-                if self.stock_qualifies(data[symbol]):
-                    news = None
-                    if 'news' in data[symbol]['quote']:
-                        news = data[symbol]['quote']['news']
-
-                    series.append(
-                        pd.Series(
-                            [
-                                symbol,
-                                data[symbol]['quote']['latestPrice'],
-                                data[symbol]['quote']['latestVolume'],
-                                data[symbol]['stats']['sharesOutstanding'],
-                                1 - (data[symbol]['quote']['avgTotalVolume'] / data[symbol]['quote']['latestVolume']),
-                                data[symbol]['quote']['changePercent'],
-                                1 - (data[symbol]['quote']['previousClose'] / data[symbol]['quote']['latestPrice']),
-                                news
-                            ],
-                            index=csv_columns
-                        )
-                    )
-
-        df = pd.DataFrame(series, columns=csv_columns)
+    def run(self, universe: Optional[UniverseSnapshot] = None):
+        if universe is None:
+            universe = UniverseSnapshot(self)
+
+        snapshot = universe.load()
+
+        snapshot = snapshot[self.get_qualifying_mask(snapshot)]
+
+        df = pd.DataFrame(index=snapshot.index, columns=csv_columns)
+        df['Ticker'] = snapshot.index
+        df['Price'] = snapshot['quote.latestPrice']
+        df['Volume Today'] = snapshot['quote.latestVolume']
+        df['Shares Outstanding'] = snapshot['stats.sharesOutstanding']
+        df[relative_volume] = 1 - (snapshot['quote.avgTotalVolume'] / snapshot['quote.latestVolume'])
+        df[gap] = snapshot['quote.changePercent']
+        df[change_from_close] = 1 - (snapshot['quote.previousClose'] / snapshot['quote.latestPrice'])
+        df['News'] = [self.get_recent_news(symbol) for symbol in snapshot.index]
+        df.reset_index(drop=True, inplace=True)
 
         if df.empty:
             self.logger.info('No stocks on PMM radar')
@@ -80,7 +58,7 @@ class Momentum(IEX):
 
         writer = pd.ExcelWriter(file_name, engine='xlsxwriter')
 
-        df.to_excel(writer, 'PMM', index=False)
+        df.to_excel(writer, sheet_name='PMM', index=False)
 
         bg_color = '#0a0a23'
         font_color = '#ffffff'
@@ -135,36 +113,28 @@ class Momentum(IEX):
             writer.sheets['PMM'].set_column(f'{column}:{column}', 25, column_formats[column][1])
             writer.sheets['PMM'].write(f'{column}1', column_formats[column][0], column_formats[column][1])
 
-        writer.save()
+        writer.close()
 
         with open(file_name, 'rb') as f:
             self.send_slack_file(file_name, 'MarketMomentum.xlsx', file=io.BytesIO(f.read()))
 
-    def stock_qualifies(self, stock_data):
-        if 'quote' not in stock_data:
-            return False
-
-        quote = stock_data['quote']
-
-        if 'avgTotalVolume' not in quote or 'latestVolume' not in quote or 'changePercent' not in quote:
-            return False
-
-        if quote['changePercent'] is None or quote['latestVolume'] is None or quote['avgTotalVolume'] is None:
-            return False
+    @staticmethod
+    def get_qualifying_mask(snapshot: pd.DataFrame) -> pd.Series:
+        latest_volume = snapshot['quote.latestVolume']
+        average_volume = snapshot['quote.avgTotalVolume']
 
         # if the latest price is gaping 10%+
-        if quote['changePercent'] >= .1:
-            # @TODO this needs tweaking depending on time of day?
-            if quote['latestVolume'] != 0 and quote['avgTotalVolume'] != 0 \
-                    and (quote['latestVolume'] - quote['avgTotalVolume']) / quote['avgTotalVolume'] >= .1:
-                # get some news for the stocks
-                data = self.client.stocks.news(quote['symbol'])
+        # @TODO this needs tweaking depending on time of day?
+        return (snapshot['quote.changePercent'] >= .1) \
+            & (latest_volume != 0) & (average_volume != 0) \
+            & ((latest_volume - average_volume) / average_volume >= .1)
 
-                for news in data:
-                    if time.time() - news['datetime'] < 10800:
-                        quote['news'] = news
-                        break
+    def get_recent_news(self, symbol: str) -> Optional[dict]:
+        # get some news for the stocks
+        data = self.client.stocks.news(symbol)
 
-                return True
+        for news in data:
+            if time.time() - news['datetime'] < 10800:
+                return news
 
-        return False
+        return None
@@ -3,11 +3,12 @@
 
 import io
 import time
+from typing import Optional
 
 import pandas as pd
 
-from jtrader import chunks
 from jtrader.core.provider import IEX
+from jtrader.core.scanner.universe import UniverseSnapshot
 
 relative_volume = 'Relative Volume (30 Day)'
 change_from_close = 'Change From Close (%)'
@@ -26,48 +27,24 @@ csv_columns = [
 
 
 class PreMarketMomentum(IEX):
-    def run(self):
-        stocks = self.client.symbols()
-
-        stock_chunks = chunks(stocks, 100)
-        symbol_strings = []
-        for chunk in stock_chunks:
-            symbols = []
-            for stock in chunk:
-                symbols.append(stock['symbol'])
-
-            symbol_strings.append(','.join(symbols))
-
-        series = []
-        for symbol_string in symbol_strings:
-            data = self.client.stocks.batch(symbol_string, ['quote', 'stats'])
-            for symbol in symbol_string.split(','):
-                if symbol not in data:
-                    continue
-
-                if self.stock_qualifies(data[symbol]):
-                    news = None
-                    if 'news' in data[symbol]['quote']:
-                        news = data[symbol]['quote']['news']
-
-                    series.append(
-                        pd.Series(
-                            [
-                                symbol,
-                                data[symbol]['quote']['extendedPrice'],
-                                data[symbol]['quote']['latestVolume'],
-                                data[symbol]['stats']['sharesOutstanding'],
-                                (data[symbol]['quote']['latestVolume'] - data[symbol]['quote']['avgTotalVolume'])
-                                / data[symbol]['quote']['avgTotalVolume'],
-                                data[symbol]['quote']['extendedChangePercent'],
-                                data[symbol]['quote']['changePercent'],
-                                news
-                            ],
-                            index=csv_columns
-                        )
-                    )
-
-        df = pd.DataFrame(series, columns=csv_columns)
+    def run(self, universe: Optional[UniverseSnapshot] = None):
+        if universe is None:
+            universe = UniverseSnapshot(self)
+
+        snapshot = universe.load()
+        snapshot = snapshot[self.get_qualifying_mask(snapshot)]
+
+        df = pd.DataFrame(index=snapshot.index, columns=csv_columns)
+        df['Ticker'] = snapshot.index
+        df['Price'] = snapshot['quote.extendedPrice']
+        df['Volume Today'] = snapshot['quote.latestVolume']
+        df['Shares Outstanding'] = snapshot['stats.sharesOutstanding']
+        df[relative_volume] = (snapshot['quote.latestVolume'] - snapshot['quote.avgTotalVolume']) \
+            / snapshot['quote.avgTotalVolume']
+        df[gap] = snapshot['quote.extendedChangePercent']
+        df[change_from_close] = snapshot['quote.changePercent']
+        df['News'] = [self.get_recent_news(symbol) for symbol in snapshot.index]
+        df.reset_index(drop=True, inplace=True)
 
         if df.empty:
             self.logger.info('No stocks on PMM radar')
@@ -81,7 +58,7 @@ class PreMarketMomentum(IEX):
 
         writer = pd.ExcelWriter(file_name, engine='xlsxwriter')
 
-        df.to_excel(writer, 'PMM', index=False)
+        df.to_excel(writer, sheet_name='PMM', index=False)
 
         bg_color = '#0a0a23'
         font_color = '#ffffff'
@@ -136,44 +113,25 @@ class PreMarketMomentum(IEX):
             writer.sheets['PMM'].set_column(f'{column}:{column}', 25, column_formats[column][1])
             writer.sheets['PMM'].write(f'{column}1', column_formats[column][0], column_formats[column][1])
 
-        writer.save()
+        writer.close()
 
         with open(file_name, 'rb') as f:
             self.send_slack_file(file_name, 'PreMarketMomentum.xlsx', file=io.BytesIO(f.read()))
 
-    def stock_qualifies(self, stock_data):
-        if 'quote' not in stock_data:
-            return False
-
-        quote = stock_data['quote']
-
-        if quote is None:
-            return False
-
-        try:
-            self.validate_data(quote)
-        except ValueError:
-            return False
-
+    @staticmethod
+    def get_qualifying_mask(snapshot: pd.DataFrame) -> pd.Series:
+        # `!= 0` holds for missing values, so incomplete quotes are excluded explicitly
         # if the latest price is gaping 2%+
-        if quote['extendedChangePercent'] >= .02:
-            # get some news for the stocks
-            data = self.client.stocks.news(quote['symbol'])
-
-            for news in data:
-                if time.time() - news['datetime'] < 10800:
-                    quote['news'] = news
-                    break
+        return (snapshot['quote.latestVolume'] != 0) & snapshot['quote.latestVolume'].notna() \
+            & (snapshot['quote.avgTotalVolume'] != 0) & snapshot['quote.avgTotalVolume'].notna() \
+            & (snapshot['quote.extendedChangePercent'] >= .02)
 
-            return True
+    def get_recent_news(self, symbol: str) -> Optional[dict]:
+        # get some news for the stocks
+        data = self.client.stocks.news(symbol)
 
-        return False
+        for news in data:
+            if time.time() - news['datetime'] < 10800:
+                return news
 
-    @staticmethod
-    def validate_data(quote):
-        if 'latestVolume' not in quote or quote['latestVolume'] is None or 'avgTotalVolume' not in quote \
-                or quote['avgTotalVolume'] is None \
-                or quote['extendedChangePercent'] is None \
-                or quote['latestVolume'] == 0 \
-                or quote['avgTotalVolume'] == 0:
-            raise ValueError
+        return None
@@ -2,18 +2,19 @@ import json
 import numpy as np
 import pandas as pd
 import time
-from cement.utils.shell import spawn_thread
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+from functools import partial
+from logging import getLogger
+from pathlib import Path
 from pyEX import PyEXception
-from threading import Thread
 from typing import Optional, List
 
-from jtrader import chunk_threaded
+from jtrader.core.bar_store import BarStore
 from jtrader.core.indicator import __INDICATOR_MAP__
 from jtrader.core.indicator.chain import Chain
 from jtrader.core.indicator.indicator import Indicator
-from jtrader.core.odm import ODM
+from jtrader.core.orchestrator import Orchestrator
 from jtrader.core.provider import IEX
 
 
@@ -24,12 +25,20 @@ class Scanner(IEX):
             indicators: Optional[List[Indicator]],
             stocks: Optional[List[str]] = None,
             as_intraday: Optional[bool] = True,
-            no_notifications: Optional[bool] = False
+            no_notifications: Optional[bool] = False,
+            concurrency: Optional[int] = 8,
+            rate_limit: Optional[float] = 100,
+            process_workers: Optional[int] = None,
+            feature_cache_folder: Optional[str] = None
     ):
         super().__init__(is_sandbox, no_notifications=no_notifications)
 
         self.as_intraday = as_intraday
-        self.odm = ODM()
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.process_workers = process_workers
+        self.feature_cache_folder = feature_cache_folder
+        self.bar_store = BarStore()
         self.stocks = stocks
         self.indicators = []
         if indicators is None:
@@ -57,102 +66,95 @@ class Scanner(IEX):
     def run(self):
         stocks = self.stocks
         if stocks is None:
-            stocks = []
-            for symbol in self.client.symbols():
-                stocks.append(symbol['symbol'])
-
-        if self.as_intraday:
-            while True:
-                self.process_threaded(stocks, 'intraday')
-                time.sleep(5)
-        else:
-            self.process_threaded(stocks)
-
-        self.logger.info('Processing finished')
+            stocks = self.enabled_symbols().tolist()
 
-    def process_threaded(self, stocks, type: str = 'swing'):
-        i = 1
-        threads: List[Thread] = []
+        with Orchestrator(self.concurrency, self.rate_limit, self.process_workers) as orchestrator:
+            if self.as_intraday:
+                while True:
+                    self.process(orchestrator, stocks, 'intraday')
+                    time.sleep(5)
+            else:
+                self.process(orchestrator, stocks)
 
-        chunked = chunk_threaded(stocks, self.is_sandbox, 10)
+        self.logger.info('Processing finished')
 
+    def process(self, orchestrator: Orchestrator, stocks: List[str], type: str = 'swing'):
         if type == 'swing':
-            action = self.swing_loop
+            fetch = self.get_swing_data
+            # bulk backfill anything the local store has not seen yet before fanning out
+            self.bar_store.ensure(stocks)
         elif type == 'intraday':
-            action = self.intraday_loop
+            fetch = self.get_intraday_data
         else:
             raise NotImplemented
 
-        for chunk in chunked:
-            thread_name = f"Thread-{i}"
-            """ @thread """
-            thread = spawn_thread(action, True, False, args=(thread_name, chunk), daemon=True)
-            threads.append(thread)
-            i += 1
+        results = orchestrator.run(
+            stocks,
+            fetch,
+            partial(
+                self.evaluate_indicators,
+                indicators=self.indicators,
+                feature_cache_folder=self.feature_cache_folder
+            ),
+            rate_limited=type == 'intraday'
+        )
+
+        for stock, passed_validators in zip(stocks, results):
+            if passed_validators is None:
+                continue
 
-        while len(threads) > 0:
-            for thread in threads:
-                if not thread.is_alive():
-                    threads.remove(thread)
-                thread.join(1)
+            for passed_validator in passed_validators:
+                self.notify_passed_validators(stock, passed_validator)
 
-    def intraday_loop(self, thread_name, chunk):
-        sleep = .2
+    def get_intraday_data(self, stock: str) -> Optional[pd.DataFrame]:
+        self.logger.info(f"Processing ticker: {stock}")
+        data = self.client.stocks.intradayDF(stock, IEXOnly=True)
 
-        if self.is_sandbox:
-            sleep = 2
+        if 'close' not in data:
+            self.logger.error(f"{stock} Could not find closing intraday")
 
-        for stock in chunk:
-            time.sleep(sleep)
-            self.logger.info(f"({thread_name}) Processing ticker: {stock}")
-            data = self.client.stocks.intradayDF(stock, IEXOnly=True)
-            self.init_indicators(stock, data)
+            return None
 
-        return True
+        return data
 
-    def swing_loop(self, thread_name, chunk):
+    def get_swing_data(self, stock: str) -> Optional[pd.DataFrame]:
         today = datetime.today()
         delta = 365
         start = today + relativedelta(days=-delta)
-        sleep = .2
-
-        if self.is_sandbox:
-            sleep = 2
-
-        for stock in chunk:
-            time.sleep(sleep)
-            self.logger.info(f"({thread_name}) Processing ticker: {stock}")
-            data = pd.DataFrame(
-                self.odm.get_historical_stock_range(
-                    stock,
-                    start
-                )
-            )
-
-            data = data.iloc[::-1].reset_index(drop=True)
 
-            if data.empty:
-                self.logger.debug(f"Retrieved empty data set for stock {stock}")
+        self.logger.info(f"Processing ticker: {stock}")
+        data = self.bar_store.read(stock, start)
 
-                continue
-
-            self.init_indicators(stock, data)
-
-        return True
-
-    def init_indicators(self, ticker: str, data: pd.DataFrame):
-        period = 'swing'
-        if self.as_intraday and data is None:
-            period = 'intraday'
-            if 'close' not in data:
-                self.logger.error(f"{ticker} Could not find closing intraday")
+        if data.empty:
+            self.logger.debug(f"Retrieved empty data set for stock {stock}")
 
-                return False
+            return None
 
-        if len(self.indicators) > 1:
-            self.indicators = [Chain(ticker, self.indicators)]
+        return data.iloc[::-1].reset_index(drop=True)
 
-        for indicator_class in self.indicators:
+    @staticmethod
+    def evaluate_indicators(
+            ticker: str,
+            data: Optional[pd.DataFrame],
+            indicators: list,
+            feature_cache_folder: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Runs the indicators against the ticker's data and returns the validators that passed. This is pure CPU work
+        with picklable inputs and outputs, so the scanners run it on a process pool.
+        """
+        if feature_cache_folder is not None:
+            # each evaluation process holds its own cache, spilling to disk lets them share computed series
+            Indicator.feature_cache.spill_folder = Path(feature_cache_folder)
+
+        if data is None:
+            return []
+
+        if len(indicators) > 1:
+            indicators = [Chain(ticker, indicators)]
+
+        results = []
+        for indicator_class in indicators:
             indicator = indicator_class
             if not isinstance(indicator, Chain):
                 indicator = indicator(ticker)
@@ -178,10 +180,10 @@ class Scanner(IEX):
 
                         previous_validation = is_valid
 
-                        signal_type = self.get_signal_string(is_valid)
+                        signal_type = Scanner.get_signal_string(is_valid)
 
                         passed_validators[indicator.get_name()].append(
-                            self.get_passed_validator_dict(signal_type, indicator_chain)
+                            Scanner.get_passed_validator_dict(signal_type, indicator_chain)
                         )
                         chain_index += 1
                     if has_valid_chain is False:
@@ -192,30 +194,37 @@ class Scanner(IEX):
                     if is_valid is None:
                         continue
 
-                    signal_type = self.get_signal_string(is_valid)
+                    signal_type = Scanner.get_signal_string(is_valid)
 
-                    passed_validators = self.get_passed_validator_dict(signal_type, indicator)
+                    passed_validators = Scanner.get_passed_validator_dict(signal_type, indicator)
 
             except PyEXception as e:
-                self.logger.error(e.args[0] + ' ' + e.args[1])
+                getLogger().error(e.args[0] + ' ' + e.args[1])
 
                 break
 
             if len(passed_validators) > 0:
-                bearish_count = list(filter(lambda x: x['signal_type' == 'bearish'], passed_validators.items()))
-                bullish_count = list(filter(lambda x: x['signal_type' == 'bullish'], passed_validators.items()))
+                results.append(passed_validators)
+
+        return results
+
+    def notify_passed_validators(self, ticker: str, passed_validators: dict):
+        period = 'intraday' if self.as_intraday else 'swing'
+
+        bearish_count = list(filter(lambda x: x['signal_type' == 'bearish'], passed_validators.items()))
+        bullish_count = list(filter(lambda x: x['signal_type' == 'bullish'], passed_validators.items()))
 
-                if len(bearish_count) == len(passed_validators) or len(bullish_count) == len(passed_validators):
-                    message = {
-                        "ticker": ticker,
-                        "signal_period": period,
-                        "indicators_triggered": passed_validators
-                    }
+        if len(bearish_count) == len(passed_validators) or len(bullish_count) == len(passed_validators):
+            message = {
+                "ticker": ticker,
+                "signal_period": period,
+                "indicators_triggered": passed_validators
+            }
 
-                    message_string = json.dumps(message)
+            message_string = json.dumps(message)
 
-                    self.logger.info(message_string)
-                    self.send_notification('```' + message_string + '```')
+            self.logger.info(message_string)
+            self.send_notification('```' + message_string + '```')
 
     @staticmethod
     def get_passed_validator_dict(signal_type: str, indicator: Indicator) -> dict:
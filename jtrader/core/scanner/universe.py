@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import time
+from logging import getLogger
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from jtrader.core.provider import IEX
+from jtrader.core.utils.columnar import ColumnarBuilder
+
+UNIVERSE_FOLDER = 'data/universe'
+UNIVERSE_TTL = 900
+
+
+class UniverseSnapshot:
+    """
+    One row per symbol of the `quote`, `stats` and `advanced-stats` fields the cross-sectional scanners screen on,
+    fetched in a single pass of batch requests and kept on disk as Parquet until it is older than the TTL. Scanners run
+    back to back share the snapshot instead of each downloading the universe again.
+
+    Columns are named `{endpoint}.{field}` (`quote.close`, `stats.month1ChangePercent`...), the symbol is the index.
+    """
+
+    FIELDS = {
+        'quote': [
+            'close',
+            'latestPrice',
+            'previousClose',
+            'peRatio',
+            'latestVolume',
+            'avgTotalVolume',
+            'changePercent',
+            'extendedPrice',
+            'extendedChangePercent',
+        ],
+        'stats': [
+            'sharesOutstanding',
+            'year1ChangePercent',
+            'month6ChangePercent',
+            'month3ChangePercent',
+            'month1ChangePercent',
+            'day30ChangePercent',
+            'day5ChangePercent',
+        ],
+        'advanced-stats': [
+            'priceToBook',
+            'priceToSales',
+            'enterpriseValue',
+            'EBITDA',
+            'grossProfit',
+        ],
+    }
+
+    def __init__(
+            self,
+            provider: IEX,
+            folder: str = UNIVERSE_FOLDER,
+            ttl: int = UNIVERSE_TTL,
+            concurrency: Optional[int] = None
+    ):
+        self.provider = provider
+        self.folder = Path(folder)
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.logger = getLogger()
+
+    @staticmethod
+    def get_column(endpoint: str, field: str) -> str:
+        return ColumnarBuilder.get_column(endpoint, field)
+
+    @property
+    def path(self) -> Path:
+        return self.folder / ('sandbox.parquet' if self.provider.is_sandbox else 'universe.parquet')
+
+    def is_fresh(self) -> bool:
+        return self.path.is_file() and time.time() - self.path.stat().st_mtime < self.ttl
+
+    def load(self, refresh: bool = False) -> pd.DataFrame:
+        if not refresh and self.is_fresh():
+            return pd.read_parquet(self.path)
+
+        return self.refresh()
+
+    def refresh(self) -> pd.DataFrame:
+        symbols = self.provider.enabled_symbols().tolist()
+
+        self.logger.info(f"Refreshing universe snapshot of {len(symbols)} symbols...")
+
+        builder = ColumnarBuilder(self.FIELDS, len(symbols))
+        for data in self.provider.batch_iter(symbols, list(self.FIELDS.keys()), max_workers=self.concurrency):
+            builder.add_batch(data)
+
+        snapshot = builder.build().sort_index()
+
+        self.folder.mkdir(exist_ok=True, parents=True)
+
+        # write next to the snapshot and swap it in, so a concurrent scanner never reads a partial file
+        temp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        snapshot.to_parquet(temp_path)
+        os.replace(temp_path, self.path)
+
+        return snapshot
+
@@ -1,14 +1,14 @@
 #!/usr/bin/env python
 # coding: utf-8
 import io
-import statistics
+from typing import Optional
 
 import numpy as np
 import pandas as pd
-from scipy import stats
 
-from jtrader import chunks
 from jtrader.core.provider import IEX
+from jtrader.core.scanner.universe import UniverseSnapshot
+from jtrader.core.utils.ranking import add_percentile_scores
 
 csv_columns = [
     'Ticker',
@@ -36,80 +36,38 @@ metrics = {
 
 
 class Value(IEX):
-    def run(self):
-        stocks = self.client.symbols()
-
-        stock_chunks = chunks(stocks, 100)
-        symbol_strings = []
-        for chunk in stock_chunks:
-            symbols = []
-            for stock in chunk:
-                symbols.append(stock['symbol'])
-
-            symbol_strings.append(','.join(symbols))
-
-        for symbol_string in symbol_strings:
-            data = self.client.stocks.batch(symbol_string, ["quote", "advanced-stats"])
-
-            for symbol in symbol_string.split(','):
-                if data[symbol]['quote']['close'] is None:
-                    print('Could not get closing price for %s' % symbol)
-                    continue
-
-                pe_ratio = data[symbol]['quote']['peRatio']
-                pb_ratio = data[symbol]['advanced-stats']['priceToBook']
-                ps_ratio = data[symbol]['advanced-stats']['priceToSales']
-                enterprise_value = data[symbol]['advanced-stats']['enterpriseValue']
-                ebitda = data[symbol]['advanced-stats']['EBITDA']
-
-                try:
-                    ev_to_ebitda = enterprise_value / ebitda
-                except TypeError:
-                    ev_to_ebitda = np.NaN
-
-                gross_profit = data[symbol]['advanced-stats']['grossProfit']
-
-                try:
-                    ev_to_gross_profit = enterprise_value / gross_profit
-                except TypeError:
-                    ev_to_gross_profit = np.NaN
-
-                df = df.append(
-                    pd.Series(
-                        [
-                            symbol,
-                            data[symbol]['quote']['latestPrice'],
-                            pe_ratio,
-                            'N/A',
-                            pb_ratio,
-                            'N/A',
-                            ps_ratio,
-                            'N/A',
-                            ev_to_ebitda,
-                            'N/A',
-                            ev_to_gross_profit,
-                            'N/A',
-                            'N/A'
-                        ],
-                        index=csv_columns
-                    ),
-                    ignore_index=True
-                )
-
-            for column in ['Price-to-Earnings Ratio', 'Price-to-Book Ratio', 'Price-to-Sales Ratio', 'EV/EBITDA',
-                           'EV/GP']:
-                df.fillna(df[column].mean(), inplace=True)
-
-            for metric in metrics.keys():
-                for row in df.index:
-                    df.loc[row, metrics[metric]] = stats.percentileofscore(df[metric], df.loc[row, metric]) / 100
-
-            for row in df.index:
-                value_percentiles = []
-                for metric in metrics.keys():
-                    value_percentiles.append(df.loc[row, metrics[metric]])
-
-                df.loc[row, 'RV Score'] = statistics.mean(value_percentiles)
+    def run(self, universe: Optional[UniverseSnapshot] = None):
+        if universe is None:
+            universe = UniverseSnapshot(self)
+
+        snapshot = universe.load()
+
+        missing_close = snapshot['quote.close'].isna()
+        for symbol in snapshot.index[missing_close]:
+            print('Could not get closing price for %s' % symbol)
+
+        snapshot = snapshot[~missing_close]
+
+        if snapshot.empty:
+            return
+
+        df = pd.DataFrame(index=snapshot.index, columns=csv_columns)
+        df['Ticker'] = snapshot.index
+        df['Price'] = snapshot['quote.latestPrice']
+        df['Price-to-Earnings Ratio'] = snapshot['quote.peRatio']
+        df['Price-to-Book Ratio'] = snapshot['advanced-stats.priceToBook']
+        df['Price-to-Sales Ratio'] = snapshot['advanced-stats.priceToSales']
+        df['EV/EBITDA'] = snapshot['advanced-stats.enterpriseValue'] / snapshot['advanced-stats.EBITDA']
+        df['EV/GP'] = snapshot['advanced-stats.enterpriseValue'] / snapshot['advanced-stats.grossProfit']
+        # a zero EBITDA or gross profit has no meaningful multiple
+        df[['EV/EBITDA', 'EV/GP']] = df[['EV/EBITDA', 'EV/GP']].replace([np.inf, -np.inf], np.nan)
+        df.reset_index(drop=True, inplace=True)
+
+        # rank the whole universe once
+        metric_columns = list(metrics.keys())
+        df[metric_columns] = df[metric_columns].astype(float)
+        df[metric_columns] = df[metric_columns].fillna(df[metric_columns].mean())
+        add_percentile_scores(df, metrics, 'RV Score')
 
         df.sort_values('RV Score', ascending=True, inplace=True)
         df = df[:50]
@@ -119,7 +77,7 @@ class Value(IEX):
 
         writer = pd.ExcelWriter(file_name, engine='xlsxwriter')
 
-        df.to_excel(writer, 'Value', index=False)
+        df.to_excel(writer, sheet_name='Value', index=False)
 
         bg_color = '#0a0a23'
         font_color = '#ffffff'
@@ -179,7 +137,7 @@ class Value(IEX):
             writer.sheets['Value'].set_column(f'{column}:{column}', 25, column_formats[column][1])
             writer.sheets['Value'].write(f'{column}1', column_formats[column][0], column_formats[column][1])
 
-        writer.save()
+        writer.close()
 
         with open(file_name, 'rb') as f:
             self.send_slack_file(file_name, file_name, file=io.BytesIO(f.read()))
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import csv
+import heapq
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from logging import getLogger
+from typing import List, Optional
+
+import pandas as pd
+
+from jtrader.core.backtester import Backtester
+from jtrader.core.indicator.indicator import Indicator
+
+LEADERBOARD_COLUMNS = [
+    'ticker',
+    'buy_indicators',
+    'sell_indicators',
+    'time_period',
+    'fast_period',
+    'slow_period',
+    'trades',
+    'final_equity',
+    'total_return',
+    'max_drawdown'
+]
+
+PARAMETER_GRID = {
+    'time_period': [
+        Indicator.WINDOW_SIZE_TEN,
+        Indicator.WINDOW_SIZE_FOURTEEN,
+        Indicator.WINDOW_SIZE_TWENTY
+    ],
+    'fast_period': [
+        Indicator.WINDOW_SIZE_TEN,
+        Indicator.WINDOW_SIZE_FOURTEEN,
+        Indicator.WINDOW_SIZE_TWENTY
+    ],
+    'slow_period': [
+        Indicator.WINDOW_SIZE_TWENTY_EIGHT,
+        Indicator.WINDOW_SIZE_FORTY,
+        Indicator.WINDOW_SIZE_FIFTY_SEVEN
+    ],
+}
+
+
+def get_indicator_combinations(indicators: List, max_size: int) -> List[tuple]:
+    # cement hands `append` + `nargs` arguments over as a list of lists
+    indicators = list(dict.fromkeys(itertools.chain.from_iterable(
+        [group] if isinstance(group, str) else group for group in indicators
+    )))
+    combinations = []
+    for size in range(1, min(max_size, len(indicators)) + 1):
+        combinations.extend(itertools.combinations(indicators, size))
+
+    return combinations
+
+
+def get_parameter_sets(parameter_grid: Optional[dict] = None) -> List[dict]:
+    if parameter_grid is None:
+        parameter_grid = PARAMETER_GRID
+
+    parameter_sets = []
+    for values in itertools.product(*parameter_grid.values()):
+        params = dict(zip(parameter_grid.keys(), values))
+
+        if params.get('fast_period', 0) >= params.get('slow_period', float('inf')):
+            continue
+
+        parameter_sets.append(params)
+
+    return parameter_sets
+
+
+def sweep_ticker(
+        ticker: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        runs: List[tuple]
+) -> List[dict]:
+    """
+    Runs every (buy indicators, sell indicators, params) combination for one ticker. The bars are loaded once and
+    shared by all runs, only the summary of each run is sent back to the caller.
+    """
+    bars = Backtester(getLogger(), ticker, start_date, end_date, [], []).load_bars()
+
+    if bars.empty:
+        return []
+
+    rows = []
+    for buy_indicators, sell_indicators, params in runs:
+        backtester = Backtester(
+            getLogger(),
+            ticker,
+            start_date,
+            end_date,
+            list(buy_indicators),
+            list(sell_indicators),
+            indicator_params=params
+        )
+
+        results = backtester.run_bars(bars)
+
+        rows.append(
+            {
+                'ticker': ticker,
+                'buy_indicators': '+'.join(buy_indicators),
+                'sell_indicators': '+'.join(sell_indicators),
+                'time_period': params['time_period'],
+                'fast_period': params['fast_period'],
+                'slow_period': params['slow_period'],
+                'trades': len(results['fills']),
+                'final_equity': results['final_equity'],
+                'total_return': results['total_return'],
+                'max_drawdown': results['max_drawdown'],
+            }
+        )
+
+    return rows
+
+
+class BacktestSweep:
+    def __init__(
+            self,
+            logger,
+            tickers: List[str],
+            start_date: Optional[str],
+            end_date: Optional[str],
+            buy_indicators: List[str],
+            sell_indicators: List[str],
+            leaderboard_path: str = 'backtest_leaderboard.csv',
+            max_workers: Optional[int] = None,
+            dask_scheduler_address: Optional[str] = None,
+            max_combination_size: int = 2,
+            parameter_grid: Optional[dict] = None
+    ):
+        self.logger = logger
+        self.tickers = list(dict.fromkeys(tickers))
+        self.start_date = start_date
+        self.end_date = end_date
+        self.leaderboard_path = leaderboard_path
+        self.max_workers = max_workers or os.cpu_count()
+        self.dask_scheduler_address = dask_scheduler_address
+        self.top = 0
+        self.leaders = []
+        self.sequence = 0
+
+        buy_combinations = get_indicator_combinations(buy_indicators, max_combination_size)
+        sell_combinations = get_indicator_combinations(sell_indicators, max_combination_size)
+
+        self.runs = [
+            (buy, sell, params)
+            for buy, sell in itertools.product(buy_combinations, sell_combinations)
+            for params in get_parameter_sets(parameter_grid)
+        ]
+
+    def run(self, top: int = 10) -> dict:
+        self.logger.info(f"Sweeping {len(self.runs)} parameter sets across {len(self.tickers)} tickers...")
+
+        # the best runs are kept while the rows stream to the leaderboard, it is never read back
+        self.top = top
+        self.leaders = []
+        self.sequence = 0
+
+        with open(self.leaderboard_path, 'w', newline='') as leaderboard:
+            writer = csv.DictWriter(leaderboard, fieldnames=LEADERBOARD_COLUMNS)
+            writer.writeheader()
+
+            if self.dask_scheduler_address:
+                row_total = self.run_dask(writer, leaderboard)
+            else:
+                row_total = self.run_processes(writer, leaderboard)
+
+        results = {
+            'leaderboard': self.leaderboard_path,
+            'runs': row_total,
+            'top': None
+        }
+
+        if row_total > 0:
+            leaders = [row for _, _, row in sorted(self.leaders, key=lambda leader: leader[:2], reverse=True)]
+            results['top'] = pd.DataFrame(leaders, columns=LEADERBOARD_COLUMNS)
+
+        return results
+
+    def run_processes(self, writer: csv.DictWriter, leaderboard) -> int:
+        row_total = 0
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(sweep_ticker, ticker, self.start_date, self.end_date, self.runs): ticker
+                for ticker in self.tickers
+            }
+
+            for future in as_completed(futures):
+                row_total += self.write_rows(futures[future], future, writer, leaderboard)
+
+        return row_total
+
+    def run_dask(self, writer: csv.DictWriter, leaderboard) -> int:
+        from distributed import Client, as_completed as dask_as_completed
+
+        row_total = 0
+        with Client(address=self.dask_scheduler_address) as client:
+            [runs] = client.scatter([self.runs], broadcast=True)
+            futures = {
+                client.submit(sweep_ticker, ticker, self.start_date, self.end_date, runs, pure=False): ticker
+                for ticker in self.tickers
+            }
+
+            for future in dask_as_completed(futures):
+                row_total += self.write_rows(futures[future], future, writer, leaderboard)
+                future.release()
+
+        return row_total
+
+    def write_rows(self, ticker: str, future, writer: csv.DictWriter, leaderboard) -> int:
+        try:
+            rows = future.result()
+        except Exception as e:
+            self.logger.error(f"{ticker} sweep failed: {e}")
+
+            return 0
+
+        writer.writerows(rows)
+        leaderboard.flush()
+
+        for row in rows:
+            self.add_leader(row)
+
+        self.logger.info(f"{ticker} finished {len(rows)} runs")
+
+        return len(rows)
+
+    def add_leader(self, row: dict) -> None:
+        """
+        Keeps `row` if it is among the `top` total returns seen so far, in a min heap of at most `top` rows.
+        """
+        if self.top <= 0 or row['total_return'] is None or math.isnan(row['total_return']):
+            return
+
+        # the negated sequence number breaks ties in favour of the earlier row, as nlargest does
+        self.sequence -= 1
+        leader = (row['total_return'], self.sequence, row)
+
+        if len(self.leaders) < self.top:
+            heapq.heappush(self.leaders, leader)
+        elif leader[:2] > self.leaders[0][:2]:
+            heapq.heapreplace(self.leaders, leader)
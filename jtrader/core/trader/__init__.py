@@ -1,4 +1,19 @@
+from importlib import import_module
+
 from jtrader.core.trader.trader import Trader
-from .kucoin import KuCoin
-from .loopring import LoopRing
-from .pairs import Pairs
+
+# each trader pulls in its exchange SDK or models, so it is only imported when first used (PEP 562)
+__TRADERS__ = {
+    'KuCoin': 'jtrader.core.trader.kucoin',
+    'LoopRing': 'jtrader.core.trader.loopring',
+    'Pairs': 'jtrader.core.trader.pairs',
+}
+
+__all__ = ['Trader', *__TRADERS__]
+
+
+def __getattr__(name: str):
+    if name not in __TRADERS__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module(__TRADERS__[name]), name)
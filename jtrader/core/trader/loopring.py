@@ -29,8 +29,6 @@ class LoopRing(Trader):
             "amount": message['data'][6],
         }
 
-        self.frames = self.frames.append(item, ignore_index=True)
-        self.frames.sort_values(by=['date'], inplace=True, ascending=False)
-        self.frames.reset_index(inplace=True, drop=True)
+        self.add_candle(item)
 
         self._execute_chain_validation()
@@ -1,26 +1,46 @@
-import math
+import time
 from datetime import datetime
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 from dateutil.relativedelta import relativedelta
-from sklearn import linear_model
-from sklearn.metrics import r2_score
-from sklearn.model_selection import train_test_split
 
-from jtrader.core.odm import ODM
+from jtrader.core.bar_store import BarStore
+from jtrader.core.pairs import PairsIndex, PairsScreener, SpreadMonitor
+from jtrader.core.pairs.screener import align_closes
 from jtrader.core.provider import Provider
 from jtrader.core.trader import Trader
 
 
 class Pairs(Trader):
+    R2_THRESHOLD = .9
+    LOWER_THRESHOLD = -2
+    UPPER_THRESHOLD = 3
+    # seconds between checks of the bar store for the bars the worker ingested
+    POLL_INTERVAL = 60
+
     def __init__(self, provider: Provider, comparison_ticker: str):
-        super().__init__(provider, comparison_ticker[0])
-        self.odm = ODM()
+        super().__init__(provider, comparison_ticker)
+        self.bar_store = BarStore()
+        self.screener = PairsScreener(self.bar_store)
+        self.index = PairsIndex(self.bar_store)
+        self.monitor = SpreadMonitor(lower_threshold=self.LOWER_THRESHOLD, upper_threshold=self.UPPER_THRESHOLD)
+        self.monitored_tickers = []
+        self.last_bar_date = None
 
     def start_trader(self):
         self.__run_detection()
 
+        if len(self.monitor) == 0:
+            return
+
+        # IEX has no bar stream, new daily bars arrive in the bar store as the worker ingests them
+        while True:
+            time.sleep(self.POLL_INTERVAL)
+
+            self.poll_bars()
+
     async def _on_websocket_message(self, ws, message) -> None:
         await super()._on_websocket_message(ws, message)
 
@@ -28,82 +48,142 @@ class Pairs(Trader):
         today = datetime.today()
         delta = 730
         start = today + relativedelta(days=-delta)
-        stock_list = self.provider.symbols()
 
-        comparison_data = pd.DataFrame(
-            self.odm.get_historical_stock_range(self.ticker, start)
-        )
+        screen = self.__get_indexed_spreads()
 
-        if len(comparison_data) <= 0:
-            self.logger.warning(f"Retrieved empty data set for stock {self.ticker}")
+        if screen is None:
+            stock_list = self.provider.enabled_symbols().tolist()
+
+            screen = self.screener.run(self.ticker, stock_list, start)
+            screen = screen[screen['r2'] > self.R2_THRESHOLD]
+
+        if screen.empty:
+            self.logger.warning(f"No stock qualifies as a pair of {self.ticker}")
 
             return
 
-        for stock in stock_list:
-            data = pd.DataFrame(
-                self.odm.get_historical_stock_range(
-                    stock['symbol'],
-                    start
-                )
-            )
+        for ticker, row in screen.iterrows():
+            self.logger.info(f"{ticker} qualifies with R2 score of {row['r2']}")
 
-            if data.empty:
-                self.logger.debug(f"Retrieved empty data set for stock {stock['symbol']}")
+            self.__validate_regression_threshold(ticker, row)
 
-                continue
+        self.__start_monitor(screen.index.tolist(), start)
 
-            self.__validate_regression(stock['symbol'], data, comparison_data)
+    def __start_monitor(self, pairs: List[str], start: datetime) -> None:
+        """
+        Monitors the spreads of the qualifying pairs, warmed up on their bars since `start`.
+        """
+        tickers = [self.ticker] + pairs
+        frames = self.bar_store.read_many(tickers, start, columns=['date', 'close'])
 
-    def __validate_regression(self, ticker, data, comparison_data):
-        n = 60
+        calendar = frames[self.ticker]['date'].to_numpy(dtype='datetime64[ns]')
+        closes = align_closes(calendar, [frames[ticker] for ticker in tickers])
 
-        regr = linear_model.LinearRegression()
+        self.monitor.add_pairs([(self.ticker, pair) for pair in pairs])
+        self.monitored_tickers = tickers
 
-        x = comparison_data[['high', 'low', 'close', 'volume']].values[-n:]
-        y = data['close'].to_frame().values[-n:]
+        # crossings of the history are not signals
+        for row in closes:
+            self.monitor.update({ticker: close for ticker, close in zip(tickers, row) if not np.isnan(close)})
 
-        if len(x) != len(y):
-            return False
+        if len(calendar) > 0:
+            self.last_bar_date = frames[self.ticker]['date'].iloc[-1]
 
-        x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.2, random_state=0)
+        self.logger.info(f"Monitoring the spreads of {len(pairs)} pairs of {self.ticker}")
 
-        regr.fit(x_train, y_train)
+    def poll_bars(self) -> pd.DataFrame:
+        """
+        Feeds the bars stored since the last one the monitor saw to the monitored spreads, one bar date at a time, and
+        returns the threshold crossings they caused.
+        """
+        crossings = []
 
-        y_prediction = regr.predict(x_test)
+        if self.last_bar_date is None:
+            return pd.DataFrame(columns=SpreadMonitor.CROSSING_COLUMNS)
 
-        cd = r2_score(y_test, y_prediction)
+        frames = self.bar_store.read_many(self.monitored_tickers, self.last_bar_date, columns=['date', 'close'])
+        bars = pd.concat([frame.assign(ticker=ticker) for ticker, frame in frames.items()], ignore_index=True)
+        bars = bars[bars['date'] > self.last_bar_date]
 
-        if cd > .9:
-            self.logger.info(f"{ticker} qualifies with R2 score of {cd}")
+        for bar_date, bar in bars.groupby('date', sort=True):
+            crossings.append(self.update_spreads(dict(zip(bar['ticker'], bar['close']))))
+            self.last_bar_date = bar_date
 
-            return self.__validate_regression_threshold(ticker, data, comparison_data, n)
+        crossings = [crossing for crossing in crossings if not crossing.empty]
 
-        return False
+        if len(crossings) == 0:
+            return pd.DataFrame(columns=SpreadMonitor.CROSSING_COLUMNS)
 
-    def __validate_regression_threshold(self, ticker, data, comparison_data, n):
-        # Step 1: Generate the spread of two log price series
-        # 𝑆𝑝𝑟𝑒𝑎𝑑𝑡 = log(𝑌𝑡)−(𝛼+𝛽log(𝑋𝑡))
-        x2 = comparison_data['close'][-n:].astype('float')
-        y2 = data['close'][-n:].astype('float')
+        return pd.concat(crossings, ignore_index=True)
+
+    def update_spreads(self, closes: Dict[str, float]) -> pd.DataFrame:
+        """
+        Advances the monitored spreads with the closes of a new bar and logs the threshold crossings.
+        """
+        crossings = self.monitor.update(closes)
+
+        for crossing in crossings.itertuples(index=False):
+            if crossing.signal == SpreadMonitor.SIGNAL_BEARISH:
+                self.logger.info(f"{crossing.pair} SELL SELL SELL! ({crossing.zscore} std)")
+            elif crossing.signal == SpreadMonitor.SIGNAL_BULLISH:
+                self.logger.info(f"{crossing.pair} BUY BUY BUY! ({crossing.zscore} std)")
+            else:
+                self.logger.info(f"{crossing.pair} spread reverted ({crossing.zscore} std)")
 
-        cov = np.cov(x2, y2)[0][1]
-        variance = np.var(y2)
+        return crossings
 
-        beta = 1 * (cov / variance)
+    def __get_indexed_spreads(self) -> Optional[pd.DataFrame]:
+        """
+        Latest spreads of the pairs indexed for the ticker, priced with the index's hedge ratios. None when the ticker
+        is not in the index.
+        """
+        candidates = self.index.get_candidates(self.ticker)
 
-        current_x = x2[-1:]
-        current_y = y2[-1:]
+        if candidates.empty:
+            return None
 
-        spread = math.log(current_y) - (.05 + (beta * math.log(current_x)))
+        self.logger.info(f"Found {len(candidates)} indexed pairs of {self.ticker}")
 
-        self.logger.info(f"{ticker} has spread of {spread}")
+        # the latest bars are all the index needs to price the spreads
+        start = datetime.today() + relativedelta(days=-14)
+        frames = self.bar_store.read_many([self.ticker] + candidates.index.tolist(), start, columns=['date', 'close'])
+
+        latest = frames[self.ticker].tail(1)
+
+        if latest.empty:
+            self.logger.warning(f"Retrieved empty data set for stock {self.ticker}")
+
+            return pd.DataFrame()
+
+        # only pairs with a bar on the ticker's latest day are priced
+        closes = pd.Series(
+            {ticker: frame['close'].iloc[-1] for ticker, frame in frames.items()
+             if not frame.empty and frame['date'].iloc[-1] == latest['date'].iloc[0]}
+        ).reindex(candidates.index)
+
+        spreads = np.log(closes) - (candidates['alpha'] + candidates['beta'] * np.log(latest['close'].iloc[0]))
+
+        return pd.DataFrame({
+            'r2': candidates['correlation'] ** 2,
+            'beta': candidates['beta'],
+            'spread': spreads,
+            'zscore': spreads / candidates['spread_std'],
+        }).dropna()
+
+    def __validate_regression_threshold(self, ticker: str, row: pd.Series) -> bool:
+        # Step 1: Generate the spread of two log price series
+        # 𝑆𝑝𝑟𝑒𝑎𝑑𝑡 = log(𝑌𝑡)−(𝛼+𝛽log(𝑋𝑡))
+        # alpha and beta come from the screen's regression, the spread is compared in standard deviations
+        spread = row['zscore']
+
+        self.logger.info(f"{ticker} has spread of {row['spread']} ({spread} std, hedge ratio {row['beta']})")
 
         # Step 2: Set the range of spread series  [lower, upper]
         # If 𝑆𝑝𝑟𝑒𝑎𝑑𝑡 > 𝑢𝑝𝑝𝑒𝑟𝑡ℎ𝑟𝑒𝑠ℎ𝑜𝑙𝑑 Buy 𝑋𝑡, Sell  𝑌𝑡
         # If 𝑆𝑝𝑟𝑒𝑎𝑑𝑡 < 𝑙𝑜𝑤𝑒𝑟𝑡ℎ𝑟𝑒𝑠ℎ𝑜𝑙𝑑 Buy 𝑌𝑡, Sell  𝑋𝑡
 
-        lower_threshold = -2
-        upper_threshold = 3
+        lower_threshold = self.LOWER_THRESHOLD
+        upper_threshold = self.UPPER_THRESHOLD
 
         if spread > upper_threshold:
             self.logger.info(f"{ticker} SELL SELL SELL!")
@@ -114,3 +194,5 @@ class Pairs(Trader):
             self.logger.debug(f"{ticker} BUY BUY BUY!")
 
             return True
+
+        return False
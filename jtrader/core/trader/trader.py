@@ -6,19 +6,23 @@ from logging import getLogger
 
 import pandas as pd
 
-from jtrader.core.indicator import __INDICATOR_MAP__
-from jtrader.core.indicator.chain import Chain
+from jtrader.core.candle_buffer import CandleBuffer
+from jtrader.core.indicator import Chaikin, LinearRegression
 from jtrader.core.indicator.indicator import Indicator
+from jtrader.core.indicator.streaming import get_streaming_indicators
 from jtrader.core.provider import Provider
 
 
 class Trader(ABC):
     KLINE_COLUMNS = ['date', 'open', 'close', 'high', 'low', 'volume', 'amount']
+    # indicators without a constant time form, still evaluated over the whole frame
+    BATCH_INDICATORS = [Chaikin, LinearRegression]
 
     def __init__(self, provider: Provider, ticker: str):
         self.provider = provider
         self.ticker = ticker
-        self.frames: pd.Dataframe | None = None
+        self.frames = CandleBuffer(self.KLINE_COLUMNS)
+        self.streams = get_streaming_indicators()
         self.logger = getLogger()
 
     def start_trader(self):
@@ -28,10 +32,11 @@ class Trader(ABC):
         start = date - timedelta(days=1)
         previous = self.provider.chart(self.ticker, start, None)
 
-        self.frames = pd.concat(
-            [pd.DataFrame(previous, columns=self.KLINE_COLUMNS)],
-            ignore_index=True
-        )
+        self.frames.extend(pd.DataFrame(previous, columns=self.KLINE_COLUMNS).astype(float).sort_values(by=['date']))
+
+        # the latest candle is still open, the streams pick it up once it closes
+        for candle in self.frames.to_frame().iloc[:-1].to_dict('records'):
+            self.update_streams(candle)
 
         self.provider.connect_websocket(self.ticker, self._on_websocket_message)
 
@@ -39,14 +44,39 @@ class Trader(ABC):
     async def _on_websocket_message(self, ws, message) -> None:
         raise NotImplemented
 
-    def _execute_chain_validation(self):
-        chain = Chain(self.ticker, __INDICATOR_MAP__['all'])
+    def update_streams(self, candle: dict) -> None:
+        for stream in self.streams.values():
+            stream.update(candle)
+
+    def add_candle(self, candle: dict) -> None:
+        """
+        Stores a candle update. A new start time closes the previous candle, which advances the streams, otherwise the
+        current candle is updated in place.
+        """
+        last = self.frames.last()
+
+        if last is not None and float(candle['date']) == last['date']:
+            self.frames.update_last(candle)
 
-        for validator in chain.get_validation_chain(True):
-            is_valid = validator.is_valid(self.frames)
+            return
+
+        if last is not None:
+            self.update_streams(last)
+
+        self.frames.append(candle)
+
+    def _execute_chain_validation(self):
+        # the batch indicators read the first rows as the latest bars
+        frame = self.frames.to_frame(newest_first=True)
+        signals = [(validator.get_name(), validator.signal()) for validator in self.streams.values()]
+        signals += [
+            (validator.get_name(), validator(self.ticker).is_valid(frame.copy()))
+            for validator in self.BATCH_INDICATORS
+        ]
 
+        for name, is_valid in signals:
             if is_valid is not None:
                 if is_valid == Indicator.BULLISH:
-                    self.logger.info(validator.get_name() + ': BULLISH')
+                    self.logger.info(name + ': BULLISH')
                 elif is_valid == Indicator.BEARISH:
-                    self.logger.warning(validator.get_name() + ': BEARISH')
+                    self.logger.warning(name + ': BEARISH')
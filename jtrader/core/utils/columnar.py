@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarBuilder:
+    """
+    Builds a float frame, one row per symbol, straight from IEX batch JSON.
+
+    Every `{endpoint}.{field}` column is a NumPy array preallocated for `capacity` rows and filled in place, so adding
+    a symbol allocates nothing beyond its symbol string and the frame is assembled once by `build`.
+    """
+
+    def __init__(self, fields: Dict[str, List[str]], capacity: int):
+        self.fields = fields
+        self.capacity = capacity
+        self.symbols = np.empty(capacity, dtype=object)
+        self.values = {
+            endpoint: np.full((len(endpoint_fields), capacity), np.nan) for endpoint, endpoint_fields in fields.items()
+        }
+        self.size = 0
+
+    @staticmethod
+    def get_column(endpoint: str, field: str) -> str:
+        return f"{endpoint}.{field}"
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.get_column(endpoint, field) for endpoint, fields in self.fields.items() for field in fields]
+
+    @staticmethod
+    def to_float(value) -> float:
+        if value is None or isinstance(value, (str, bool)):
+            return np.nan
+
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    def add(self, symbol: str, data: dict) -> None:
+        if self.size == self.capacity:
+            self.grow()
+
+        row = self.size
+        self.symbols[row] = symbol
+
+        for endpoint, fields in self.fields.items():
+            endpoint_data = data.get(endpoint)
+
+            if not endpoint_data:
+                continue
+
+            values = self.values[endpoint]
+            for i, field in enumerate(fields):
+                values[i, row] = self.to_float(endpoint_data.get(field))
+
+        self.size += 1
+
+    def add_batch(self, data: Dict[str, dict]) -> None:
+        for symbol, symbol_data in data.items():
+            self.add(symbol, symbol_data)
+
+    def grow(self) -> None:
+        self.capacity = max(self.capacity * 2, 1)
+        self.symbols = np.resize(self.symbols, self.capacity)
+
+        for endpoint, values in self.values.items():
+            grown = np.full((values.shape[0], self.capacity), np.nan)
+            grown[:, :values.shape[1]] = values
+            self.values[endpoint] = grown
+
+    def build(self, index_name: str = 'symbol') -> pd.DataFrame:
+        columns = {}
+        for endpoint, fields in self.fields.items():
+            for i, field in enumerate(fields):
+                columns[self.get_column(endpoint, field)] = self.values[endpoint][i, :self.size]
+
+        return pd.DataFrame(columns, index=pd.Index(self.symbols[:self.size], name=index_name))
@@ -11,3 +11,23 @@ def timeframe_to_days(timeframe, as_stock_frame: bool = False) -> int:
         return int(year) * 252 if as_stock_frame else int(year) * 365
 
     raise ValueError
+
+
+def days_to_timeframe(days: int) -> str:
+    """
+    Smallest chart range that covers the given number of days
+    """
+    if days <= 1:
+        return '1d'
+    elif days <= 5:
+        return '5d'
+    elif days <= 30:
+        return '1m'
+    elif days <= 90:
+        return '3m'
+    elif days <= 180:
+        return '6m'
+    elif days <= 365:
+        return '1y'
+
+    return 'max'
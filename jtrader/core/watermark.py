@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict
+
+WATERMARK_FILE = 'data/watermarks.sqlite'
+
+
+class WatermarkIndex:
+    """
+    Persistent per-ticker index of the last ingested bar date, so the `Worker` can tell which tickers are already up
+    to date with a single local read instead of one DynamoDB query per ticker.
+    """
+
+    def __init__(self, path: str = WATERMARK_FILE):
+        Path(path).parent.mkdir(exist_ok=True, parents=True)
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS watermarks ('
+            'ticker TEXT PRIMARY KEY, '
+            'last_date TEXT NOT NULL, '
+            'updated TEXT NOT NULL'
+            ')'
+        )
+        self.connection.commit()
+
+    def load(self) -> Dict[str, datetime]:
+        with self.lock:
+            rows = self.connection.execute('SELECT ticker, last_date FROM watermarks').fetchall()
+
+        return {ticker: datetime.strptime(last_date, '%Y-%m-%d') for ticker, last_date in rows}
+
+    def update(self, ticker: str, last_date: date) -> None:
+        with self.lock:
+            self.connection.execute(
+                'INSERT INTO watermarks (ticker, last_date, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(ticker) DO UPDATE SET '
+                'last_date = MAX(last_date, excluded.last_date), updated = excluded.updated',
+                (ticker, last_date.strftime('%Y-%m-%d'), datetime.now().isoformat())
+            )
+            self.connection.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
@@ -1,82 +1,118 @@
-import pandas as pd
+import numpy as np
 from cement.core.log import LogInterface
-from cement.utils.shell import spawn_thread
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
 from pyEX import PyEXception
-from threading import Thread
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-from jtrader import chunk_threaded
+from jtrader import chunks
+from jtrader.core.bar_store import BarStore
 from jtrader.core.odm import ODM
+from jtrader.core.orchestrator import Orchestrator
 from jtrader.core.provider import Provider
-from jtrader.core.utils.stock import timeframe_to_days
+from jtrader.core.utils.stock import days_to_timeframe
+from jtrader.core.watermark import WatermarkIndex
 
 
 class Worker:
-    def __init__(self, provider: Provider, logger: LogInterface):
+    def __init__(
+            self,
+            provider: Provider,
+            logger: LogInterface,
+            concurrency: Optional[int] = 8,
+            rate_limit: Optional[float] = 100
+    ):
         self.provider = provider
         self.logger = logger
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
         self.odm = ODM()
+        self.bar_store = BarStore(odm=self.odm)
+        self.watermarks = WatermarkIndex()
 
     def run(self):
-        i = 1
-        threads: List[Thread] = []
-        for chunk in chunk_threaded(self.provider.symbols(), False, 5):
-            thread_name = f"Thread-{i}"
-            """ @thread """
-            thread = spawn_thread(self.insert_stocks, True, False, args=(thread_name, chunk), daemon=True)
-            threads.append(thread)
-            i += 1
-
-        while len(threads) > 0:
-            for thread in threads:
-                if not thread.is_alive():
-                    threads.remove(thread)
-                thread.join(1)
-
-    def insert_stocks(self, thread_id: str, chunk: pd.DataFrame):
+        watermarks = self.watermarks.load()
+
+        with Orchestrator(self.concurrency, self.rate_limit) as orchestrator:
+            batches = self.plan_batches(orchestrator, self.provider.enabled_symbols().tolist(), watermarks)
+
+            self.logger.info(f"Ingesting {len(batches)} batches...")
+
+            orchestrator.run(batches, self.insert_stocks)
+
+    def plan_batches(
+            self,
+            orchestrator: Orchestrator,
+            stock_symbols: List[str],
+            watermarks: Dict[str, datetime]
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        Groups every enabled ticker that is behind by the chart timeframe it needs, split into provider batch sized
+        requests.
+        """
         today = datetime.today()
 
-        for stock in chunk:
-            if stock['isEnabled'] is False:
+        # first run for these tickers, seed the index from the table
+        unseeded = [stock_symbol for stock_symbol in stock_symbols if stock_symbol not in watermarks]
+        for stock_symbol, last_day in zip(unseeded, orchestrator.run(unseeded, self.seed_watermark, rate_limited=False)):
+            if last_day is not None:
+                watermarks[stock_symbol] = last_day
+
+        timeframes: Dict[str, List[str]] = {}
+        for stock_symbol in stock_symbols:
+            last_day = watermarks.get(stock_symbol)
+            if last_day is None:
                 continue
 
-            stock_symbol = stock['symbol']
+            if np.busday_count(last_day.date(), today.date()) <= 0:
+                continue
 
-            self.logger.info(f"{thread_id} - Processing ticker {stock_symbol}...")
+            timeframe = days_to_timeframe((today - last_day).days)
+            timeframes.setdefault(timeframe, []).append(stock_symbol)
 
-            last_day = self.odm.get_last_stock_day(stock_symbol)
-            diff = today - last_day
-            days = diff.days
+        batches = []
+        for timeframe, timeframe_symbols in timeframes.items():
+            for batch_symbols in chunks(timeframe_symbols, self.provider.BATCH_SIZE):
+                batches.append((timeframe, batch_symbols))
 
-            if days == 0:
-                continue
+        return batches
 
-            if days == 1:
-                timeframe = '1d'
-            elif days <= 5:
-                timeframe = '5d'
-            elif days <= 30:
-                timeframe = '1m'
-            elif days <= 90:
-                timeframe = '3m'
-            elif days <= 180:
-                timeframe = '6m'
-            elif days <= 365:
-                timeframe = '1y'
-            else:
-                timeframe = 'max'
-
-            try:
-                provider_entries = self.provider.chart(stock_symbol, None, None, timeframe)
-            except PyEXception:
-                self.logger.warning(f"Failed retrieving provider data for {stock_symbol}...")
+    def seed_watermark(self, stock_symbol: str) -> datetime:
+        last_day = self.odm.get_last_stock_day(stock_symbol)
+        self.watermarks.update(stock_symbol, last_day)
 
-                continue
+        return last_day
+
+    def insert_stocks(self, batch: Tuple[str, List[str]]) -> bool:
+        timeframe, batch_symbols = batch
 
-            with self.odm.stock_table.batch_writer(overwrite_by_pkeys=['ticker', 'date']) as batch:
-                for result in provider_entries:
-                    self.odm.put_stock(batch, stock_symbol, result)
+        self.logger.info(f"Processing {len(batch_symbols)} tickers ({timeframe})...")
+
+        try:
+            charts = self.provider.batch_chart(batch_symbols, timeframe)
+        except PyEXception:
+            self.logger.warning(f"Failed retrieving provider data for {','.join(batch_symbols)}...")
+
+            return False
+
+        for stock_symbol, provider_entries in charts.items():
+            self.store_stock(stock_symbol, provider_entries)
 
         return True
+
+    def store_stock(self, stock_symbol: str, provider_entries: list) -> None:
+        if len(provider_entries) == 0:
+            return
+
+        if not self.bar_store.has_ticker(stock_symbol):
+            self.bar_store.backfill(stock_symbol)
+
+        with self.odm.stock_table.batch_writer(overwrite_by_pkeys=['ticker', 'date']) as batch:
+            for result in provider_entries:
+                self.odm.put_stock(batch, stock_symbol, result)
+
+        self.bar_store.write(stock_symbol, provider_entries)
+
+        self.watermarks.update(
+            stock_symbol,
+            max(datetime.strptime(entry['date'], '%Y-%m-%d') for entry in provider_entries)
+        )
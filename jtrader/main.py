@@ -5,6 +5,11 @@ from .controllers.base import Base
 from .core.exc import JTraderError
 
 CONFIG = init_defaults('jtrader')
+CONFIG['jtrader']['concurrency'] = 8
+CONFIG['jtrader']['rate_limit'] = 100
+CONFIG['jtrader']['process_workers'] = None
+CONFIG['jtrader']['feature_cache_folder'] = None
+CONFIG['jtrader']['universe_ttl'] = 900
 
 
 class JTrader(App):
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import talib
+
+from jtrader.core.indicator.adx import ADX
+from jtrader.core.indicator.cache import FeatureCache
+from jtrader.core.indicator.indicator import Indicator
+
+
+def get_bars(days: int = 120) -> pd.DataFrame:
+    close = 100 + np.cumsum(np.sin(np.arange(days) / 3))
+
+    return pd.DataFrame(
+        {
+            'date': pd.date_range('2021-01-01', periods=days, tz='UTC'),
+            'high': close + 1,
+            'low': close - 1,
+            'close': close,
+        }
+    )
+
+
+def test_compute_reuses_cached_series(monkeypatch):
+    monkeypatch.setattr(Indicator, 'feature_cache', FeatureCache())
+    bars = get_bars()
+
+    adx = ADX('fooBar').compute(bars, 'ADX', ['high', 'low', 'close'], timeperiod=10)
+    again = ADX('fooBar').compute(bars, 'ADX', ['high', 'low', 'close'], timeperiod=10)
+
+    expected = talib.ADX(bars['high'], bars['low'], bars['close'], timeperiod=10)
+    pd.testing.assert_series_equal(adx, expected)
+    pd.testing.assert_series_equal(again, expected)
+    assert ADX.feature_cache.hits == 1
+    assert ADX.feature_cache.misses == 1
+
+    # a new bar, different parameters or another ticker are all new entries
+    ADX('fooBar').compute(get_bars(121), 'ADX', ['high', 'low', 'close'], timeperiod=10)
+    ADX('fooBar').compute(bars, 'ADX', ['high', 'low', 'close'], timeperiod=14)
+    ADX('barFoo').compute(bars, 'ADX', ['high', 'low', 'close'], timeperiod=10)
+    assert ADX.feature_cache.misses == 4
+
+
+def test_evicted_entries_spill_to_disk(tmp):
+    cache = FeatureCache(max_entries=1, spill_folder=tmp.dir)
+
+    cache.put('first', np.arange(3, dtype=float))
+    cache.put('second', np.arange(4, dtype=float))
+
+    assert list(cache.entries) == ['second']
+    np.testing.assert_array_equal(cache.get('first'), np.arange(3, dtype=float))
+    assert cache.get('missing') is None
+
+
+def test_key_changes_with_current_bar_values():
+    bars = get_bars()
+    # intraday frames carry the same day in every row
+    bars['date'] = '2021-01-04'
+    updated = bars.copy()
+    updated.loc[updated.index[-1], 'high'] += 1
+
+    columns = ['high', 'low', 'close']
+
+    assert FeatureCache.get_key('fooBar', bars, 'ADX', {}, columns) == \
+        FeatureCache.get_key('fooBar', bars.copy(), 'ADX', {}, columns)
+    assert FeatureCache.get_key('fooBar', bars, 'ADX', {}, columns) != \
+        FeatureCache.get_key('fooBar', updated, 'ADX', {}, columns)
+    assert FeatureCache.get_key('fooBar', bars, 'ADX', {}) != FeatureCache.get_key('fooBar', updated, 'ADX', {})
+    assert FeatureCache.get_key('fooBar', bars, 'ADX', {}, ['close']) == \
+        FeatureCache.get_key('fooBar', updated, 'ADX', {}, ['close'])
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from jtrader.core.indicator.features import TECHNICAL_FEATURES, compute_technical
+
+
+def get_bars(days: int = 120) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    close = 100 + rng.normal(size=days).cumsum()
+
+    return pd.DataFrame(
+        {
+            'date': pd.date_range('2022-01-03', periods=days, freq='B', tz='UTC'),
+            'open': close + rng.normal(size=days) * .1,
+            'high': close + 1,
+            'low': close - 1,
+            'close': close,
+            'volume': rng.integers(1_000, 10_000, size=days).astype(float),
+        }
+    )
+
+
+@pytest.mark.parametrize('indicator_name', TECHNICAL_FEATURES.keys())
+def test_compute_technical_matches_iex_layout(indicator_name):
+    technical = compute_technical(get_bars(), indicator_name)
+
+    assert technical.index.name == 'date'
+    assert technical.index.tz is None
+    assert list(technical.columns[:5]) == ['open', 'high', 'low', 'close', 'volume']
+
+    # the trainer takes the indicator outputs from the column named after it onward
+    indicator_data = technical.iloc[:, technical.columns.get_loc(indicator_name):]
+    assert indicator_data.columns[0] == indicator_name
+    assert not indicator_data.iloc[-1].isnull().any()
+
+
+def test_macd_outputs_use_iex_names():
+    technical = compute_technical(get_bars(), 'macd')
+
+    assert list(technical.columns[5:]) == ['macd', 'macd_signal', 'macd_histogram']
+
+
+def test_vwma_is_volume_weighted_close():
+    bars = get_bars()
+    technical = compute_technical(bars, 'vwma')
+
+    expected = (bars['close'] * bars['volume']).rolling(20).sum() / bars['volume'].rolling(20).sum()
+
+    np.testing.assert_allclose(technical['vwma'].to_numpy(), expected.to_numpy(), equal_nan=True)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+
+from jtrader.core.indicator.adx import ADX
+from jtrader.core.indicator.apo import APO
+from jtrader.core.indicator.indicator import Indicator
+from jtrader.core.indicator.macd import MACD
+from jtrader.core.indicator.rsi import RSI
+from jtrader.core.indicator.streaming import (
+    StreamingADX,
+    StreamingAPO,
+    StreamingMACD,
+    StreamingOBV,
+    StreamingRSI,
+    StreamingStochRSI,
+    StreamingULTOSC,
+    StreamingVWAP
+)
+
+
+def get_bars(days: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, days))
+
+    return pd.DataFrame(
+        {
+            'high': close + rng.random(days),
+            'low': close - rng.random(days),
+            'close': close,
+            'volume': rng.integers(100, 1000, days).astype(float),
+        }
+    )
+
+
+def stream(indicator, bars: pd.DataFrame) -> np.ndarray:
+    return np.array([indicator.update(candle) for candle in bars.to_dict('records')], dtype=float)
+
+
+@pytest.mark.parametrize(
+    'indicator,expected',
+    [
+        (StreamingRSI(), lambda bars: talib.RSI(bars['close'], timeperiod=10)),
+        (StreamingStochRSI(), lambda bars: talib.STOCHRSI(bars['close'], timeperiod=10)[1]),
+        (StreamingOBV(), lambda bars: talib.OBV(bars['close'], bars['volume'])),
+        (StreamingAPO(), lambda bars: talib.APO(bars['close'], fastperiod=14, slowperiod=28)),
+        (StreamingADX(), lambda bars: talib.ADX(bars['high'], bars['low'], bars['close'], timeperiod=10)),
+        (
+            StreamingULTOSC(),
+            lambda bars: talib.ULTOSC(bars['high'], bars['low'], bars['close'], 10, 20, 30)
+        ),
+    ]
+)
+def test_update_matches_talib(indicator, expected):
+    bars = get_bars()
+
+    np.testing.assert_allclose(stream(indicator, bars), expected(bars), atol=1e-8, equal_nan=True)
+
+
+def test_macd_matches_talib():
+    bars = get_bars()
+    streaming = StreamingMACD()
+
+    values = [streaming.update(candle) or (np.nan, np.nan, np.nan) for candle in bars.to_dict('records')]
+    expected = talib.MACD(bars['close'], fastperiod=14, slowperiod=28, signalperiod=10)
+
+    for output in range(3):
+        np.testing.assert_allclose([value[output] for value in values], expected[output], equal_nan=True)
+
+
+def test_vwap_matches_rolling_window():
+    bars = get_bars()
+    typical_price = (bars['high'] + bars['low'] + bars['close']) / 3
+    expected = (typical_price * bars['volume']).rolling(14).sum() / bars['volume'].rolling(14).sum()
+
+    np.testing.assert_allclose(stream(StreamingVWAP(), bars), expected, equal_nan=True)
+
+
+def test_vwap_signals_outside_regression_band():
+    bars = get_bars()
+    streaming = StreamingVWAP()
+
+    signals = []
+    for candle in bars.to_dict('records'):
+        streaming.update(candle)
+        signals.append(streaming.signal())
+
+    vwap = stream(StreamingVWAP(), bars)
+    regression = talib.LINEARREG(vwap, timeperiod=40)
+    standard = talib.STDDEV(vwap, timeperiod=40)
+
+    expected = [
+        Indicator.BEARISH if value > upper else Indicator.BULLISH if value < lower else None
+        for value, upper, lower in zip(vwap, regression + standard, regression - standard)
+    ]
+
+    assert signals == expected
+    assert Indicator.BULLISH in signals and Indicator.BEARISH in signals
+
+
+@pytest.mark.parametrize(
+    'indicator,streaming',
+    [(RSI, StreamingStochRSI), (MACD, StreamingMACD), (ADX, StreamingADX), (APO, StreamingAPO)]
+)
+def test_signal_matches_batch_indicator(indicator, streaming):
+    bars = get_bars()
+    streaming = streaming()
+
+    signals = []
+    for candle in bars.to_dict('records'):
+        streaming.update(candle)
+        signal = streaming.signal()
+        signals.append(
+            Indicator.SIGNAL_BULLISH if signal == Indicator.BULLISH else
+            Indicator.SIGNAL_BEARISH if signal == Indicator.BEARISH else
+            Indicator.SIGNAL_NONE
+        )
+
+    np.testing.assert_array_equal(signals, indicator('fooBar').get_signals(bars))
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sagemaker')
+
+from jtrader.core.machine_learning.local.tuner import ProphetTuner  # noqa: E402
+
+
+def get_data(days: int = 240) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+
+    return pd.DataFrame(
+        {
+            'ds': pd.date_range('2021-01-01', periods=days, freq='D'),
+            'y': np.linspace(10, 30, days) + rng.normal(scale=.5, size=days),
+        }
+    )
+
+
+def test_get_fold_indices_spread_over_history():
+    assert ProphetTuner.get_fold_indices(10, 3) == [0, 4, 9]
+    assert ProphetTuner.get_fold_indices(10, 30) == list(range(10))
+
+
+def test_run_prunes_to_the_best_candidate():
+    tuner = ProphetTuner(
+        get_data(),
+        param_grid={
+            'changepoint_prior_scale': [0.001, 0.5],
+            'seasonality_mode': ['additive'],
+            'yearly_seasonality': [False],
+        },
+        horizon='10 days',
+        min_folds=1,
+        eta=2,
+        max_workers=2
+    )
+
+    best_params, model, rmses = tuner.run()
+
+    assert best_params in tuner.candidates
+    assert best_params == tuner.candidates[min(rmses, key=rmses.get)]
+    assert len(model.history) == 240
@@ -0,0 +1,71 @@
+import math
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from jtrader.core.bar_store import BarStore
+from jtrader.core.pairs.index import PairsIndex, engle_granger
+
+
+class FakeODM:
+    def get_historical_stock_ranges(self, tickers, start, projection=None):
+        return {ticker: [] for ticker in tickers}
+
+
+def get_bars(dates: pd.DatetimeIndex, closes: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({
+        'date': dates,
+        'open': closes,
+        'high': closes,
+        'low': closes,
+        'close': closes,
+        'volume': np.full(len(closes), 1000.0),
+    })
+
+
+def get_spread(rng: np.random.Generator, length: int, reversion: float) -> np.ndarray:
+    spread = np.zeros(length)
+    for i in range(1, length):
+        spread[i] = reversion * spread[i - 1] + rng.normal(0, .01)
+
+    return spread
+
+
+def test_engle_granger_finds_mean_reverting_spread():
+    rng = np.random.default_rng(0)
+    x = np.cumsum(rng.normal(0, .02, 1000)) + 4
+    cointegrated = .5 + 1.5 * x + get_spread(rng, 1000, .8)
+    independent = np.cumsum(rng.normal(0, .02, 1000)) + 4
+
+    statistics = engle_granger(np.column_stack([x, x]), np.column_stack([cointegrated, independent]))
+
+    assert np.isclose(statistics['beta'][0], 1.5, atol=.01)
+    assert np.isclose(statistics['alpha'][0], .5, atol=.05)
+    assert np.isclose(statistics['half_life'][0], -math.log(2) / math.log(.8), rtol=.2)
+    assert statistics['adf_stat'][0] < -10
+    assert statistics['adf_stat'][1] > -3.34
+
+
+def test_build_indexes_cointegrated_pairs_within_sectors(tmp):
+    store = BarStore(tmp.dir, FakeODM())
+    dates = pd.date_range('2021-01-04', periods=300, freq='B', tz='UTC')
+    rng = np.random.default_rng(1)
+
+    base = np.cumsum(rng.normal(0, .02, 300)) + 4
+    store.write('AAA', get_bars(dates, np.exp(base)))
+    store.write('BBB', get_bars(dates, np.exp(.2 + 1.2 * base + get_spread(rng, 300, .7))))
+    store.write('CCC', get_bars(dates, np.exp(.1 + .8 * base + get_spread(rng, 300, .7))))
+    store.write('DDD', get_bars(dates, np.exp(np.cumsum(rng.normal(0, .02, 300)) + 3)))
+
+    index = PairsIndex(store, folder=f"{tmp.dir}/pairs", window=250, block_size=2, max_workers=2)
+    built = index.build(['AAA', 'BBB', 'CCC', 'DDD'], date(2021, 1, 1), {'AAA': 'tech', 'BBB': 'tech', 'CCC': 'oil'})
+
+    assert set(zip(built['ticker'], built['pair'])) == {('AAA', 'BBB'), ('BBB', 'AAA')}
+    assert (built['sector'] == 'tech').all()
+
+    candidates = PairsIndex(store, folder=f"{tmp.dir}/pairs").get_candidates('AAA')
+
+    assert candidates.index.tolist() == ['BBB']
+    assert np.isclose(candidates.loc['BBB', 'beta'], 1.2, atol=.05)
+    assert candidates.loc['BBB', 'half_life'] < 10
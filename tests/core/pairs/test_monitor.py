@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from jtrader.core.pairs.monitor import SpreadMonitor
+
+
+def get_prices(length: int = 200, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.normal(0, .02, length)) + 4
+    y = .2 + 1.2 * x + rng.normal(0, .005, length)
+
+    return np.exp(x), np.exp(y)
+
+
+def test_update_matches_exponentially_weighted_moments():
+    x, y = get_prices()
+    monitor = SpreadMonitor(period=20)
+    monitor.add_pairs([('X', 'Y'), ('Y', 'X')])
+
+    for close_x, close_y in zip(x, y):
+        monitor.update({'X': close_x, 'Y': close_y})
+
+    log_x = pd.Series(np.log(x)).ewm(alpha=monitor.alpha, adjust=False)
+    log_y = pd.Series(np.log(y))
+
+    assert np.isclose(monitor.mean_x[0], log_x.mean().iloc[-1])
+    assert np.isclose(monitor.var_x[0], log_x.var(bias=True).iloc[-1])
+    assert np.isclose(monitor.cov[0], log_x.cov(log_y, bias=True).iloc[-1])
+    assert np.isclose(monitor.mean_x[1], monitor.mean_y[0])
+    assert np.isclose(monitor.cov[0] / monitor.var_x[0], 1.2, atol=.1)
+
+
+def test_update_emits_threshold_crossings():
+    x, y = get_prices()
+    monitor = SpreadMonitor(period=20)
+    monitor.add_pairs([('X', 'Y'), ('X', 'Z')])
+
+    crossings = [monitor.update({'X': close_x, 'Y': close_y}) for close_x, close_y in zip(x, y)]
+
+    # Z never trades, the pair is not priced
+    assert monitor.count.tolist() == [len(x), 0]
+
+    rich = monitor.update({'X': x[-1], 'Y': y[-1] * 1.2})
+    still_rich = monitor.update({'X': x[-1], 'Y': y[-1] * 1.2})
+    cheap = monitor.update({'X': x[-1], 'Y': y[-1] * .8})
+    reverted = monitor.update({'X': x[-1], 'Y': y[-1]})
+
+    assert all(crossing.empty for crossing in crossings[:20])
+    assert rich[['ticker', 'pair', 'signal']].values.tolist() == [['X', 'Y', SpreadMonitor.SIGNAL_BEARISH]]
+    assert rich['zscore'].iloc[0] > 3
+    assert still_rich.empty
+    assert cheap['signal'].tolist() == [SpreadMonitor.SIGNAL_BULLISH]
+    assert reverted['signal'].tolist() == [SpreadMonitor.SIGNAL_REVERTED]
+
+
+def test_update_ignores_unknown_tickers():
+    monitor = SpreadMonitor()
+    monitor.add_pairs([('X', 'Y')])
+
+    assert monitor.update({'Q': 1.0}).empty
+    assert list(monitor.update({'X': 1.0}).columns) == SpreadMonitor.CROSSING_COLUMNS
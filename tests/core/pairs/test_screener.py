@@ -0,0 +1,73 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from jtrader.core.bar_store import BarStore
+from jtrader.core.pairs.screener import PairsScreener, align_closes, regress
+
+
+class FakeODM:
+    def get_historical_stock_ranges(self, tickers, start, projection=None):
+        return {ticker: [] for ticker in tickers}
+
+
+def get_bars(dates: pd.DatetimeIndex, closes: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({
+        'date': dates,
+        'open': closes,
+        'high': closes,
+        'low': closes,
+        'close': closes,
+        'volume': np.full(len(closes), 1000.0),
+    })
+
+
+def test_regress_matches_per_pair_fit():
+    rng = np.random.default_rng(0)
+    x = np.cumsum(rng.normal(0, .01, 60)) + 4
+    y = np.column_stack([1.5 * x + rng.normal(0, .01, 60), rng.normal(3, .1, 60), .5 * x])
+
+    statistics = regress(x, y)
+
+    for column in range(y.shape[1]):
+        beta, alpha = np.polyfit(x, y[:, column], 1)
+        correlation = np.corrcoef(x, y[:, column])[0, 1]
+        residuals = y[:, column] - (alpha + beta * x)
+
+        assert np.isclose(statistics['beta'][column], beta)
+        assert np.isclose(statistics['alpha'][column], alpha)
+        assert np.isclose(statistics['correlation'][column], correlation)
+        assert np.isclose(statistics['r2'][column], correlation ** 2)
+        assert np.isclose(statistics['spread'][column], residuals[-1], atol=1e-12)
+
+    assert statistics['r2'][0] > .9
+    assert statistics['r2'][1] < .5
+
+
+def test_align_closes_leaves_missing_days_empty():
+    calendar = pd.date_range('2021-01-04', periods=4).to_numpy()
+    frame = pd.DataFrame({'date': calendar[[0, 2]], 'close': [1.0, 3.0]})
+
+    closes = align_closes(calendar, [frame, pd.DataFrame(columns=['date', 'close'])])
+
+    assert np.array_equal(closes[:, 0], [1.0, np.nan, 3.0, np.nan], equal_nan=True)
+    assert np.isnan(closes[:, 1]).all()
+
+
+def test_run_screens_universe_against_comparison(tmp):
+    store = BarStore(tmp.dir, FakeODM())
+    dates = pd.date_range('2021-01-04', periods=80, freq='B', tz='UTC')
+    rng = np.random.default_rng(1)
+
+    comparison = np.exp(np.cumsum(rng.normal(0, .02, 80)) + 4)
+    store.write('SPY', get_bars(dates, comparison))
+    store.write('PAIR', get_bars(dates, 2 * comparison ** 1.2))
+    store.write('NOISE', get_bars(dates, np.exp(rng.normal(3, .1, 80))))
+    store.write('SHORT', get_bars(dates[-30:], comparison[-30:]))
+
+    screen = PairsScreener(store, window=60).run('SPY', ['SPY', 'PAIR', 'NOISE', 'SHORT'], date(2021, 1, 1))
+
+    assert screen.index.tolist() == ['PAIR', 'NOISE']
+    assert np.isclose(screen.loc['PAIR', 'beta'], 1.2)
+    assert np.isclose(screen.loc['PAIR', 'r2'], 1.0)
@@ -0,0 +1,59 @@
+from logging import getLogger
+
+import pytest
+
+pyEX = pytest.importorskip('pyEX')
+
+from jtrader.core.provider import IEX  # noqa: E402
+
+
+class FlakyStocks:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def batch(self, symbols, fields, **kwargs):
+        self.calls += 1
+
+        if self.calls <= self.failures:
+            raise pyEX.PyEXception('Too many requests')
+
+        return {symbol: {'quote': {'close': 1.0}} for symbol in symbols}
+
+
+class FakeClient:
+    def __init__(self, failures: int = 0):
+        self.stocks = FlakyStocks(failures)
+
+
+def get_provider(monkeypatch, failures: int = 0) -> IEX:
+    monkeypatch.setattr(IEX, 'BATCH_SIZE', 2)
+    monkeypatch.setattr(IEX, 'BATCH_BACKOFF', 0)
+
+    provider = IEX.__new__(IEX)
+    provider.client_prop = FakeClient(failures)
+    provider.logger = getLogger()
+
+    return provider
+
+
+def test_batch_retries_on_pyexception(monkeypatch):
+    provider = get_provider(monkeypatch, failures=2)
+
+    assert provider.batch(['AAPL'], ['quote']) == {'AAPL': {'quote': {'close': 1.0}}}
+    assert provider.client.stocks.calls == 3
+
+
+def test_batch_iter_yields_every_batch(monkeypatch):
+    provider = get_provider(monkeypatch)
+
+    batches = list(provider.batch_iter(['AAPL', 'MSFT', 'TSLA', 'AMD', 'IBM'], ['quote'], max_workers=3))
+
+    assert len(batches) == 3
+    assert sorted(symbol for batch in batches for symbol in batch) == ['AAPL', 'AMD', 'IBM', 'MSFT', 'TSLA']
+
+
+def test_batch_iter_skips_batches_that_keep_failing(monkeypatch):
+    provider = get_provider(monkeypatch, failures=100)
+
+    assert list(provider.batch_iter(['AAPL', 'MSFT'], ['quote'])) == []
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from jtrader.core.provider.refdata import SymbolCache
+
+
+class FakeRefData:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+
+        return [
+            {'symbol': 'AAPL', 'isEnabled': True},
+            {'symbol': 'ZZZZ', 'isEnabled': False},
+            {'symbol': 'MSFT', 'isEnabled': True},
+        ]
+
+
+def test_get_trading_day_rolls_weekends_back():
+    assert SymbolCache.get_trading_day(datetime(2022, 1, 7, 15)) == '2022-01-07'
+    assert SymbolCache.get_trading_day(datetime(2022, 1, 9, 15)) == '2022-01-07'
+
+
+def test_enabled_symbols_fetched_once_per_trading_day(tmp, monkeypatch):
+    fetch = FakeRefData()
+
+    assert SymbolCache('iex', fetch, folder=tmp.dir).enabled_symbols().tolist() == ['AAPL', 'MSFT']
+    assert fetch.calls == 1
+
+    # a new process reads the cached copy
+    assert SymbolCache('iex', fetch, folder=tmp.dir).enabled_symbols().tolist() == ['AAPL', 'MSFT']
+    assert fetch.calls == 1
+
+    monkeypatch.setattr(SymbolCache, 'get_trading_day', staticmethod(lambda now=None: '2099-01-02'))
+    SymbolCache('iex', fetch, folder=tmp.dir).enabled_symbols()
+    assert fetch.calls == 2
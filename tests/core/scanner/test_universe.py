@@ -0,0 +1,68 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pyEX')
+
+from jtrader.core.scanner.universe import UniverseSnapshot  # noqa: E402
+
+
+class FakeStocks:
+    def __init__(self):
+        self.batches = []
+
+    def batch(self, symbols, fields):
+        self.batches.append((list(symbols), fields))
+
+        return {
+            symbol: {
+                'quote': {'close': 10.0 + i, 'peRatio': None},
+                'stats': {'month1ChangePercent': .1 * i},
+                'advanced-stats': None,
+            } for i, symbol in enumerate(symbols)
+        }
+
+
+class FakeClient:
+    def __init__(self):
+        self.stocks = FakeStocks()
+
+
+class FakeProvider:
+    BATCH_SIZE = 2
+    is_sandbox = False
+
+    def __init__(self):
+        self.client = FakeClient()
+
+    @staticmethod
+    def enabled_symbols():
+        return np.array(['AAPL', 'MSFT', 'TSLA'])
+
+    def batch_iter(self, stocks, fields, max_workers=None):
+        for i in range(0, len(stocks), self.BATCH_SIZE):
+            yield self.client.stocks.batch(stocks[i:i + self.BATCH_SIZE], fields)
+
+
+def test_load_fetches_once_within_ttl(tmp):
+    provider = FakeProvider()
+    universe = UniverseSnapshot(provider, folder=tmp.dir, ttl=60)
+
+    snapshot = universe.load()
+
+    assert list(snapshot.index) == ['AAPL', 'MSFT', 'TSLA']
+    assert snapshot.loc['MSFT', 'quote.close'] == 11.0
+    assert np.isnan(snapshot.loc['MSFT', 'quote.peRatio'])
+    assert np.isnan(snapshot.loc['MSFT', 'advanced-stats.priceToBook'])
+    assert len(provider.client.stocks.batches) == 2
+
+    UniverseSnapshot(provider, folder=tmp.dir, ttl=60).load()
+    assert len(provider.client.stocks.batches) == 2
+
+    # an expired snapshot is fetched again
+    expired = time.time() - 120
+    os.utime(universe.path, (expired, expired))
+    universe.load()
+    assert len(provider.client.stocks.batches) == 4
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jtrader.core.artifact_store import ArtifactStore, read_frame
+
+
+def get_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {'close': np.arange(5, dtype=float), 'symbol': list('abcde')},
+        index=pd.date_range('2022-01-03', periods=5, name='date')
+    )
+
+
+def test_save_frame_round_trips_through_arrow(tmp):
+    store = ArtifactStore(tmp.dir)
+
+    assert store.save_frame('AAPL_rsi_5y', get_frame()) == 1
+
+    entry = store.get_entry('AAPL_rsi_5y')
+    assert entry['format'] == 'arrow'
+    assert store.verify('AAPL_rsi_5y')
+
+    pd.testing.assert_frame_equal(store.load('AAPL_rsi_5y'), get_frame(), check_freq=False)
+    pd.testing.assert_frame_equal(
+        read_frame(os.path.join(tmp.dir, entry['file'])),
+        store.load('AAPL_rsi_5y', memory_map=False),
+    )
+
+
+def test_versions_are_kept_and_expired(tmp, monkeypatch):
+    monkeypatch.setattr(ArtifactStore, 'KEEP_VERSIONS', 2)
+    store = ArtifactStore(tmp.dir)
+
+    for close in range(3):
+        store.save_frame('prediction', get_frame().assign(close=float(close)))
+
+    assert store.get_entry('prediction')['version'] == 3
+    assert store.load('prediction')['close'].iloc[0] == 2
+    assert store.load('prediction', version=2)['close'].iloc[0] == 1
+    assert store.load('prediction', version=1) is None
+    assert not os.path.exists(os.path.join(tmp.dir, 'prediction.1.arrow'))
+
+
+def test_tampered_artifact_fails_verification(tmp):
+    store = ArtifactStore(tmp.dir)
+    store.save_object('params', {'changepoint_prior_scale': 0.1})
+
+    assert store.load('params') == {'changepoint_prior_scale': 0.1}
+
+    with open(os.path.join(tmp.dir, store.get_entry('params')['file']), 'ab') as file:
+        file.write(b'0')
+
+    assert not store.verify('params')
+
+
+def test_legacy_pickles_are_still_loaded(tmp):
+    pd.to_pickle(get_frame(), os.path.join(tmp.dir, 'UNRATE_5y.pkl'))
+
+    pd.testing.assert_frame_equal(ArtifactStore(tmp.dir).load('UNRATE_5y'), get_frame())
+    assert ArtifactStore(tmp.dir).load('missing') is None
+
+
+def test_prophet_models_are_saved_as_json(tmp):
+    prophet = pytest.importorskip('prophet')
+
+    data = pd.DataFrame({'ds': pd.date_range('2022-01-01', periods=60), 'y': np.linspace(1, 2, 60)})
+    model = prophet.Prophet(yearly_seasonality=False, weekly_seasonality=False, daily_seasonality=False)
+    model.fit(data)
+
+    store = ArtifactStore(tmp.dir)
+    store.save_model('FOO_close_5y', model)
+
+    assert store.get_entry('FOO_close_5y')['format'] == 'prophet'
+
+    future = model.make_future_dataframe(periods=5, include_history=False)
+    np.testing.assert_allclose(store.load('FOO_close_5y').predict(future)['yhat'], model.predict(future)['yhat'])
@@ -0,0 +1,55 @@
+from logging import getLogger
+
+import numpy as np
+import pandas as pd
+
+from jtrader.core.backtester import Backtester
+
+
+def get_bars(total: int = 252) -> pd.DataFrame:
+    random = np.random.default_rng(7)
+    close = 100 + np.cumsum(random.normal(0, 2, total))
+
+    return pd.DataFrame(
+        {
+            'date': pd.date_range('2021-01-01', periods=total, freq='B', tz='UTC'),
+            'open': close + random.normal(0, .5, total),
+            'high': close + 2,
+            'low': close - 2,
+            'close': close,
+            'volume': random.integers(1000, 100000, total).astype(float),
+        }
+    )
+
+
+def get_backtester(buy_indicators, sell_indicators) -> Backtester:
+    return Backtester(getLogger(), 'FOO', None, None, [buy_indicators], [sell_indicators])
+
+
+def test_run_bars_books_fills_against_equity_curve():
+    bars = get_bars()
+    results = get_backtester(['rsi', 'macd'], ['rsi']).run_bars(bars)
+
+    curve = results['equity_curve']
+    fills = results['fills']
+
+    assert len(curve) == len(bars)
+    assert len(fills) > 0
+    assert (curve['cash'] >= 0).all()
+    assert np.allclose(curve['equity'], curve['cash'] + curve['position'] * curve['close'])
+
+    bought = fills.loc[fills['side'] == 'buy', 'amount'].sum()
+    sold = fills.loc[fills['side'] == 'sell', 'amount'].sum()
+
+    assert bought - sold == curve['position'].iloc[-1]
+    assert results['final_equity'] == curve['equity'].iloc[-1]
+
+
+def test_run_bars_without_signals_keeps_capital():
+    bars = get_bars(10)
+    results = get_backtester(['rsi'], ['rsi']).run_bars(bars)
+
+    assert results['fills'].empty
+    assert results['final_equity'] == Backtester.CAPITAL_BASE
+    assert results['total_return'] == 0
+
@@ -0,0 +1,99 @@
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+
+from jtrader.core.bar_store import BarStore
+
+
+class FakeODM:
+    def __init__(self, items):
+        self.items = items
+        self.calls = 0
+
+    def get_historical_stock_range(self, ticker, start, projection=None):
+        self.calls += 1
+
+        return self.items
+
+    def get_historical_stock_ranges(self, tickers, start, projection=None):
+        return {ticker: self.get_historical_stock_range(ticker, start, projection) for ticker in tickers}
+
+
+def get_item(day: str, close: float) -> dict:
+    return {
+        'ticker': 'FOO',
+        'date': day,
+        'open': Decimal(str(close - 1)),
+        'high': Decimal(str(close + 1)),
+        'low': Decimal(str(close - 2)),
+        'close': Decimal(str(close)),
+        'volume': Decimal('1000'),
+        'uOpen': Decimal(str(close - 1)),
+    }
+
+
+def test_normalize_sorts_and_converts_items():
+    bars = BarStore.normalize([get_item('2021-01-05', 2.5), get_item('2021-01-04', 1.5)])
+
+    assert list(bars.columns) == BarStore.BAR_COLUMNS
+    assert bars['close'].tolist() == [1.5, 2.5]
+    assert bars['date'].is_monotonic_increasing
+
+
+def test_read_backfills_missing_ticker_once(tmp):
+    odm = FakeODM([get_item('2020-12-30', 1), get_item('2021-01-04', 2), get_item('2021-01-05', 3)])
+    store = BarStore(tmp.dir, odm)
+
+    bars = store.read('FOO', date(2021, 1, 1))
+    store.read('FOO', date(2020, 1, 1))
+
+    assert odm.calls == 1
+    assert bars['close'].tolist() == [2, 3]
+    assert store.get_partition_path('FOO', 2020).is_file()
+    assert store.get_partition_path('FOO', 2021).is_file()
+
+
+def test_write_merges_with_existing_partition(tmp):
+    store = BarStore(tmp.dir, FakeODM([]))
+
+    store.write('FOO', [get_item('2021-01-04', 2), get_item('2021-01-05', 3)])
+    store.write('FOO', [{'date': '2021-01-05', 'open': 3, 'high': 5, 'low': 2, 'close': 4, 'volume': 10}])
+
+    bars = store.read('FOO', date(2021, 1, 1), columns=['date', 'close'])
+
+    assert bars['close'].tolist() == [2, 4]
+    assert bars['date'].tolist() == list(pd.to_datetime(['2021-01-04', '2021-01-05'], utc=True))
+
+
+def test_read_many(tmp):
+    store = BarStore(tmp.dir, FakeODM([]))
+    store.write('FOO', [get_item('2021-01-04', 2)])
+
+    frames = store.read_many(['FOO', 'BAR'], date(2021, 1, 1))
+
+    assert len(frames['FOO']) == 1
+    assert frames['BAR'].empty
+
+
+def test_ensure_backfills_in_chunks_written_before_the_next(tmp):
+    class ChunkODM(FakeODM):
+        def __init__(self, store):
+            super().__init__([get_item('2021-01-04', 2)])
+            self.store = store
+            self.chunks = []
+
+        def get_historical_stock_ranges(self, tickers, start, projection=None):
+            self.chunks.append((list(tickers), [self.store.has_ticker(ticker) for ticker in ['A', 'B', 'C', 'D', 'E']]))
+
+            return super().get_historical_stock_ranges(tickers, start, projection)
+
+    store = BarStore(tmp.dir)
+    store.BACKFILL_CHUNK_SIZE = 2
+    store.odm_prop = ChunkODM(store)
+
+    store.ensure(['A', 'B', 'C', 'D', 'E'])
+
+    assert [tickers for tickers, _ in store.odm.chunks] == [['A', 'B'], ['C', 'D'], ['E']]
+    assert store.odm.chunks[1][1] == [True, True, False, False, False]
+    assert all(store.has_ticker(ticker) for ticker in ['A', 'B', 'C', 'D', 'E'])
@@ -0,0 +1,34 @@
+import numpy as np
+
+from jtrader.core.candle_buffer import CandleBuffer
+
+COLUMNS = ['date', 'close', 'volume']
+
+
+def get_candle(i: int) -> dict:
+    return {'date': i, 'close': 100 + i, 'volume': 10 * i}
+
+
+def test_window_is_a_contiguous_view_after_wrapping():
+    buffer = CandleBuffer(COLUMNS, capacity=4)
+
+    for i in range(10):
+        buffer.append(get_candle(i))
+
+    assert len(buffer) == 4
+    np.testing.assert_array_equal(buffer.column('date'), [6, 7, 8, 9])
+    np.testing.assert_array_equal(buffer.column('close', 2), [108, 109])
+
+    window = buffer.window()
+    assert window.base is buffer.data
+    assert not window.flags.writeable
+
+
+def test_update_last_overwrites_current_candle():
+    buffer = CandleBuffer(COLUMNS, capacity=3)
+    buffer.extend([[0, 100, 0], [1, 101, 10], [2, 102, 20], [3, 103, 30]])
+
+    buffer.update_last({'date': 3, 'close': 99, 'volume': 35})
+
+    assert buffer.last() == {'date': 3, 'close': 99, 'volume': 35}
+    assert buffer.to_frame(newest_first=True)['close'].tolist() == [99, 102, 101]
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sagemaker')
+
+import jtrader.core.ml as ml_module  # noqa: E402
+from jtrader.core.artifact_store import ArtifactStore  # noqa: E402
+from jtrader.core.ml import ML  # noqa: E402
+
+
+class FakeIEX:
+    IEX_DATA_TYPE_INDICATOR = 'indicators'
+    IEX_DATA_TYPE_ECONOMICS = 'economics'
+
+    def __init__(self, updated: pd.Timestamp, releases: int):
+        self.updated = updated
+        self.releases = releases
+        self.timeframes = []
+
+    def economic(self, economic_type, timeframe, as_dataframe=False):
+        self.timeframes.append(timeframe)
+
+        # dated like IEX.economic, counting back 30 days from the latest release
+        dates = pd.DatetimeIndex([self.updated - timedelta(days=30 * i) for i in range(self.releases)], name='date')
+
+        return pd.DataFrame({economic_type: np.arange(self.releases, dtype=float)}, index=dates)
+
+
+def test_get_refresh_timeframe_covers_the_gap_and_warmup():
+    assert ML.get_refresh_timeframe('indicators', timedelta(days=2), '5y') == '6m'
+    assert ML.get_refresh_timeframe('indicators', timedelta(days=100), '5y') == '1y'
+    assert ML.get_refresh_timeframe('indicators', timedelta(days=4000), '5y') == '5y'
+    assert ML.get_refresh_timeframe('economics', timedelta(days=40), '5y') == '5y'
+
+
+def test_merge_api_result_appends_only_new_rows():
+    today = pd.Timestamp.now().normalize()
+    saved = pd.DataFrame({'rsi': [1.0, 2.0, 3.0]}, index=pd.date_range(end=today - pd.Timedelta(days=2), periods=3))
+    recent = pd.DataFrame({'rsi': [np.nan, 4.0, 5.0]}, index=pd.date_range(end=today, periods=3))
+
+    merged = ML.merge_api_result(saved, recent, '5y')
+
+    assert merged['rsi'].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert merged.index.is_monotonic_increasing
+
+
+def test_expired_economic_result_is_downloaded_again(tmp, monkeypatch):
+    monkeypatch.setattr(ml_module, 'API_RESULTS', ArtifactStore(tmp.dir))
+    monkeypatch.setitem(ml_module.API_RESULT_TTLS, 'economics', timedelta(0))
+
+    released = pd.Timestamp.now().normalize() - timedelta(days=40)
+    client = FakeIEX(released, 24)
+    ML(client).get_feature_result('FOO', 'economics', 'cpi', '2y')
+
+    # a new release moves every counted back date
+    client.updated = released + timedelta(days=31)
+    result = ML(client).get_feature_result('FOO', 'economics', 'cpi', '2y')
+
+    assert client.timeframes == ['2y', '2y']
+    assert len(result) == 24
+    assert result.index.max() == client.updated
+    assert result.index.to_series().diff().dropna().min() == timedelta(days=30)
@@ -0,0 +1,102 @@
+from datetime import date
+
+from jtrader.core.odm import ODM
+
+
+class FakePaginator:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def paginate(self, **kwargs):
+        self.calls.append(kwargs)
+
+        # one page per LastEvaluatedKey hop
+        for page in self.pages[kwargs['ExpressionAttributeValues'][':ticker']]:
+            yield {'Items': page}
+
+
+class FakeClient:
+    def __init__(self, pages):
+        self.paginator = FakePaginator(pages)
+
+    def get_paginator(self, operation):
+        assert operation == 'query'
+
+        return self.paginator
+
+
+def get_bar(day: str) -> dict:
+    return {'date': day, 'open': 1, 'high': 2, 'low': 0, 'close': 1, 'volume': 100}
+
+
+def get_odm(monkeypatch, pages) -> ODM:
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+
+    odm = ODM(max_workers=4)
+    odm.client = FakeClient(pages)
+
+    return odm
+
+
+def test_query_pages_projects_bar_attributes(monkeypatch):
+    odm = get_odm(monkeypatch, {'FOO': [[get_bar('2021-01-04')], [get_bar('2021-01-05')], []]})
+
+    pages = list(odm.query_pages('FOO', date(2021, 1, 1), ODM.BAR_ATTRIBUTES, Limit=10))
+
+    assert pages == [[get_bar('2021-01-04')], [get_bar('2021-01-05')], []]
+
+    [call] = odm.client.paginator.calls
+
+    assert call['TableName'] == 'stocks'
+    assert call['KeyConditionExpression'] == '#ticker = :ticker AND #date >= :start'
+    assert call['ExpressionAttributeValues'] == {':ticker': 'FOO', ':start': '2021-01-01'}
+    assert call['ProjectionExpression'] == '#date, #open, #high, #low, #close, #volume'
+    assert call['ExpressionAttributeNames'] == {
+        '#ticker': 'ticker', **{f"#{attribute}": attribute for attribute in ODM.BAR_ATTRIBUTES}
+    }
+    assert call['Limit'] == 10
+
+
+def test_query_pages_without_start_or_projection(monkeypatch):
+    odm = get_odm(monkeypatch, {'FOO': [[get_bar('2021-01-04')]]})
+
+    assert list(odm.query_pages('FOO')) == [[get_bar('2021-01-04')]]
+
+    [call] = odm.client.paginator.calls
+
+    assert call['KeyConditionExpression'] == '#ticker = :ticker'
+    assert call['ExpressionAttributeNames'] == {'#ticker': 'ticker'}
+    assert 'ProjectionExpression' not in call
+
+
+def test_get_historical_stock_ranges_joins_pages(monkeypatch):
+    odm = get_odm(monkeypatch, {
+        'FOO': [[get_bar('2021-01-04'), get_bar('2021-01-05')], [get_bar('2021-01-06')]],
+        'BAR': [[]],
+        'BAZ': [[get_bar('2021-01-04')], [], [get_bar('2021-01-06')]],
+    })
+
+    ranges = odm.get_historical_stock_ranges(['FOO', 'BAR', 'BAZ'], date(2021, 1, 1), ODM.BAR_ATTRIBUTES)
+
+    assert list(ranges.keys()) == ['FOO', 'BAR', 'BAZ']
+    assert [bar['date'] for bar in ranges['FOO']] == ['2021-01-04', '2021-01-05', '2021-01-06']
+    assert ranges['BAR'] == []
+    assert [bar['date'] for bar in ranges['BAZ']] == ['2021-01-04', '2021-01-06']
+
+    calls = odm.client.paginator.calls
+
+    assert len(calls) == 3
+    assert all(call['ProjectionExpression'] == '#date, #open, #high, #low, #close, #volume' for call in calls)
+
+
+def test_get_last_stock_day_reads_one_item(monkeypatch):
+    odm = get_odm(monkeypatch, {'FOO': [[{'date': '2021-01-06'}]]})
+
+    assert odm.get_last_stock_day('FOO').date() == date(2021, 1, 6)
+
+    [call] = odm.client.paginator.calls
+
+    assert call['ProjectionExpression'] == '#date'
+    assert call['ScanIndexForward'] is False
+    assert call['PaginationConfig'] == {'MaxItems': 1}
@@ -0,0 +1,33 @@
+import time
+
+from jtrader.core.orchestrator import Orchestrator
+
+
+def fetch(item):
+    if item == 3:
+        raise ValueError('boom')
+
+    return item * 2
+
+
+def evaluate(item, data):
+    return item + data
+
+
+def test_run_keeps_item_order():
+    with Orchestrator(concurrency=4) as orchestrator:
+        assert orchestrator.run(range(6), fetch) == [0, 2, 4, None, 8, 10]
+
+
+def test_run_evaluates_on_process_pool():
+    with Orchestrator(concurrency=4, process_workers=2) as orchestrator:
+        assert orchestrator.run([1, 2, 3], fetch, evaluate) == [3, 6, None]
+
+
+def test_run_rate_limits_fetches():
+    with Orchestrator(concurrency=10, rate_limit=20) as orchestrator:
+        started = time.monotonic()
+        orchestrator.run(range(30), lambda item: item)
+
+        # 20 fetches burst out of the bucket, the remaining 10 wait for it to refill
+        assert time.monotonic() - started >= 0.4
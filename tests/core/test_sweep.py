@@ -0,0 +1,106 @@
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+import pandas as pd
+
+from jtrader.core import sweep
+from jtrader.core.sweep import BacktestSweep, LEADERBOARD_COLUMNS, get_indicator_combinations, get_parameter_sets
+
+
+def test_parameter_sets_expand_grid():
+    parameter_sets = get_parameter_sets({
+        'time_period': [10, 14],
+        'fast_period': [10, 20, 30],
+        'slow_period': [20, 40],
+    })
+
+    # fast periods not below the slow period are dropped
+    assert len(parameter_sets) == 2 * 4
+    assert {'time_period': 14, 'fast_period': 10, 'slow_period': 20} in parameter_sets
+    assert all(params['fast_period'] < params['slow_period'] for params in parameter_sets)
+
+    assert len(get_parameter_sets()) == 27
+
+
+def test_indicator_combinations():
+    combinations = get_indicator_combinations([['rsi', 'macd'], 'rsi', ['adx']], 2)
+
+    assert combinations == [
+        ('rsi',), ('macd',), ('adx',), ('rsi', 'macd'), ('rsi', 'adx'), ('macd', 'adx'),
+    ]
+
+
+def fake_sweep_ticker(ticker, start_date, end_date, runs):
+    if ticker == 'FAIL':
+        raise ValueError('no bars')
+
+    return [
+        {
+            'ticker': ticker,
+            'buy_indicators': '+'.join(buy_indicators),
+            'sell_indicators': '+'.join(sell_indicators),
+            'time_period': params['time_period'],
+            'fast_period': params['fast_period'],
+            'slow_period': params['slow_period'],
+            'trades': 1,
+            'final_equity': 1000 + offset,
+            'total_return': (len(ticker) * 100 + offset) / 1000,
+            'max_drawdown': 0,
+        }
+        for offset, (buy_indicators, sell_indicators, params) in enumerate(runs)
+    ]
+
+
+def test_run_writes_leaderboard_and_keeps_top(tmp, monkeypatch):
+    monkeypatch.setattr(sweep, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(sweep, 'sweep_ticker', fake_sweep_ticker)
+
+    leaderboard_path = os.path.join(tmp.dir, 'leaderboard.csv')
+    backtest_sweep = BacktestSweep(
+        getLogger(),
+        ['FOO', 'BARBAZ', 'FAIL', 'FOO'],
+        None,
+        None,
+        [['rsi', 'macd']],
+        [['rsi']],
+        leaderboard_path=leaderboard_path,
+        max_workers=2,
+        parameter_grid={'time_period': [10, 14], 'fast_period': [10], 'slow_period': [28]}
+    )
+
+    results = backtest_sweep.run(top=3)
+
+    # 3 buy combinations x 1 sell combination x 2 parameter sets for each ticker that did not fail
+    assert results['runs'] == 12
+    assert results['leaderboard'] == leaderboard_path
+
+    with open(leaderboard_path, newline='') as leaderboard:
+        rows = list(csv.DictReader(leaderboard))
+
+    assert list(rows[0].keys()) == LEADERBOARD_COLUMNS
+    assert len(rows) == 12
+    assert sorted(set(row['ticker'] for row in rows)) == ['BARBAZ', 'FOO']
+
+    expected = pd.read_csv(leaderboard_path).nlargest(3, 'total_return').reset_index(drop=True)
+
+    assert list(results['top'].columns) == LEADERBOARD_COLUMNS
+    pd.testing.assert_frame_equal(results['top'], expected, check_dtype=False)
+    assert len(backtest_sweep.leaders) == 3
+
+
+def test_run_without_rows_has_no_top(tmp, monkeypatch):
+    monkeypatch.setattr(sweep, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(sweep, 'sweep_ticker', fake_sweep_ticker)
+
+    leaderboard_path = os.path.join(tmp.dir, 'leaderboard.csv')
+    results = BacktestSweep(
+        getLogger(), ['FAIL'], None, None, ['rsi'], ['rsi'], leaderboard_path=leaderboard_path, max_workers=1
+    ).run()
+
+    assert results['runs'] == 0
+    assert results['top'] is None
+
+    with open(leaderboard_path, newline='') as leaderboard:
+        assert leaderboard.read().strip() == ','.join(LEADERBOARD_COLUMNS)
@@ -0,0 +1,84 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from jtrader.core.watermark import WatermarkIndex
+
+
+def test_update_and_load_round_trip(tmp):
+    path = os.path.join(tmp.dir, 'watermarks.sqlite')
+    watermarks = WatermarkIndex(path)
+
+    assert watermarks.load() == {}
+
+    watermarks.update('FOO', datetime(2021, 3, 4, 15, 30))
+    watermarks.update('BAR', datetime(2021, 3, 5))
+    watermarks.close()
+
+    # watermarks survive a restart, at day resolution
+    watermarks = WatermarkIndex(path)
+
+    assert watermarks.load() == {'FOO': datetime(2021, 3, 4), 'BAR': datetime(2021, 3, 5)}
+
+
+def test_update_never_moves_back(tmp):
+    watermarks = WatermarkIndex(os.path.join(tmp.dir, 'watermarks.sqlite'))
+
+    watermarks.update('FOO', datetime(2021, 3, 4))
+    watermarks.update('FOO', datetime(2021, 2, 1))
+
+    assert watermarks.load() == {'FOO': datetime(2021, 3, 4)}
+
+    watermarks.update('FOO', datetime(2021, 3, 8))
+
+    assert watermarks.load() == {'FOO': datetime(2021, 3, 8)}
+
+
+class FakeProvider:
+    BATCH_SIZE = 2
+
+
+class FakeODM:
+    def __init__(self):
+        self.queried = []
+
+    def get_last_stock_day(self, ticker):
+        self.queried.append(ticker)
+
+        return datetime.today() - timedelta(days=60)
+
+
+def test_plan_batches_skips_tickers_up_to_date(tmp, monkeypatch):
+    pytest.importorskip('pyEX')
+
+    from jtrader.core import worker
+    from jtrader.core.orchestrator import Orchestrator
+
+    path = os.path.join(tmp.dir, 'watermarks.sqlite')
+    monkeypatch.setattr(worker, 'ODM', FakeODM)
+    monkeypatch.setattr(worker, 'BarStore', lambda odm: None)
+    monkeypatch.setattr(worker, 'WatermarkIndex', lambda: WatermarkIndex(path))
+
+    today = datetime.today()
+    ingester = worker.Worker(FakeProvider(), None)
+    ingester.watermarks.update('FOO', today)
+    ingester.watermarks.update('BAR', today - timedelta(days=20))
+    ingester.watermarks.update('BAZ', today - timedelta(days=21))
+
+    with Orchestrator(concurrency=2) as orchestrator:
+        batches = ingester.plan_batches(orchestrator, ['FOO', 'BAR', 'BAZ', 'NEW'], ingester.watermarks.load())
+
+    # only the ticker missing from the index is looked up in the table, FOO has nothing new to ingest
+    assert ingester.odm.queried == ['NEW']
+    assert sorted(batches) == [('1m', ['BAR', 'BAZ']), ('3m', ['NEW'])]
+    assert 'NEW' in WatermarkIndex(path).load()
+
+    # once seeded the ticker is planned from the index alone
+    ingester.watermarks.update('NEW', today)
+
+    with Orchestrator(concurrency=2) as orchestrator:
+        batches = ingester.plan_batches(orchestrator, ['FOO', 'NEW'], ingester.watermarks.load())
+
+    assert batches == []
+    assert ingester.odm.queried == ['NEW']
@@ -0,0 +1,51 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from jtrader.core.bar_store import BarStore
+from jtrader.core.pairs import SpreadMonitor
+from jtrader.core.trader.pairs import Pairs
+
+
+class FakeODM:
+    def get_historical_stock_ranges(self, tickers, start, projection=None):
+        return {ticker: [] for ticker in tickers}
+
+
+def get_bars(dates: pd.DatetimeIndex, closes: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({
+        'date': dates,
+        'open': closes,
+        'high': closes,
+        'low': closes,
+        'close': closes,
+        'volume': np.full(len(closes), 1000.0),
+    })
+
+
+def test_poll_bars_feeds_new_bars_to_the_monitor(tmp):
+    store = BarStore(tmp.dir, FakeODM())
+    dates = pd.date_range('2021-01-04', periods=101, freq='B', tz='UTC')
+    rng = np.random.default_rng(0)
+
+    base = np.cumsum(rng.normal(0, .02, 101)) + 4
+    pair = .2 + 1.2 * base + rng.normal(0, .005, 101)
+    store.write('AAA', get_bars(dates[:100], np.exp(base[:100])))
+    store.write('BBB', get_bars(dates[:100], np.exp(pair[:100])))
+
+    trader = Pairs(None, 'AAA')
+    trader.bar_store = store
+    trader._Pairs__start_monitor(['BBB'], date(2021, 1, 1))
+
+    assert trader.poll_bars().empty
+
+    # the worker ingests the next bar, the pair jumps above its threshold
+    store.write('AAA', get_bars(dates[100:], np.exp(base[100:])))
+    store.write('BBB', get_bars(dates[100:], np.exp(pair[100:] + .2)))
+
+    crossings = trader.poll_bars()
+
+    assert crossings[['ticker', 'pair', 'signal']].values.tolist() == [['AAA', 'BBB', SpreadMonitor.SIGNAL_BEARISH]]
+    assert trader.last_bar_date == dates[100]
+    assert trader.poll_bars().empty
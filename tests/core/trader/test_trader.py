@@ -0,0 +1,39 @@
+import numpy as np
+
+from jtrader.core.trader import Trader
+
+
+class FakeTrader(Trader):
+    async def _on_websocket_message(self, ws, message) -> None:
+        pass
+
+
+def test_chain_validation_reads_streams_and_batch_indicators(monkeypatch):
+    trader = FakeTrader(None, 'FOO')
+    close = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, 120))
+
+    for minute, price in enumerate(close):
+        trader.add_candle({
+            'date': float(minute),
+            'open': price,
+            'close': price,
+            'high': price + 1,
+            'low': price - 1,
+            'volume': 1000.0,
+            'amount': 1000.0 * price,
+        })
+
+    evaluated = []
+
+    def is_valid(self, data, comparison_data=None):
+        evaluated.append((len(data), data['date'].iloc[0], data['close'].iloc[0]))
+
+    for validator in Trader.BATCH_INDICATORS:
+        monkeypatch.setattr(validator, 'is_valid', is_valid)
+
+    trader._execute_chain_validation()
+
+    # batch indicators get the candles newest first
+    assert evaluated == [(len(close), len(close) - 1, close[-1])] * len(Trader.BATCH_INDICATORS)
+    assert trader.streams['apo'].is_ready
+    assert trader.streams['vwap'].is_ready
@@ -0,0 +1,39 @@
+import numpy as np
+
+from jtrader.core.utils.columnar import ColumnarBuilder
+
+FIELDS = {
+    'quote': ['close', 'peRatio'],
+    'stats': ['month1ChangePercent'],
+}
+
+
+def test_build_fills_columns_from_batch_json():
+    builder = ColumnarBuilder(FIELDS, 2)
+    builder.add_batch({
+        'AAA': {'quote': {'close': 10, 'peRatio': None}, 'stats': {'month1ChangePercent': 0.1}},
+        'BBB': {'quote': {'close': '12.5', 'peRatio': 'n/a'}, 'stats': None},
+    })
+
+    frame = builder.build()
+
+    assert list(frame.columns) == builder.columns
+    assert list(frame.index) == ['AAA', 'BBB']
+    assert frame.index.name == 'symbol'
+    assert frame['quote.close'].dtype == np.float64
+    assert frame.loc['AAA', 'quote.close'] == 10
+    assert np.isnan(frame.loc['AAA', 'quote.peRatio'])
+    assert np.isnan(frame.loc['BBB', 'quote.close'])
+    assert np.isnan(frame.loc['BBB', 'stats.month1ChangePercent'])
+
+
+def test_add_grows_past_capacity():
+    builder = ColumnarBuilder(FIELDS, 1)
+
+    for i in range(5):
+        builder.add(f"T{i}", {'quote': {'close': i}})
+
+    frame = builder.build()
+
+    assert len(frame) == 5
+    assert frame['quote.close'].tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from jtrader.core.utils.ranking import add_percentile_scores
+
+
+def test_add_percentile_scores_matches_percentileofscore():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(
+        {
+            'One-Month Price Return': rng.normal(size=500).round(2),
+            'Three-Month Price Return': rng.normal(size=500).round(2),
+        }
+    )
+    percentile_columns = {
+        'One-Month Price Return': 'One-Month Return Percentile',
+        'Three-Month Price Return': 'Three-Month Return Percentile',
+    }
+
+    add_percentile_scores(df, percentile_columns, 'HQM Score')
+
+    for value_column, percentile_column in percentile_columns.items():
+        expected = [stats.percentileofscore(df[value_column], value) / 100 for value in df[value_column]]
+
+        np.testing.assert_allclose(df[percentile_column], expected)
+
+    np.testing.assert_allclose(
+        df['HQM Score'],
+        (df['One-Month Return Percentile'] + df['Three-Month Return Percentile']) / 2
+    )
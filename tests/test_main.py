@@ -1,6 +1,26 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from jtrader.core.backtester import Backtester
 from jtrader.main import JTraderTest
 
 
+def get_bars(total: int = 252) -> pd.DataFrame:
+    close = 100 + np.cumsum(np.random.default_rng(7).normal(0, 2, total))
+
+    return pd.DataFrame(
+        {
+            'date': pd.date_range('2021-01-01', periods=total, freq='B', tz='UTC'),
+            'open': close,
+            'high': close + 2,
+            'low': close - 2,
+            'close': close,
+            'volume': np.full(total, 10000.0),
+        }
+    )
+
+
 def test_jtrader():
     # test jtrader without any subcommands or arguments
     with JTraderTest() as app:
@@ -16,9 +36,33 @@ def test_jtrader_debug():
         assert app.debug is True
 
 
-def test_start_backtest():
-    argv = ['start-backtest', '-t', 'FOO', '-b', 'rsi', '-s', 'volume']
+def test_start_backtest(monkeypatch):
+    bars = get_bars()
+    monkeypatch.setattr(Backtester, 'load_bars', lambda self: bars)
+
+    argv = ['start-backtest', '-t', 'FOO', '-b', 'rsi', '-s', 'macd']
     with JTraderTest(argv=argv) as app:
         app.run()
         data, output = app.last_rendered
-        assert data['results'] is None
+        assert len(data['results']['equity_curve']) == len(bars)
+        assert len(data['results']['fills']) > 0
+
+
+def test_start_ml_trainer_rejects_numerai_batches(capsys):
+    argv = ['start-ml-trainer', '--tickers', 'FOO', 'BAR', '-a', 'linear-learner', '--with-numerai']
+    with JTraderTest(argv=argv) as app:
+        with pytest.raises(SystemExit) as exit_info:
+            app.run()
+
+        assert exit_info.value.code == 2
+        assert '--with-numerai only supports --ticker' in capsys.readouterr().err
+
+
+def test_start_backtest_needs_sweep_for_several_tickers(capsys):
+    argv = ['start-backtest', '-t', 'FOO', '-t', 'BAR', '-b', 'rsi', '-s', 'macd']
+    with JTraderTest(argv=argv) as app:
+        with pytest.raises(SystemExit) as exit_info:
+            app.run()
+
+        assert exit_info.value.code == 2
+        assert 'several --ticker values need --sweep' in capsys.readouterr().err
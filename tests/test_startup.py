@@ -0,0 +1,79 @@
+"""
+Startup benchmark: the time each CLI command spends importing its subsystem, measured in a fresh interpreter.
+Run with `pytest -s tests/test_startup.py` to print the timings.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ['talib', 'sklearn', 'prophet', 'dask', 'sagemaker', 'kucoin', 'pyEX', 'boto3']
+
+CLI_BUDGET = float(os.environ.get('JTRADER_CLI_IMPORT_BUDGET', 1.0))
+COMMAND_BUDGET = float(os.environ.get('JTRADER_COMMAND_IMPORT_BUDGET', 10.0))
+
+COMMAND_MODULES = {
+    'start-worker': ['jtrader.core.worker'],
+    'start-news-stream': ['jtrader.core.news'],
+    'get-hqm-stats': ['jtrader.core.scanner.hqm'],
+    'start-scanner': ['jtrader.core.scanner.scanner'],
+    'start-ml-trainer': ['jtrader.core.ml'],
+    'start-backtest': ['jtrader.core.backtester', 'jtrader.core.sweep'],
+    'start-trader': ['jtrader.core.trader.pairs'],
+    'build-pairs-index': ['jtrader.core.pairs'],
+}
+
+MEASURE = """
+import json, sys, time
+
+start = time.perf_counter()
+import jtrader.main
+cli = time.perf_counter() - start
+
+start = time.perf_counter()
+try:
+    for module in sys.argv[1:]:
+        __import__(module)
+except ImportError as e:
+    print(json.dumps({'error': repr(e)}))
+    raise SystemExit
+
+print(json.dumps({'cli': cli, 'command': time.perf_counter() - start, 'modules': sorted(sys.modules)}))
+"""
+
+
+def measure(modules: list) -> dict:
+    output = subprocess.run(
+        [sys.executable, '-c', MEASURE, *modules],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+    result = json.loads(output.strip().splitlines()[-1])
+
+    if 'error' in result:
+        pytest.skip(f"command dependencies are not installed: {result['error']}")
+
+    return result
+
+
+def test_cli_import_skips_heavy_subsystems():
+    result = measure([])
+
+    print(f"\njtrader.main: {result['cli']:.3f}s")
+
+    assert [module for module in HEAVY_MODULES if module in result['modules']] == []
+    assert result['cli'] < CLI_BUDGET
+
+
+@pytest.mark.parametrize('command', COMMAND_MODULES.keys())
+def test_command_import_time(command):
+    result = measure(COMMAND_MODULES[command])
+
+    print(f"\n{command}: {result['command']:.3f}s")
+
+    assert result['command'] < COMMAND_BUDGET